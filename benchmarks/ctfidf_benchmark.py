@@ -0,0 +1,134 @@
+"""
+Benchmark of the sparse c-TF-IDF engine against the previous dense implementation.
+
+Builds synthetic clusters of documents with a Zipf-distributed vocabulary and
+compares the runtime and peak memory of
+
+- the previous ``c_tf_idf`` and ``extract_tfidf_topics``, which densify the
+  cluster x vocabulary count matrix and sort every row completely,
+- ``c_tf_idf(..., sparse=True)`` and ``extract_tfidf_topics`` as called by the
+  models, which stay in CSR and select the top words with ``argpartition``,
+- ``ClassTfidf.update`` of a few clusters against a refit of all clusters.
+
+Usage:
+    python benchmarks/ctfidf_benchmark.py --n-clusters 200 --vocab-size 50000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sklearn.feature_extraction.text import CountVectorizer
+
+from stream_topic.preprocessor import ClassTfidf, c_tf_idf, extract_tfidf_topics
+
+
+def dense_c_tf_idf(documents, m, ngram_range=(1, 1)):
+    # the implementation before the sparse engine, kept as the reference
+    count = CountVectorizer(ngram_range=ngram_range, stop_words="english").fit(
+        documents
+    )
+    t = count.transform(documents).toarray()
+    w = t.sum(1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tf = np.divide(t.T, w)
+    tf[~np.isfinite(tf)] = 0
+    sum_t = t.sum(0)
+    idf = np.log(np.divide(m, sum_t)).reshape(-1, 1)
+    return np.multiply(tf, idf), count
+
+
+def dense_extract_tfidf_topics(tf_idf, count, docs_per_topic, n=100):
+    words = count.get_feature_names_out()
+    labels = list(docs_per_topic.predictions)
+    tf_idf_transposed = tf_idf.T
+    indices = tf_idf_transposed.argsort()[:, -n:]
+    return {
+        label: [(words[j], tf_idf_transposed[i][j]) for j in indices[i]][::-1]
+        for i, label in enumerate(labels)
+    }
+
+
+def make_documents(n_clusters, vocab_size, words_per_cluster, seed=0):
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}x" for i in range(vocab_size)])
+    documents = []
+    for _ in range(n_clusters):
+        ranks = np.minimum(rng.zipf(1.3, words_per_cluster), vocab_size) - 1
+        offset = rng.integers(0, vocab_size)
+        documents.append(" ".join(vocabulary[(ranks + offset) % vocab_size]))
+    return documents
+
+
+def run(fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    # the memory is traced in a second run, tracing slows down the first one
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-clusters", type=int, default=200)
+    parser.add_argument("--vocab-size", type=int, default=50000)
+    parser.add_argument("--words-per-cluster", type=int, default=5000)
+    parser.add_argument("--n-words", type=int, default=100)
+    parser.add_argument("--n-updated", type=int, default=5)
+    args = parser.parse_args()
+
+    logger.remove()
+    documents = make_documents(args.n_clusters, args.vocab_size, args.words_per_cluster)
+    m = args.n_clusters * 50
+    docs_per_topic = pd.DataFrame({"predictions": range(args.n_clusters)})
+
+    def dense():
+        tf_idf, count = dense_c_tf_idf(documents, m)
+        return dense_extract_tfidf_topics(tf_idf, count, docs_per_topic, args.n_words)
+
+    def sparse():
+        tf_idf, count = c_tf_idf(documents, m, sparse=True)
+        return extract_tfidf_topics(tf_idf, count, docs_per_topic, args.n_words)
+
+    dense_topics, dense_time, dense_memory = run(dense)
+    sparse_topics, sparse_time, sparse_memory = run(sparse)
+    agreement = np.mean(
+        [
+            np.allclose(
+                [score for _, score in dense_topics[label]],
+                [score for _, score in sparse_topics[label]],
+            )
+            for label in dense_topics
+        ]
+    )
+
+    engine = ClassTfidf().fit(documents, m)
+    changed = make_documents(
+        args.n_updated, args.vocab_size, args.words_per_cluster, seed=1
+    )
+    updates = dict(zip(range(args.n_updated), changed))
+    _, update_time, update_memory = run(
+        lambda: engine.update(updates).top_words(args.n_words)
+    )
+    refit_documents = changed + documents[args.n_updated :]
+    _, refit_time, refit_memory = run(
+        lambda: ClassTfidf().fit(refit_documents, m).top_words(args.n_words)
+    )
+
+    print(f"{'variant':>16} {'time [s]':>9} {'peak [MiB]':>11}")
+    print(f"{'dense':>16} {dense_time:>9.3f} {dense_memory:>11.1f}")
+    print(f"{'sparse':>16} {sparse_time:>9.3f} {sparse_memory:>11.1f}")
+    print(f"{'sparse refit':>16} {refit_time:>9.3f} {refit_memory:>11.1f}")
+    print(f"{'sparse update':>16} {update_time:>9.3f} {update_memory:>11.1f}")
+    print(f"clusters with identical top-word scores: {agreement:.0%}")
+
+
+if __name__ == "__main__":
+    main()
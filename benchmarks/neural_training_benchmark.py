@@ -0,0 +1,124 @@
+"""
+Training-throughput benchmark of the performance profiles of the neural topic models.
+
+Trains ProdLDA's base model on a random sparse bag-of-words corpus, once with the
+default profile, once with each option of the "cpu" profile on its own (bf16
+autocast, thread control, dataloader workers), once with the opt-in torch.compile
+and once with the full "cpu" profile. The first epoch is a warm-up (compilation, worker start-up) and is
+reported separately from the median of the following epochs.
+
+Usage:
+    python benchmarks/neural_training_benchmark.py --n-documents 20000 --vocab-size 5000
+"""
+
+import argparse
+import time
+
+import lightning as pl
+import numpy as np
+import scipy.sparse as sp
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from stream_topic.models.abstract_helper_models.neural_basemodel import NeuralBaseModel
+from stream_topic.models.neural_base_models.prodlda_base import ProdLDABase
+from stream_topic.utils.datamodule import sparse_collate
+from stream_topic.utils.performance import PerformanceProfile
+
+
+class BowDataset(Dataset):
+    def __init__(self, bow):
+        self.bow = bow
+
+    def __len__(self):
+        return self.bow.shape[0]
+
+    def __getitem__(self, idx):
+        return {"bow": self.bow[idx]}
+
+
+class EpochTimer(pl.Callback):
+    def __init__(self):
+        self.timings = []
+
+    def on_train_epoch_start(self, trainer, pl_module):
+        self._start = time.perf_counter()
+
+    def on_train_epoch_end(self, trainer, pl_module):
+        self.timings.append(time.perf_counter() - self._start)
+
+
+def make_corpus(n_documents, vocab_size, density, seed=0):
+    rng = np.random.default_rng(seed)
+    bow = sp.random(n_documents, vocab_size, density=density, format="csr", random_state=rng)
+    bow.data = rng.poisson(2.0, size=bow.nnz).astype(np.float32) + 1
+    return bow.astype(np.float32)
+
+
+def run(profile, bow, args):
+    torch.manual_seed(0)
+    default_threads = profile.apply_threads()
+    model = NeuralBaseModel(ProdLDABase, BowDataset(bow), n_topics=args.n_topics)
+    profile.compile_module(model.model)
+
+    n_train = int(0.8 * bow.shape[0])
+    loaders = [
+        DataLoader(
+            BowDataset(rows),
+            batch_size=args.batch_size,
+            shuffle=shuffle,
+            collate_fn=sparse_collate,
+            **profile.dataloader_kwargs(),
+        )
+        for rows, shuffle in ((bow[:n_train], True), (bow[n_train:], False))
+    ]
+    timer = EpochTimer()
+    trainer = pl.Trainer(
+        max_epochs=args.epochs,
+        callbacks=[timer],
+        logger=False,
+        enable_checkpointing=False,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        **profile.trainer_kwargs(),
+    )
+    trainer.fit(model, *loaders)
+    profile.restore_threads(default_threads)
+    return timer.timings[0], float(np.median(timer.timings[1:])), n_train
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-documents", type=int, default=20000)
+    parser.add_argument("--vocab-size", type=int, default=5000)
+    parser.add_argument("--density", type=float, default=0.01)
+    parser.add_argument("--n-topics", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--epochs", type=int, default=4)
+    parser.add_argument("--num-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    bow = make_corpus(args.n_documents, args.vocab_size, args.density)
+    cpu = PerformanceProfile.cpu(num_workers=args.num_workers)
+    profiles = {
+        "default": PerformanceProfile(),
+        "bf16 autocast": PerformanceProfile(precision=cpu.precision),
+        "torch.compile": PerformanceProfile(compile=True),
+        "threads": PerformanceProfile(num_threads=cpu.num_threads),
+        "workers": PerformanceProfile(
+            num_workers=cpu.num_workers,
+            persistent_workers=cpu.persistent_workers,
+            prefetch_factor=cpu.prefetch_factor,
+        ),
+        "cpu profile": cpu,
+    }
+
+    results = {name: run(profile, bow, args) for name, profile in profiles.items()}
+
+    print(f"{'profile':>14} {'warm-up [s]':>12} {'epoch [s]':>10} {'docs/s':>10}")
+    for name, (warm_up, epoch, n_train) in results.items():
+        print(f"{name:>14} {warm_up:>12.2f} {epoch:>10.2f} {n_train / epoch:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
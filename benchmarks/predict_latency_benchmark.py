@@ -0,0 +1,94 @@
+"""
+Latency benchmark of the prediction paths of KmeansTM.
+
+Fits KmeansTM on synthetic clustered embeddings and measures the latency of
+``predict`` per request for several batch sizes with the "umap" path (UMAP
+``transform`` and K-Means), the "centroid" path (cosine similarity to the topic
+centroids) and the "ann" path (nearest training documents). The p50 and p99
+latencies and the throughput are reported.
+
+By default the requests pass precomputed embeddings, so only the topic assignment
+is measured. With ``--encode`` the requests are texts and include encoding with the
+(warm) sentence encoder, which has to be available locally or downloadable.
+
+Usage:
+    python benchmarks/predict_latency_benchmark.py --batch-sizes 1 8 64 --requests 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+from loguru import logger
+
+from stream_topic.models import KmeansTM
+from stream_topic.models.abstract_helper_models.base import TrainingStatus
+
+
+def make_embeddings(n_documents, dim, n_topics, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_topics, dim))
+    labels = rng.integers(0, n_topics, n_documents)
+    return (centers[labels] + rng.normal(scale=0.8, size=(n_documents, dim))).astype(np.float32)
+
+
+def fit_model(embeddings, n_topics, use_umap):
+    model = KmeansTM(umap_args={"n_neighbors": 15, "n_components": 15, "metric": "cosine"})
+    model.embeddings = embeddings
+    model.n_topics = n_topics
+    # without the "umap" path, K-Means is fit on the embeddings themselves
+    model.reduced_embeddings = model.dim_reduction(logger) if use_umap else embeddings
+    model._clustering()
+    model.theta = np.eye(n_topics)[model.labels]
+    model._status = TrainingStatus.SUCCEEDED
+    return model
+
+
+def measure(model, method, requests, encode):
+    timings = []
+    for texts, embeddings in requests:
+        start = time.perf_counter()
+        if encode:
+            model.predict(texts, method=method)
+        else:
+            model.predict(None, method=method, embeddings=embeddings)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n-documents", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--n-topics", type=int, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--methods", nargs="+", default=["umap", "centroid", "ann"])
+    parser.add_argument("--encode", action="store_true")
+    args = parser.parse_args()
+
+    logger.remove()
+    embeddings = make_embeddings(args.n_documents * 2, args.dim, args.n_topics)
+    train, held_out = embeddings[: args.n_documents], embeddings[args.n_documents:]
+    model = fit_model(train, args.n_topics, use_umap="umap" in args.methods)
+    model.prepare_prediction(ann="ann" in args.methods, warm_up=args.encode)
+
+    rng = np.random.default_rng(1)
+    print(f"{'method':>9} {'batch':>6} {'p50 [ms]':>9} {'p99 [ms]':>9} {'docs/s':>9}")
+    for batch_size in args.batch_sizes:
+        requests = []
+        for _ in range(args.requests):
+            rows = rng.integers(0, len(held_out), batch_size)
+            texts = [f"synthetic document {row} about topic {row % args.n_topics}" for row in rows]
+            requests.append((texts, held_out[rows]))
+        for method in args.methods:
+            # the first requests warm up caches and lazily compiled code
+            measure(model, method, requests[:5], args.encode)
+            timings = measure(model, method, requests, args.encode) * 1000
+            p50, p99 = np.percentile(timings, [50, 99])
+            throughput = batch_size * len(timings) / timings.sum() * 1000
+            print(f"{method:>9} {batch_size:>6} {p50:>9.2f} {p99:>9.2f} {throughput:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
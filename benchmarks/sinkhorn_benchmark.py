@@ -0,0 +1,69 @@
+"""
+Micro-benchmark of the Sinkhorn loss used by NSTM.
+
+Compares the original ``sinkhorn_loss`` with the ``SinkhornSolver`` (with and without
+warm starts, and forced to iterate in the log domain) on random NSTM-like problems of several vocabulary sizes.
+Every step runs the forward and backward pass, as in training.
+
+Usage:
+    python benchmarks/sinkhorn_benchmark.py --vocab-sizes 1000 5000 20000
+"""
+
+import argparse
+import time
+
+import torch
+import torch.nn.functional as F
+
+from stream_topic.utils.sinkhorn_loss import SinkhornSolver, sinkhorn_loss
+
+
+def make_problem(n_topics, vocab_size, batch_size, embed_size=128, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    topic_embeddings = torch.randn(n_topics, embed_size, generator=generator)
+    word_embeddings = torch.randn(vocab_size, embed_size, generator=generator)
+    M = 1 - F.normalize(topic_embeddings) @ F.normalize(word_embeddings).T
+    theta = F.softmax(torch.randn(batch_size, n_topics, generator=generator), dim=-1)
+    bow = torch.poisson(torch.rand(batch_size, vocab_size, generator=generator) * 0.05)
+    return M, theta, F.softmax(bow, dim=-1)
+
+
+def run(loss_fn, M, theta, bow, n_steps):
+    timings = []
+    for _ in range(n_steps):
+        M_step = M.clone().requires_grad_()
+        theta_step = theta.clone().requires_grad_()
+        start = time.perf_counter()
+        loss = loss_fn(M_step, theta_step.T, bow.T).mean()
+        loss.backward()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2], loss.item()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--vocab-sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--n-topics", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--sinkhorn-alpha", type=float, default=20.0)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'vocab':>8} {'implementation':>22} {'median step [s]':>16} {'loss':>10}")
+    for vocab_size in args.vocab_sizes:
+        M, theta, bow = make_problem(args.n_topics, vocab_size, args.batch_size)
+        implementations = {
+            "sinkhorn_loss": lambda M, a, b: sinkhorn_loss(
+                M, a, b, lambda_sh=args.sinkhorn_alpha
+            ),
+            "SinkhornSolver": SinkhornSolver(args.sinkhorn_alpha),
+            "SinkhornSolver (warm)": SinkhornSolver(args.sinkhorn_alpha, warm_start=True),
+            "SinkhornSolver (log)": SinkhornSolver(args.sinkhorn_alpha, log_domain=True),
+        }
+        for name, loss_fn in implementations.items():
+            seconds, loss = run(loss_fn, M, theta, bow, args.steps)
+            print(f"{vocab_size:>8} {name:>22} {seconds:>16.4f} {loss:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from typing import Callable, List
+
+import numpy as np
+from loguru import logger
+
+SQLITE_MAX_VARIABLES = 900
+
+
+def hash_text(text: str) -> bytes:
+    """
+    Return the 16-byte BLAKE2b digest of a text, used as its cache key.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed cache of document embeddings.
+
+    Embeddings are keyed by ``(model name, hash of the text)``, so a document is
+    only ever encoded once per model, regardless of the dataset it belongs to or
+    its position in that dataset. Every model gets its own directory with
+
+    - ``vectors.bin``: an append-only float32 matrix of all cached embeddings,
+    - ``index.sqlite``: a table mapping text hashes to rows of that matrix,
+    - ``meta.json``: the embedding dimension.
+
+    Lookups read the row numbers from the index and gather the embeddings from a
+    memory map of the matrix with a single fancy-indexing operation. Writes are
+    serialized by the SQLite write lock, so several processes can share a cache.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Root directory of the cache.
+
+    Examples
+    --------
+    >>> cache = EmbeddingCache("~/.cache/stream_topic/embeddings")
+    >>> embeddings = cache.encode("all-MiniLM-L6-v2", texts, encoder.encode)
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = os.path.expanduser(os.fspath(cache_dir))
+
+    def _model_dir(self, model_name: str) -> str:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        return os.path.join(self.cache_dir, safe_name)
+
+    def _connect(self, model_name: str) -> sqlite3.Connection:
+        model_dir = self._model_dir(model_name)
+        os.makedirs(model_dir, exist_ok=True)
+        connection = sqlite3.connect(
+            os.path.join(model_dir, "index.sqlite"), timeout=60, isolation_level=None
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+        return connection
+
+    def _read_dim(self, model_name: str):
+        meta_path = os.path.join(self._model_dir(model_name), "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as file:
+            return json.load(file)["dim"]
+
+    def _vectors(self, model_name: str, dim: int, n_rows: int) -> np.ndarray:
+        return np.memmap(
+            os.path.join(self._model_dir(model_name), "vectors.bin"),
+            dtype=np.float32,
+            mode="r",
+            shape=(n_rows, dim),
+        )
+
+    def lookup(self, model_name: str, hashes: List[bytes]) -> np.ndarray:
+        """
+        Find the cache rows of the given text hashes.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the embedding model.
+        hashes : list of bytes
+            Text hashes as returned by ``hash_text``.
+
+        Returns
+        -------
+        np.ndarray
+            Row of every hash in the cache, or -1 if it is not cached.
+        """
+        rows = np.full(len(hashes), -1, dtype=np.int64)
+        position = {key: i for i, key in enumerate(hashes)}
+        connection = self._connect(model_name)
+        try:
+            for start in range(0, len(hashes), SQLITE_MAX_VARIABLES):
+                batch = hashes[start : start + SQLITE_MAX_VARIABLES]
+                query = "SELECT hash, row FROM embeddings WHERE hash IN ({})".format(
+                    ",".join("?" * len(batch))
+                )
+                for key, row in connection.execute(query, batch):
+                    rows[position[key]] = row
+        finally:
+            connection.close()
+        return rows
+
+    def gather(self, model_name: str, rows: np.ndarray) -> np.ndarray:
+        """
+        Gather the cached embeddings of the given rows.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the embedding model.
+        rows : np.ndarray
+            Cache rows, e.g. as returned by ``lookup``.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (len(rows), dim).
+        """
+        dim = self._read_dim(model_name)
+        n_rows = int(rows.max()) + 1 if len(rows) else 0
+        if dim is None or n_rows == 0:
+            return np.empty((len(rows), dim or 0), dtype=np.float32)
+        return np.asarray(self._vectors(model_name, dim, n_rows)[rows])
+
+    def add(self, model_name: str, hashes: List[bytes], embeddings: np.ndarray):
+        """
+        Append embeddings to the cache.
+
+        Hashes that are already cached, e.g. because another process added them
+        in the meantime, are skipped.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the embedding model.
+        hashes : list of bytes
+            Text hashes as returned by ``hash_text``.
+        embeddings : np.ndarray
+            Array of shape (len(hashes), dim).
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if len(hashes) == 0:
+            return
+
+        model_dir = self._model_dir(model_name)
+        connection = self._connect(model_name)
+        try:
+            # BEGIN IMMEDIATE takes the write lock, which also guards vectors.bin
+            connection.execute("BEGIN IMMEDIATE")
+            dim = self._read_dim(model_name)
+            if dim is None:
+                dim = embeddings.shape[1]
+                with open(
+                    os.path.join(model_dir, "meta.json"), "w", encoding="utf-8"
+                ) as file:
+                    json.dump({"dim": dim, "dtype": "float32"}, file)
+            elif dim != embeddings.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {embeddings.shape[1]} does not match the cached "
+                    f"dimension {dim} for model {model_name}."
+                )
+
+            (n_rows,) = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            existing = set()
+            for start in range(0, len(hashes), SQLITE_MAX_VARIABLES):
+                batch = hashes[start : start + SQLITE_MAX_VARIABLES]
+                query = "SELECT hash FROM embeddings WHERE hash IN ({})".format(
+                    ",".join("?" * len(batch))
+                )
+                existing.update(key for (key,) in connection.execute(query, batch))
+
+            keep = []
+            for i, key in enumerate(hashes):
+                if key not in existing:
+                    existing.add(key)
+                    keep.append(i)
+            if keep:
+                with open(
+                    os.path.join(model_dir, "vectors.bin"), "r+b" if n_rows else "wb"
+                ) as file:
+                    file.seek(n_rows * dim * 4)
+                    file.write(embeddings[keep].tobytes())
+                connection.executemany(
+                    "INSERT INTO embeddings (hash, row) VALUES (?, ?)",
+                    ((hashes[i], n_rows + offset) for offset, i in enumerate(keep)),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    def encode(
+        self,
+        model_name: str,
+        texts: List[str],
+        encode_fn: Callable[[List[str]], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Return the embeddings of ``texts``, encoding only texts that are not cached.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the embedding model.
+        texts : list of str
+            Texts to embed.
+        encode_fn : callable
+            Function mapping a list of texts to an array of their embeddings.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (len(texts), dim).
+        """
+        hashes = [hash_text(text) for text in texts]
+        unique_hashes = list(dict.fromkeys(hashes))
+        rows = self.lookup(model_name, unique_hashes)
+
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            logger.info(
+                f"--- Encoding {len(missing)} of {len(unique_hashes)} unique documents "
+                f"not found in the embedding cache ---"
+            )
+            first_text = {}
+            for text, key in zip(texts, hashes):
+                first_text.setdefault(key, text)
+            missing_hashes = [unique_hashes[i] for i in missing]
+            self.add(
+                model_name,
+                missing_hashes,
+                encode_fn([first_text[key] for key in missing_hashes]),
+            )
+            rows = self.lookup(model_name, unique_hashes)
+
+        unique_position = {key: i for i, key in enumerate(unique_hashes)}
+        document_rows = rows[[unique_position[key] for key in hashes]]
+        return self.gather(model_name, document_rows)
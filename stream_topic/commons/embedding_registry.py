@@ -0,0 +1,161 @@
+import threading
+from collections import OrderedDict
+
+from loguru import logger
+
+DEFAULT_MAX_MODELS = 4
+
+
+class EmbeddingModelRegistry:
+    """
+    Process-wide, lazily populated cache of SentenceTransformer models.
+
+    Models are keyed by ``(model_name, device)`` and only loaded on first request.
+    When more than ``max_models`` models are held, the least recently used one is
+    evicted.
+
+    Parameters
+    ----------
+    max_models : int, optional
+        Maximum number of models kept in memory (default is 4).
+
+    Examples
+    --------
+    >>> from stream_topic.commons.embedding_registry import get_embedding_model
+    >>> encoder = get_embedding_model("paraphrase-MiniLM-L3-v2")
+    >>> encoder is get_embedding_model("paraphrase-MiniLM-L3-v2")
+    True
+    """
+
+    def __init__(self, max_models: int = DEFAULT_MAX_MODELS):
+        if max_models < 1:
+            raise ValueError("max_models must be at least 1.")
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _resolve_device(device):
+        if device is not None:
+            return str(device)
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    def get(self, model_name: str, device: str = None):
+        """
+        Return the model registered under ``(model_name, device)``, loading it if needed.
+
+        Parameters
+        ----------
+        model_name : str
+            Name or path of the SentenceTransformer model.
+        device : str, optional
+            Device to load the model on. Defaults to "cuda" if available, else "cpu".
+
+        Returns
+        -------
+        SentenceTransformer
+            The shared model instance.
+        """
+        key = (model_name, self._resolve_device(device))
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+
+            from sentence_transformers import SentenceTransformer
+
+            logger.info(f"--- Loading embedding model {model_name} on {key[1]} ---")
+            model = SentenceTransformer(model_name, device=key[1])
+            self._models[key] = model
+            while len(self._models) > self.max_models:
+                evicted, _ = self._models.popitem(last=False)
+                logger.info(
+                    f"--- Evicting embedding model {evicted[0]} ({evicted[1]}) ---"
+                )
+            return model
+
+    def resize(self, max_models: int):
+        """
+        Change the maximum number of cached models, evicting the oldest if necessary.
+
+        Parameters
+        ----------
+        max_models : int
+            New maximum number of models kept in memory.
+        """
+        if max_models < 1:
+            raise ValueError("max_models must be at least 1.")
+        with self._lock:
+            self.max_models = max_models
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached models.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def __contains__(self, key):
+        model_name, device = key
+        with self._lock:
+            return (model_name, self._resolve_device(device)) in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+
+_REGISTRY = EmbeddingModelRegistry()
+
+
+def get_embedding_registry() -> EmbeddingModelRegistry:
+    """
+    Return the process-wide embedding model registry.
+    """
+    return _REGISTRY
+
+
+def get_embedding_model(model_name: str, device: str = None):
+    """
+    Return the shared SentenceTransformer for ``model_name`` from the process-wide registry.
+
+    Parameters
+    ----------
+    model_name : str
+        Name or path of the SentenceTransformer model.
+    device : str, optional
+        Device to load the model on. Defaults to "cuda" if available, else "cpu".
+
+    Returns
+    -------
+    SentenceTransformer
+        The shared model instance.
+    """
+    return _REGISTRY.get(model_name, device=device)
+
+
+def resolve_embedding_model(embedding_model, default_model_name: str):
+    """
+    Resolve an embedding model argument to a model instance.
+
+    Parameters
+    ----------
+    embedding_model : object, str or None
+        A model instance, which is returned unchanged, a model name, which is looked up
+        in the registry, or None, in which case ``default_model_name`` is looked up.
+    default_model_name : str
+        Name of the model used when ``embedding_model`` is None.
+
+    Returns
+    -------
+    object
+        The embedding model.
+    """
+    if embedding_model is None:
+        embedding_model = default_model_name
+    if isinstance(embedding_model, str):
+        return get_embedding_model(embedding_model)
+    return embedding_model
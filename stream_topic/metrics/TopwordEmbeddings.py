@@ -1,15 +1,19 @@
 import os
 import pickle
+from typing import TYPE_CHECKING
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
+from ..commons.embedding_registry import resolve_embedding_model
 from .constants import (
     EMBEDDING_PATH,
     PARAPHRASE_TRANSFORMER_MODEL,
     SENTENCE_TRANSFORMER_MODEL,
 )
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 
 class TopwordEmbeddings:
     """
@@ -31,9 +35,7 @@ class TopwordEmbeddings:
 
     def __init__(
         self,
-        word_embedding_model: SentenceTransformer = SentenceTransformer(
-            PARAPHRASE_TRANSFORMER_MODEL
-        ),
+        word_embedding_model: "SentenceTransformer" = None,
         cache_to_file: bool = False,
         emb_filename: str = None,
         emb_path: str = EMBEDDING_PATH,
@@ -44,8 +46,9 @@ class TopwordEmbeddings:
 
         Parameters
         ----------
-        word_embedding_model : SentenceTransformer
-            SentenceTransformer model to use for word embeddings.
+        word_embedding_model : SentenceTransformer or str, optional
+            SentenceTransformer model, or its name, to use for word embeddings. Defaults to the
+            shared "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         cache_to_file : bool, optional
             Whether to cache the embeddings to a file (default is False).
         emb_filename : str, optional
@@ -55,7 +58,9 @@ class TopwordEmbeddings:
         create_new_file : bool, optional
             Whether to create a new file to save the embeddings to (default is True).
         """
-        self.word_embedding_model = word_embedding_model
+        self.word_embedding_model = resolve_embedding_model(
+            word_embedding_model, PARAPHRASE_TRANSFORMER_MODEL
+        )
         self.cache_to_file = cache_to_file
         self.emb_filename = emb_filename
         self.emb_path = emb_path
@@ -1,16 +1,57 @@
 import pickle
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from tqdm import tqdm
 
-from .constants import EMBEDDING_PATH, SENTENCE_TRANSFORMER_MODEL
+from ..commons.embedding_registry import resolve_embedding_model
+from .constants import (
+    EMBEDDING_PATH,
+    NLTK_STOPWORD_LANGUAGE,
+    SENTENCE_TRANSFORMER_MODEL,
+)
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+@lru_cache(maxsize=None)
+def _default_stopwords():
+    import gensim
+    from nltk.corpus import stopwords
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    gensim_stopwords = gensim.parsing.preprocessing.STOPWORDS
+    nltk_stopwords = stopwords.words(NLTK_STOPWORD_LANGUAGE)
+    return tuple(
+        set(list(nltk_stopwords) + list(gensim_stopwords) + list(ENGLISH_STOP_WORDS))
+    )
+
+
+def cosine_similarity(X, Y=None):
+    """
+    Compute the cosine similarity between the rows of X and Y.
+
+    Thin wrapper around ``sklearn.metrics.pairwise.cosine_similarity`` that defers
+    importing scikit-learn until a metric is actually computed.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity as _cosine_similarity
+
+    return _cosine_similarity(X, Y)
+
+
+def get_default_stopwords():
+    """
+    Return the union of the NLTK, Gensim and Scikit-learn English stopwords.
+
+    The lists are loaded on first use and cached for the lifetime of the process.
+    """
+    return list(_default_stopwords())
 
 
 def embed_corpus(dataset,
-                 embedder: SentenceTransformer = SentenceTransformer(
-                     SENTENCE_TRANSFORMER_MODEL),
+                 embedder: "SentenceTransformer" = None,
                  emb_filename: str = None,
                  emb_path: str = EMBEDDING_PATH,
                  save: bool = False):
@@ -20,6 +61,7 @@ def embed_corpus(dataset,
     read the embeddings from this file. Otherwise create new embeddings.
     Returns the embedding dict
     """
+    embedder = resolve_embedding_model(embedder, SENTENCE_TRANSFORMER_MODEL)
 
     if emb_filename is None:
         emb_filename = str(dataset)
@@ -46,8 +88,7 @@ def embed_corpus(dataset,
 def update_corpus_dic_list(
     word_lis: list,
     emb_dic: dict,
-    embedder: SentenceTransformer = SentenceTransformer(
-        SENTENCE_TRANSFORMER_MODEL),
+    embedder: "SentenceTransformer" = None,
     emb_filename: str = None,
     emb_path: str = EMBEDDING_PATH,
     save: bool = False,
@@ -55,6 +96,7 @@ def update_corpus_dic_list(
     """
     Updates embedding dict with embeddings in word_lis
     """
+    embedder = resolve_embedding_model(embedder, SENTENCE_TRANSFORMER_MODEL)
 
     try:
         emb_dic = pickle.load(open(f"{emb_path}{emb_filename}.pickle", "rb"))
@@ -78,13 +120,13 @@ def embed_topic(
     topics_tw,
     corpus_dict: dict,
     n_words: int = 10,
-    embedder: SentenceTransformer = SentenceTransformer(
-        SENTENCE_TRANSFORMER_MODEL),
+    embedder: "SentenceTransformer" = None,
 ):
     """
     takes the list of topics and embed the top n_words words with the corpus dict
     if possible, else use the embedder.
     """
+    embedder = resolve_embedding_model(embedder, SENTENCE_TRANSFORMER_MODEL)
     topic_embeddings = []
     for topic in tqdm(topics_tw):
         if n_words is not None:
@@ -105,12 +147,12 @@ def embed_topic(
 
 def embed_stopwords(
     stopwords: list,
-    embedder: SentenceTransformer = SentenceTransformer(
-        SENTENCE_TRANSFORMER_MODEL),
+    embedder: "SentenceTransformer" = None,
 ):
     """
     take the list of stopwords and embeds them with embedder
     """
+    embedder = resolve_embedding_model(embedder, SENTENCE_TRANSFORMER_MODEL)
 
     sw_dic = {}  # first create dictionary with embedding of every unique word
     stopwords_set = set(stopwords)
@@ -1,23 +1,18 @@
 import re
-import gensim
+
 import numpy as np
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from scipy.sparse import csr_matrix
+
+from ..commons.embedding_registry import resolve_embedding_model
 from .base import BaseMetric
-from ._helper_funcs import cos_sim_pw
+from ._helper_funcs import cos_sim_pw, get_default_stopwords
 from .constants import (
     EMBEDDING_PATH,
-    NLTK_STOPWORD_LANGUAGE,
     PARAPHRASE_TRANSFORMER_MODEL,
 )
 from .TopwordEmbeddings import TopwordEmbeddings
 
-GENSIM_STOPWORDS = gensim.parsing.preprocessing.STOPWORDS
-NLTK_STOPWORDS = stopwords.words(NLTK_STOPWORD_LANGUAGE)
-STOPWORDS = list(
-    set(list(NLTK_STOPWORDS) + list(GENSIM_STOPWORDS) + list(ENGLISH_STOP_WORDS))
-)
+_NON_ALPHANUMERIC = re.compile(r"[^a-zA-Z0-9]+\s*")
 
 
 class NPMI(BaseMetric):
@@ -28,6 +23,11 @@ class NPMI(BaseMetric):
     the co-occurrence of pairs of words across the documents. Higher NPMI scores typically
     indicate more coherent topics.
 
+    The corpus is tokenized once into a sparse binary document-term matrix which is stored on
+    the instance and reused by every call to ``score`` and ``score_per_topic``. The
+    co-occurrence counts of all topic word pairs are obtained from a single sparse matrix
+    product.
+
     Attributes
     ----------
     stopwords : list
@@ -38,6 +38,8 @@ class NPMI(BaseMetric):
         The dataset used for calculating NPMI.
     files : list
         Processed text data from the dataset.
+    window_size : int or None
+        Size of the sliding context window. If None, co-occurrence is counted per document.
 
     Examples
     --------
@@ -53,6 +55,7 @@ class NPMI(BaseMetric):
         self,
         dataset,
         stopwords: list = None,
+        window_size: int = None,
     ):
         """
         Initializes the NPMI object with a dataset, stopwords, and a specified number of topics.
@@ -63,15 +66,25 @@ class NPMI(BaseMetric):
             The dataset to be used for NPMI calculation.
         stopwords : list, optional
             A list of stopwords to exclude from analysis. Default includes GenSim, NLTK, and Scikit-learn stopwords.
+        window_size : int, optional
+            If given, co-occurrences are counted within sliding windows of ``window_size`` tokens
+            instead of within whole documents. Defaults to None.
         """
         self.stopwords = stopwords
         if stopwords is None:
-            self.stopwords = STOPWORDS
+            self.stopwords = get_default_stopwords()
+        if window_size is not None and window_size < 2:
+            raise ValueError("window_size must be at least 2.")
+        self.window_size = window_size
         self.dataset = dataset
 
         files = self.dataset.get_corpus()
         self.files = [" ".join(words) for words in files]
 
+        self._vocab_index = None
+        self._doc_freq = None
+        self._cooc_matrix = None
+
     def get_info(self):
         """
         Get information about the metric.
@@ -92,91 +105,157 @@ class NPMI(BaseMetric):
 
         return info
 
-    def _create_vocab_preprocess(self, data, preprocess=5, process_data=False):
+    def _tokenize(self, data):
         """
-        Creates and preprocesses a vocabulary from the given data.
+        Tokenizes the text data and maps every token to a vocabulary index.
 
-        This method processes the text data to create a vocabulary, filtering out stopwords
-        and applying other preprocessing steps.
+        Documents are lowercased, non-alphanumeric characters are removed and stopwords are
+        dropped.
 
         Parameters
         ----------
-        data : list
+        data : list of str
             The text data to process.
-        preprocess : int
-            The minimum number of documents a word must appear in.
-        process_data : bool, optional
-            Whether to return the processed data. Defaults to False.
 
         Returns
         -------
         tuple
-            A tuple containing word-to-document mappings, multiple word-to-document mappings,
-            and optionally processed data.
+            The vocabulary as a dict mapping words to column indices, and a list with one
+            integer array of token indices per document.
         """
-        word_to_file = {}
-        word_to_file_mult = {}
-
-        process_files = []
-        for file_num in range(0, len(data)):
-            words = data[file_num].lower()
-            words = words.strip()
-            words = re.sub(r"[^a-zA-Z0-9]+\s*", " ", words)
-            words = re.sub(" +", " ", words)
-            # .translate(strip_punct).translate(strip_digit)
-            words = words.split()
-            # words = [w.strip() for w in words]
-            proc_file = []
-
-            for word in words:
-                if word in self.stopwords or word == "dlrs" or word == "revs":
-                    continue
-                if word in word_to_file:
-                    word_to_file[word].add(file_num)
-                    word_to_file_mult[word].append(file_num)
-                else:
-                    word_to_file[word] = set()
-                    word_to_file_mult[word] = []
-
-                    word_to_file[word].add(file_num)
-                    word_to_file_mult[word].append(file_num)
-
-            process_files.append(proc_file)
-
-        for word in list(word_to_file):
-            if len(word_to_file[word]) <= preprocess or len(word) <= 3:
-                word_to_file.pop(word, None)
-                word_to_file_mult.pop(word, None)
+        stopwords = set(self.stopwords) | {"dlrs", "revs"}
+        vocab_index = {}
+        token_ids = []
+        for doc in data:
+            words = _NON_ALPHANUMERIC.sub(" ", doc.lower()).split()
+            ids = [
+                vocab_index.setdefault(word, len(vocab_index))
+                for word in words
+                if word not in stopwords
+            ]
+            token_ids.append(np.asarray(ids, dtype=np.int64))
+        return vocab_index, token_ids
+
+    def _build_index(self):
+        """
+        Builds the sparse binary co-occurrence matrix of the dataset once and caches it.
 
-        if process_data:
-            vocab = word_to_file.keys()
-            files = []
-            for proc_file in process_files:
-                fil = []
-                for w in proc_file:
-                    if w in vocab:
-                        fil.append(w)
-                files.append(" ".join(fil))
+        Rows are documents, or sliding windows if ``window_size`` is set, and columns are
+        vocabulary words. The document frequency of every word is stored as well and is used
+        to filter rare words.
+        """
+        if self._cooc_matrix is not None:
+            return
 
-            data = files
+        vocab_index, token_ids = self._tokenize(self.files)
+        n_words = len(vocab_index)
 
-        return word_to_file, word_to_file_mult, data
+        doc_term = self._binary_matrix(
+            np.repeat(np.arange(len(token_ids)), [len(ids) for ids in token_ids]),
+            np.concatenate(token_ids) if token_ids else np.empty(0, dtype=np.int64),
+            (len(token_ids), n_words),
+        )
+        self._doc_freq = np.asarray(doc_term.sum(axis=0)).ravel()
+
+        if self.window_size is None:
+            self._cooc_matrix = doc_term
+        else:
+            rows, cols = [], []
+            n_windows = 0
+            for ids in token_ids:
+                if len(ids) == 0:
+                    continue
+                if len(ids) <= self.window_size:
+                    windows = ids[np.newaxis, :]
+                else:
+                    windows = np.lib.stride_tricks.sliding_window_view(
+                        ids, self.window_size
+                    )
+                rows.append(
+                    np.repeat(
+                        np.arange(n_windows, n_windows + len(windows)), windows.shape[1]
+                    )
+                )
+                cols.append(windows.ravel())
+                n_windows += len(windows)
+            self._cooc_matrix = self._binary_matrix(
+                np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+                np.concatenate(cols) if cols else np.empty(0, dtype=np.int64),
+                (n_windows, n_words),
+            )
+
+        self._vocab_index = vocab_index
+
+    @staticmethod
+    def _binary_matrix(rows, cols, shape):
+        matrix = csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=shape
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return matrix
 
-    def _create_vocab_and_files(self, preprocess=5):
+    def _npmi_per_topic(self, topic_words, preprocess):
         """
-        Creates vocabulary and files necessary for NPMI calculation.
+        Computes the mean NPMI of all word pairs for every topic.
 
         Parameters
         ----------
-        preprocess : int, optional
-            The minimum number of documents a word must appear in. Defaults to 5.
+        topic_words : list of list of str
+            A list of lists containing words in each topic.
+        preprocess : int
+            Words occurring in at most this many documents, or with at most three characters,
+            are treated as unseen.
 
         Returns
         -------
-        tuple
-            A tuple containing word-to-document mappings and other relevant data for NPMI calculation.
+        list of float
+            The mean NPMI score of every topic.
         """
-        return self._create_vocab_preprocess(self.files, preprocess)
+        self._build_index()
+        nfiles = self._cooc_matrix.shape[0]
+        eps = 10 ** (-12)
+
+        # column of every distinct, sufficiently frequent topic word in the index
+        words = list(dict.fromkeys(word for topic in topic_words for word in topic))
+        columns = np.array(
+            [self._vocab_index.get(word, -1) if len(word) > 3 else -1 for word in words],
+            dtype=np.int64,
+        )
+        known = columns >= 0
+        known[known] = self._doc_freq[columns[known]] > preprocess
+
+        # co-occurrence counts of the known topic words from one sparse product, kept in CSR;
+        # unknown words have the index -1 and no co-occurrences
+        sub_matrix = self._cooc_matrix[:, columns[known]]
+        counts = (sub_matrix.T @ sub_matrix).tocsr()
+        sub_index = np.full(len(words), -1, dtype=np.int64)
+        sub_index[known] = np.arange(known.sum())
+        doc_counts = np.zeros(len(words))
+        doc_counts[known] = counts.diagonal()
+        word_position = {word: i for i, word in enumerate(words)}
+
+        all_topics = []
+        for topic in topic_words:
+            positions = np.array([word_position[word] for word in topic], dtype=np.int64)
+            first, second = np.triu_indices(len(positions), k=1)
+            w1, w2 = positions[first], positions[second]
+
+            i1, i2 = sub_index[w1], sub_index[w2]
+            both = (i1 >= 0) & (i2 >= 0)
+            w1w2_dc = np.zeros(len(w1))
+            if both.any():
+                w1w2_dc[both] = np.asarray(counts[i1[both], i2[both]]).ravel()
+            w1_dc = doc_counts[w1]
+            w2_dc = doc_counts[w2]
+
+            # Correct eps:
+            pmi_w1w2 = np.log((w1w2_dc * nfiles) / ((w1_dc * w2_dc) + eps) + eps)
+            npmi_w1w2 = pmi_w1w2 / (-np.log((w1w2_dc) / nfiles + eps))
+
+            all_topics.append(np.mean(npmi_w1w2))
+
+        return all_topics
 
     def score(self, topic_words):
         """
@@ -196,40 +275,7 @@ class NPMI(BaseMetric):
             The average NPMI score for the topics.
         """
         self.ntopics = len(topic_words)
-        (
-            word_doc_counts,
-            dev_word_to_file_mult,
-            dev_files,
-        ) = self._create_vocab_and_files(preprocess=1)
-        nfiles = len(dev_files)
-        eps = 10 ** (-12)
-
-        all_topics = []
-        for k in range(self.ntopics):
-            topic_score = []
-
-            ntopw = len(topic_words[k])
-
-            for i in range(ntopw - 1):
-                for j in range(i + 1, ntopw):
-                    w1 = topic_words[k][i]
-                    w2 = topic_words[k][j]
-
-                    w1w2_dc = len(
-                        word_doc_counts.get(w1, set()) & word_doc_counts.get(w2, set())
-                    )
-                    w1_dc = len(word_doc_counts.get(w1, set()))
-                    w2_dc = len(word_doc_counts.get(w2, set()))
-
-                    # Correct eps:
-                    pmi_w1w2 = np.log(
-                        (w1w2_dc * nfiles) / ((w1_dc * w2_dc) + eps) + eps
-                    )
-                    npmi_w1w2 = pmi_w1w2 / (-np.log((w1w2_dc) / nfiles + eps))
-
-                    topic_score.append(npmi_w1w2)
-
-            all_topics.append(np.mean(topic_score))
+        all_topics = self._npmi_per_topic(topic_words, preprocess=1)
 
         avg_score = np.around(np.mean(all_topics), 5)
 
@@ -256,42 +302,7 @@ class NPMI(BaseMetric):
         """
 
         ntopics = len(topic_words)
-
-        (
-            word_doc_counts,
-            dev_word_to_file_mult,
-            dev_files,
-        ) = self._create_vocab_and_files(preprocess=preprocess)
-        nfiles = len(dev_files)
-        eps = 10 ** (-12)
-
-        all_topics = []
-
-        for k in range(ntopics):
-            topic_score = []
-
-            ntopw = len(topic_words[k])
-
-            for i in range(ntopw - 1):
-                for j in range(i + 1, ntopw):
-                    w1 = topic_words[k][i]
-                    w2 = topic_words[k][j]
-
-                    w1w2_dc = len(
-                        word_doc_counts.get(w1, set()) & word_doc_counts.get(w2, set())
-                    )
-                    w1_dc = len(word_doc_counts.get(w1, set()))
-                    w2_dc = len(word_doc_counts.get(w2, set()))
-
-                    # Correct eps:
-                    pmi_w1w2 = np.log(
-                        (w1w2_dc * nfiles) / ((w1_dc * w2_dc) + eps) + eps
-                    )
-                    npmi_w1w2 = pmi_w1w2 / (-np.log((w1w2_dc) / nfiles + eps))
-
-                    topic_score.append(npmi_w1w2)
-
-            all_topics.append(np.mean(topic_score))
+        all_topics = self._npmi_per_topic(topic_words, preprocess=preprocess)
 
         results = {}
         for k in range(ntopics):
@@ -327,7 +338,7 @@ class Embedding_Coherence(BaseMetric):
     def __init__(
         self,
         n_words=10,
-        metric_embedder=SentenceTransformer(PARAPHRASE_TRANSFORMER_MODEL),
+        metric_embedder=None,
         emb_filename=None,
         emb_path: str = EMBEDDING_PATH,
     ):
@@ -339,13 +350,17 @@ class Embedding_Coherence(BaseMetric):
         ----------
         n_words : int, optional
             The number of top words to consider for each topic. Defaults to 10.
-        metric_embedder : SentenceTransformer, optional
-            The SentenceTransformer model to use for embedding. Defaults to "paraphrase-MiniLM-L6-v2".
+        metric_embedder : SentenceTransformer or str, optional
+            The SentenceTransformer model, or its name, to use for embedding. Defaults to the shared
+            "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         emb_filename : str, optional
             The filename for the embedding model. Defaults to None.
         emb_path : str, optional
             The path to the embedding model. Defaults to EMBEDDING_PATH.
         """
+        metric_embedder = resolve_embedding_model(
+            metric_embedder, PARAPHRASE_TRANSFORMER_MODEL
+        )
 
         self.topword_embeddings = TopwordEmbeddings(
             word_embedding_model=metric_embedder,
@@ -1,29 +1,19 @@
-import gensim
-import nltk
 import numpy as np
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-from sklearn.metrics.pairwise import cosine_similarity
+from ..commons.embedding_registry import resolve_embedding_model
 from .base import BaseMetric
 from ._helper_funcs import (
     cos_sim_pw,
+    cosine_similarity,
     embed_stopwords,
+    get_default_stopwords,
 )
 from .constants import (
     EMBEDDING_PATH,
-    NLTK_STOPWORD_LANGUAGE,
     PARAPHRASE_TRANSFORMER_MODEL,
     SENTENCE_TRANSFORMER_MODEL,
 )
 from .TopwordEmbeddings import TopwordEmbeddings
 
-GENSIM_STOPWORDS = gensim.parsing.preprocessing.STOPWORDS
-NLTK_STOPWORDS = stopwords.words(NLTK_STOPWORD_LANGUAGE)
-STOPWORDS = list(
-    set(list(NLTK_STOPWORDS) + list(GENSIM_STOPWORDS) + list(ENGLISH_STOP_WORDS))
-)
-
 
 class Embedding_Topic_Diversity(BaseMetric):
     """
@@ -55,7 +45,7 @@ class Embedding_Topic_Diversity(BaseMetric):
     def __init__(
         self,
         n_words=10,
-        metric_embedder=SentenceTransformer(PARAPHRASE_TRANSFORMER_MODEL),
+        metric_embedder=None,
         emb_filename=None,
         emb_path: str = EMBEDDING_PATH,
     ):
@@ -67,13 +57,17 @@ class Embedding_Topic_Diversity(BaseMetric):
         ----------
         n_words : int, optional
             The number of top words to consider for each topic. Defaults to 10.
-        metric_embedder : SentenceTransformer, optional
-            The SentenceTransformer model to use for embedding. Defaults to "paraphrase-MiniLM-L6-v2".
+        metric_embedder : SentenceTransformer or str, optional
+            The SentenceTransformer model, or its name, to use for embedding. Defaults to the shared
+            "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         emb_filename : str, optional
             The filename of the embeddings to load. Defaults to None.
         emb_path : str, optional
             The path to the embeddings file. Defaults to "/embeddings".
         """
+        metric_embedder = resolve_embedding_model(
+            metric_embedder, PARAPHRASE_TRANSFORMER_MODEL
+        )
 
         self.topword_embeddings = TopwordEmbeddings(
             word_embedding_model=metric_embedder,
@@ -237,8 +231,8 @@ class Expressivity(BaseMetric):
     def __init__(
         self,
         n_words=10,
-        stopwords=list,
-        metric_embedder=SentenceTransformer(PARAPHRASE_TRANSFORMER_MODEL),
+        stopwords=None,
+        metric_embedder=None,
         emb_filename=None,
         emb_path: str = EMBEDDING_PATH,
     ):
@@ -252,8 +246,9 @@ class Expressivity(BaseMetric):
             The number of top words to consider for each topic. Defaults to 10.
         stopwords : list, optional
             A list of stopwords to use for the expressivity calculation. Defaults includes list of NLTK, Gensim, and Scikit-learn stopwords.
-        metric_embedder : SentenceTransformer, optional
-            The SentenceTransformer model to use for embedding. Defaults to "paraphrase-MiniLM-L6-v2".
+        metric_embedder : SentenceTransformer or str, optional
+            The SentenceTransformer model, or its name, to use for embedding. Defaults to the shared
+            "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         emb_filename : str, optional
             The filename of the embeddings to load. Defaults to None.
         emb_path : str, optional
@@ -261,7 +256,10 @@ class Expressivity(BaseMetric):
         """
         self.stopwords = stopwords
         if stopwords is None:
-            self.stopwords = STOPWORDS
+            self.stopwords = get_default_stopwords()
+        metric_embedder = resolve_embedding_model(
+            metric_embedder, PARAPHRASE_TRANSFORMER_MODEL
+        )
 
         self.topword_embeddings = TopwordEmbeddings(
             word_embedding_model=metric_embedder,
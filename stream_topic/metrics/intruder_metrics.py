@@ -1,7 +1,7 @@
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from ..commons.embedding_registry import resolve_embedding_model
 from .base import BaseMetric
+from ._helper_funcs import cosine_similarity
 from .constants import (
     EMBEDDING_PATH,
     PARAPHRASE_TRANSFORMER_MODEL,
@@ -44,7 +44,7 @@ class ISIM(BaseMetric):
         self,
         n_words=10,
         n_intruders=1,
-        metric_embedder=SentenceTransformer(PARAPHRASE_TRANSFORMER_MODEL),
+        metric_embedder=None,
         emb_filename=None,
         emb_path: str = EMBEDDING_PATH,
     ):
@@ -58,13 +58,17 @@ class ISIM(BaseMetric):
             The number of top words to consider for each topic. Defaults to 10.
         n_intruders : int, optional
             The number of intruder words to draw for each topic. Defaults to 1.
-        metric_embedder : SentenceTransformer, optional
-            The SentenceTransformer model to use for embedding. Defaults to "paraphrase-MiniLM-L6-v2".
+        metric_embedder : SentenceTransformer or str, optional
+            The SentenceTransformer model, or its name, to use for embedding. Defaults to the shared
+            "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         emb_filename : str, optional
             The filename for the embedding model. Defaults to None.
         emb_path : str, optional
             The path to the embedding model. Defaults to EMBEDDING_PATH.
         """
+        metric_embedder = resolve_embedding_model(
+            metric_embedder, PARAPHRASE_TRANSFORMER_MODEL
+        )
 
         self.topword_embeddings = TopwordEmbeddings(
             word_embedding_model=metric_embedder,
@@ -275,7 +279,7 @@ class INT(BaseMetric):
         self,
         n_words=10,
         n_intruders=1,
-        metric_embedder=SentenceTransformer(PARAPHRASE_TRANSFORMER_MODEL),
+        metric_embedder=None,
         emb_filename=None,
         emb_path: str = EMBEDDING_PATH,
     ):
@@ -289,13 +293,17 @@ class INT(BaseMetric):
             The number of top words to consider for each topic. Defaults to 10.
         n_intruders : int, optional
             The number of intruder words to draw for each topic. Defaults to 1.
-        metric_embedder : SentenceTransformer, optional
-            The SentenceTransformer model to use for embedding. Defaults to "paraphrase-MiniLM-L6-v2".
+        metric_embedder : SentenceTransformer or str, optional
+            The SentenceTransformer model, or its name, to use for embedding. Defaults to the shared
+            "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         emb_filename : str, optional
             The filename to use for saving embeddings. Defaults to None.
         emb_path : str, optional
             The path to use for saving embeddings. Defaults to "Embeddings/".
         """
+        metric_embedder = resolve_embedding_model(
+            metric_embedder, PARAPHRASE_TRANSFORMER_MODEL
+        )
 
         self.topword_embeddings = TopwordEmbeddings(
             word_embedding_model=metric_embedder,
@@ -521,7 +529,7 @@ class ISH(BaseMetric):
         self,
         n_words=10,
         n_intruders=1,
-        metric_embedder=SentenceTransformer(PARAPHRASE_TRANSFORMER_MODEL),
+        metric_embedder=None,
         emb_filename=None,
         emb_path: str = EMBEDDING_PATH,
     ):
@@ -535,13 +543,17 @@ class ISH(BaseMetric):
             The number of top words to consider for each topic. Defaults to 10.
         n_intruders : int, optional
             The number of intruder words to draw for each topic. Defaults to 1.
-        metric_embedder : SentenceTransformer, optional
-            The SentenceTransformer model to use for embedding. Defaults to "paraphrase-MiniLM-L6-v2".
+        metric_embedder : SentenceTransformer or str, optional
+            The SentenceTransformer model, or its name, to use for embedding. Defaults to the shared
+            "paraphrase-MiniLM-L3-v2" model from the embedding model registry.
         emb_filename : str, optional
             The filename to use for saving embeddings. Defaults to None.
         emb_path : str, optional
             The path to use for saving embeddings. Defaults to "Embeddings/".
         """
+        metric_embedder = resolve_embedding_model(
+            metric_embedder, PARAPHRASE_TRANSFORMER_MODEL
+        )
 
         self.topword_embeddings = TopwordEmbeddings(
             word_embedding_model=metric_embedder,
@@ -3,15 +3,18 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 from loguru import logger
-from sentence_transformers import SentenceTransformer
 from sklearn.mixture import GaussianMixture
 
 from ..commons.check_steps import check_dataset_steps
+from ..commons.embedding_registry import get_embedding_model
 from ..preprocessor import clean_topics
 from ..preprocessor.topic_extraction import TopicExtractor
 from ..utils.dataset import TMDataset
 from .abstract_helper_models.base import BaseModel, TrainingStatus
-from .abstract_helper_models.mixins import SentenceEncodingMixin
+from .abstract_helper_models.mixins import (
+    CentroidPredictionMixin,
+    SentenceEncodingMixin,
+)
 
 DATADIR = "../datasets/preprocessed_datasets"
 MODEL_NAME = "CEDC"
@@ -20,7 +23,7 @@ time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 # logger.add(f"{MODEL_NAME}_{time}.log", backtrace=True, diagnose=True)
 
 
-class CEDC(BaseModel, SentenceEncodingMixin):
+class CEDC(BaseModel, SentenceEncodingMixin, CentroidPredictionMixin):
     """
     Class for Clustering-based Embedding-driven Document Clustering (CEDC).
     Inherits from BaseModel and SentenceEncodingMixin.
@@ -44,6 +47,14 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         Flag indicating whether the model has been trained.
     save_embeddings : bool
         Whether to save generated embeddings.
+    encoding_batch_size : int
+        Number of text segments encoded per batch.
+    encoding_num_workers : int or None
+        Number of local processes used to encode documents.
+    embedding_cache_dir : str or None
+        Directory of the persistent per-document embedding cache.
+    word_bank_dir : str or None
+        Directory of the persistent word banks of the expansion corpora.
 
     """
 
@@ -56,6 +67,10 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         embeddings_folder_path: str = None,
         embeddings_file_path: str = None,
         save_embeddings: bool = False,
+        encoding_batch_size: int = 64,
+        encoding_num_workers: int = None,
+        embedding_cache_dir: str = None,
+        word_bank_dir: str = None,
         **kwargs,
     ):
         """
@@ -78,6 +93,14 @@ class CEDC(BaseModel, SentenceEncodingMixin):
             Path to the file containing embeddings.
         save_embeddings : bool, optional
             Whether to save generated embeddings.
+        encoding_batch_size : int, optional
+            Number of text segments encoded per batch (default is 64).
+        encoding_num_workers : int, optional
+            Number of local processes used to encode documents (default is None, a single process).
+        embedding_cache_dir : str, optional
+            Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded (default is None, no cache).
+        word_bank_dir : str, optional
+            Directory of the persistent word banks; the words of an expansion corpus are only POS-tagged and embedded once per corpus and embedding model (default is None, no cache).
         **kwargs
             Additional keyword arguments passed to super().__init__().
         """
@@ -130,6 +153,10 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         self.embeddings_path = embeddings_folder_path
         self.embeddings_file_path = embeddings_file_path
         self.save_embeddings = save_embeddings
+        self.encoding_batch_size = encoding_batch_size
+        self.encoding_num_workers = encoding_num_workers
+        self.embedding_cache_dir = embedding_cache_dir
+        self.word_bank_dir = word_bank_dir
 
         self._status = TrainingStatus.NOT_STARTED
 
@@ -253,7 +280,9 @@ class CEDC(BaseModel, SentenceEncodingMixin):
                 dataset=dataset,
                 topic_assignments=self.soft_labels,
                 n_topics=self.n_topics,
-                embedding_model=SentenceTransformer(self.embedding_model_name),
+                embedding_model=get_embedding_model(self.embedding_model_name),
+                embedding_model_name=self.embedding_model_name,
+                word_bank_dir=self.word_bank_dir,
             )
 
             logger.info("--- Extract topics ---")
@@ -276,7 +305,9 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         if clean:
             logger.info("--- Cleaning topics ---")
             cleaned_topics, cleaned_centroids = clean_topics(
-                topics, similarity=clean_threshold, embedding_model=self.embedding_model
+                topics,
+                similarity=clean_threshold,
+                embedding_model=get_embedding_model(self.embedding_model_name),
             )
             topics = cleaned_topics
             self.topic_centroids = cleaned_centroids
@@ -288,7 +319,7 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         self.theta = np.array(self.soft_labels)
         self.beta = self.get_beta()
 
-    def predict(self, texts, proba=True):
+    def predict(self, texts, proba=True, method="umap", embeddings=None):
         """
         Predict topics for new documents.
 
@@ -297,6 +328,15 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         ----------
         texts : list of str
             List of texts to predict topics for.
+        proba : bool, optional
+            Whether to return topic probabilities instead of labels (default is True).
+        method : str, optional
+            "umap" to reduce the embeddings with the fitted UMAP and use the GMM, "centroid"
+            to score topics by the cosine similarity to their centroids, or "ann" to average
+            the topic probabilities of the nearest training documents. The last two skip UMAP,
+            see ``prepare_prediction`` (default is "umap").
+        embeddings : np.ndarray, optional
+            Precomputed embeddings of the texts, which are then not encoded.
 
 
         Returns
@@ -312,9 +352,17 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         """
         if self._status != TrainingStatus.SUCCEEDED:
             raise RuntimeError("Model has not been trained yet or failed.")
-        embeddings = self.encode_documents(
-            texts, encoder_model=self.embedding_model_name, use_average=True
-        )
+        if embeddings is None:
+            embeddings = self.encode_documents(
+                texts, encoder_model=self.embedding_model_name, use_average=True
+            )
+        if method != "umap":
+            scores = self.topic_scores(embeddings, method)
+            if not proba:
+                return np.argmax(scores, axis=1)
+            # negative cosine similarities get no probability mass
+            scores = np.clip(scores, 0, None)
+            return scores / np.maximum(scores.sum(axis=1, keepdims=True), 1e-12)
         reduced_embeddings = self.reducer.transform(embeddings)
         if proba:
             labels = self.GMM.predict_proba(reduced_embeddings)
@@ -326,21 +374,17 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         """
         Constructs a topic-word matrix from the given topic dictionary.
 
-        Parameters
-        ----------
-        topic_dict : dict
-            Dictionary where keys are topic indices and values are lists of (word, prevalence) tuples.
-
         Returns
         -------
         ndarray
-            Topic-word matrix where rows represent topics and columns represent words.
+            Topic-word matrix where rows represent words and columns represent topics.
 
 
         Notes
         -----
-        The topic-word matrix is constructed by assigning prevalences of words in topics.
-        Words are sorted alphabetically across all topics.
+        The topic-word matrix holds the prevalences of words in topics.
+        Words are sorted alphabetically across all topics. The matrix is cached on
+        the model until the topic dictionary changes; ``beta`` is a copy of it.
 
 
         Raises
@@ -349,25 +393,7 @@ class CEDC(BaseModel, SentenceEncodingMixin):
             If the model has not been trained yet.
         """
 
-        if self._status != TrainingStatus.SUCCEEDED:
-            raise RuntimeError("Model has not been trained yet or failed.")
-        assert hasattr(self, "topic_dict"), "Model has no topic_dict."
-
-        # Extract all unique words and sort them
-        all_words = set(word for topic in self.topic_dict.values() for word, _ in topic)
-        sorted_words = sorted(all_words)
-
-        # Create an empty DataFrame with sorted words as rows and topics as columns
-        topic_word_matrix = pd.DataFrame(
-            index=sorted_words, columns=sorted(self.topic_dict.keys()), data=0.0
-        )
-
-        # Populate the DataFrame with prevalences
-        for topic, words in self.topic_dict.items():
-            for word, prevalence in words:
-                if word in topic_word_matrix.index:
-                    topic_word_matrix.at[word, topic] = prevalence
-        self.beta = np.array(topic_word_matrix)
+        self.beta, _ = self.get_topic_dict_matrix()
         return self.beta
 
     def suggest_hyperparameters(self, trial):
@@ -409,6 +435,8 @@ class CEDC(BaseModel, SentenceEncodingMixin):
         criterion="aic",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that optimizes and fits the model.
@@ -427,6 +455,10 @@ class CEDC(BaseModel, SentenceEncodingMixin):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -440,14 +472,14 @@ class CEDC(BaseModel, SentenceEncodingMixin):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
 
     def calculate_aic(self, n_topics=None):
-
         return self.GMM.aic(self.reduced_embeddings)
 
     def calculate_bic(self, n_topics=None):
-
         return self.GMM.bic(self.reduced_embeddings)
@@ -114,7 +114,9 @@ class DCTE(BaseModel):
         docs_per_topic = predict_df.groupby(["predictions"], as_index=False).agg(
             {"text": " ".join}
         )
-        tfidf, count = c_tf_idf(docs_per_topic["text"].values, m=len(predict_df))
+        tfidf, count = c_tf_idf(
+            docs_per_topic["text"].values, m=len(predict_df), sparse=True
+        )
         topic_dict = extract_tfidf_topics(
             tfidf,
             count,
@@ -7,10 +7,13 @@ from sklearn.cluster import KMeans
 from sklearn.preprocessing import OneHotEncoder
 
 from ..commons.check_steps import check_dataset_steps
-from ..preprocessor import c_tf_idf, extract_tfidf_topics
+from ..preprocessor import ClassTfidf, c_tf_idf, extract_tfidf_topics
 from ..utils.dataset import TMDataset
 from .abstract_helper_models.base import BaseModel, TrainingStatus
-from .abstract_helper_models.mixins import SentenceEncodingMixin
+from .abstract_helper_models.mixins import (
+    CentroidPredictionMixin,
+    SentenceEncodingMixin,
+)
 
 time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 MODEL_NAME = "KmeansTM"
@@ -18,7 +21,7 @@ EMBEDDING_MODEL_NAME = "paraphrase-MiniLM-L3-v2"
 # logger.add(f"{MODEL_NAME}_{time}.log", backtrace=True, diagnose=True)
 
 
-class KmeansTM(BaseModel, SentenceEncodingMixin):
+class KmeansTM(BaseModel, SentenceEncodingMixin, CentroidPredictionMixin):
     """
     A topic modeling class that uses K-Means clustering on text data.
 
@@ -41,6 +44,12 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         Flag indicating whether the model has been trained.
     save_embeddings : bool
         Whether to save generated embeddings.
+    encoding_batch_size : int
+        Number of text segments encoded per batch.
+    encoding_num_workers : int or None
+        Number of local processes used to encode documents.
+    embedding_cache_dir : str or None
+        Directory of the persistent per-document embedding cache.
     n_topics : int or None
         Number of topics to extract.
 
@@ -55,6 +64,9 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         embeddings_folder_path: str = None,
         embeddings_file_path: str = None,
         save_embeddings: bool = False,
+        encoding_batch_size: int = 64,
+        encoding_num_workers: int = None,
+        embedding_cache_dir: str = None,
         **kwargs,
     ):
         """
@@ -76,6 +88,12 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
             Path to folder to save embeddings, by default None
         embeddings_file_path : str, optional
             Path to specific embeddings file, by default None
+        encoding_batch_size : int, optional
+            Number of text segments encoded per batch, by default 64
+        encoding_num_workers : int, optional
+            Number of local processes used to encode documents, by default None (single process)
+        embedding_cache_dir : str, optional
+            Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded, by default None (no cache)
         **kwargs
             Additional keyword arguments passed to the superclass.
         """
@@ -112,7 +130,12 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         self.embeddings_path = embeddings_folder_path
         self.embeddings_file_path = embeddings_file_path
         self.save_embeddings = save_embeddings
+        self.encoding_batch_size = encoding_batch_size
+        self.encoding_num_workers = encoding_num_workers
+        self.embedding_cache_dir = embedding_cache_dir
         self.n_topics = None
+        # reused across fits, so refits only vectorize the clusters that changed
+        self._class_tfidf = ClassTfidf()
 
         self._status = TrainingStatus.NOT_STARTED
 
@@ -216,7 +239,10 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
             ).agg({"text": " ".join})
 
             tfidf, count = c_tf_idf(
-                docs_per_topic["text"].values, m=len(self.dataframe)
+                docs_per_topic["text"].values,
+                m=len(self.dataframe),
+                sparse=True,
+                engine=self._class_tfidf,
             )
             self.topic_dict = extract_tfidf_topics(tfidf, count, docs_per_topic, n=100)
 
@@ -225,7 +251,7 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
                 self.dataframe[["predictions"]]
             )
 
-            self.beta = tfidf
+            self.beta = tfidf.toarray()
             self.theta = predictions_one_hot
 
         except Exception as e:
@@ -240,7 +266,7 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-    def predict(self, texts):
+    def predict(self, texts, method="umap", embeddings=None):
         """
         Predict topics for new documents.
 
@@ -248,6 +274,13 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         ----------
         texts : list of str
             List of texts to predict topics for.
+        method : str, optional
+            "umap" to reduce the embeddings with the fitted UMAP and use the K-Means model,
+            "centroid" to assign the topic with the most similar centroid, or "ann" to use
+            the topics of the nearest training documents. The last two skip UMAP, see
+            ``prepare_prediction``. By default "umap".
+        embeddings : np.ndarray, optional
+            Precomputed embeddings of the texts, which are then not encoded.
 
         Returns
         -------
@@ -261,9 +294,12 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         """
         if self._status != TrainingStatus.SUCCEEDED:
             raise RuntimeError("Model has not been trained yet or failed.")
-        embeddings = self.encode_documents(
-            texts, encoder_model=self.embedding_model_name, use_average=True
-        )
+        if embeddings is None:
+            embeddings = self.encode_documents(
+                texts, encoder_model=self.embedding_model_name, use_average=True
+            )
+        if method != "umap":
+            return np.argmax(self.topic_scores(embeddings, method), axis=1)
         reduced_embeddings = self.reducer.transform(embeddings)
         labels = self.clustering_model.predict(reduced_embeddings)
         return labels
@@ -344,6 +380,8 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
         criterion="aic",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -362,6 +400,10 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -375,6 +417,8 @@ class KmeansTM(BaseModel, SentenceEncodingMixin):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
@@ -326,17 +326,16 @@ class WordCluTM(BaseModel):
             self.theta = pd.DataFrame(doc_topic_distributions)
 
             # Create topic_dict
-            self.topic_dict = {}
-            for topic_idx in range(self.beta.shape[1]):
-                # Get the indices of the words sorted by their probability of belonging to this topic, in descending order
-                sorted_indices = np.argsort(self.beta.iloc[:, topic_idx])[::-1]
-                # Get the top n_words for this topic based on the sorted indices
-                top_words = [
-                    (unique_words[i], self.beta.iloc[i, topic_idx])
-                    for i in sorted_indices[:n_words]
+            beta = self.beta.to_numpy()
+            # Indices of the words sorted by their probability of belonging to each topic, in descending order
+            top_indices = np.argsort(beta, axis=0)[::-1][:n_words]
+            self.topic_dict = {
+                topic_idx: [
+                    (unique_words[i], beta[i, topic_idx])
+                    for i in top_indices[:, topic_idx]
                 ]
-                # Store the top words and their probabilities in the dictionary
-                self.topic_dict[topic_idx] = top_words
+                for topic_idx in range(beta.shape[1])
+            }
 
         except Exception as e:
             logger.error(f"Error in training: {e}")
@@ -392,6 +391,8 @@ class WordCluTM(BaseModel):
         criterion="aic",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that optimizes and fits the model.
@@ -410,6 +411,10 @@ class WordCluTM(BaseModel):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -423,6 +428,8 @@ class WordCluTM(BaseModel):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
@@ -10,6 +10,21 @@ import umap.umap_ as umap
 from loguru import logger
 from optuna.integration import PyTorchLightningPruningCallback
 
+from ...utils.reduction_cache import ReductionCache, reduction_key
+from ...utils.topic_word_matrix import topic_dict_to_matrix
+from .parallel_search import run_study
+
+
+def _topic_dict_signature(topic_dict):
+    """
+    Hash of the topics, words and scores of a topic dictionary, or None if its
+    entries are not hashable.
+    """
+    try:
+        return hash(tuple((topic, tuple(words)) for topic, words in topic_dict.items()))
+    except TypeError:
+        return None
+
 
 class BaseModel(ABC):
     """
@@ -39,6 +54,9 @@ class BaseModel(ABC):
         get_beta():
             Retrieve the topic-word distribution matrix.
 
+        get_topic_dict_matrix(sparse=False):
+            Build the word-topic matrix of the topic dictionary.
+
         get_theta():
             Retrieve the topic-document distribution matrix.
 
@@ -183,6 +201,12 @@ class BaseModel(ABC):
         """
         Reduces the dimensionality of embeddings using UMAP.
 
+        Reductions are looked up in ``self.reduction_cache`` by a hash of the
+        embeddings and the UMAP arguments, so refits with UMAP arguments that were
+        already used, e.g. Optuna trials that only change the clustering, reuse
+        the fitted reducer. Assign a ``ReductionCache`` with a ``cache_dir`` to keep
+        reductions on disk, or share one cache between models.
+
         Raises
         ------
         ValueError
@@ -192,6 +216,15 @@ class BaseModel(ABC):
             self, "embeddings"
         ), "Model has no embeddings to reduce dimensions."
         assert hasattr(self, "umap_args"), "Model has no UMAP arguments specified."
+        if getattr(self, "reduction_cache", None) is None:
+            self.reduction_cache = ReductionCache()
+        key = reduction_key(self.embeddings, self.umap_args)
+        cached = self.reduction_cache.get(key)
+        if cached is not None:
+            logger.info("--- Reusing cached reduced dimensions ---")
+            self.reducer, reduced_embeddings = cached
+            return reduced_embeddings
+
         try:
             logger.info("--- Reducing dimensions ---")
             self.reducer = umap.UMAP(**self.umap_args)
@@ -199,6 +232,7 @@ class BaseModel(ABC):
         except Exception as e:
             raise RuntimeError(f"Error in dimensionality reduction: {e}") from e
 
+        self.reduction_cache.put(key, self.reducer, reduced_embeddings)
         return reduced_embeddings
 
     def prepare_embeddings(self, dataset, logger):
@@ -210,7 +244,7 @@ class BaseModel(ABC):
         dataset : Dataset
             The dataset to be used for clustering.
         """
-
+        embeddings = None
         if dataset.has_embeddings(self.embedding_model_name):
             logger.info(
                 f"--- Loading precomputed {self.embedding_model_name} embeddings ---"
@@ -220,8 +254,14 @@ class BaseModel(ABC):
                 self.embeddings_path,
                 self.embeddings_file_path,
             )
+            if len(embeddings) != len(dataset.texts):
+                logger.warning(
+                    f"--- Precomputed embeddings cover {len(embeddings)} of "
+                    f"{len(dataset.texts)} documents, encoding the documents instead ---"
+                )
+                embeddings = None
 
-        else:
+        if embeddings is None:
             logger.info(
                 f"--- Creating {self.embedding_model_name} document embeddings ---"
             )
@@ -285,6 +325,48 @@ class BaseModel(ABC):
         assert hasattr(self, "beta"), "Model has no topic-word distribution."
         return self.beta
 
+    def get_topic_dict_matrix(self, sparse=False):
+        """
+        Build the word-topic matrix of the topic dictionary.
+
+        The matrix is cached on the model together with a signature of the content of
+        ``topic_dict``, so assigning a new topic dictionary or changing it in place
+        invalidates the cache. Every call returns a copy of the cached matrix.
+
+        Parameters
+        ----------
+        sparse : bool, optional
+            Whether to return a ``scipy.sparse.csr_matrix``, by default False.
+
+        Returns
+        -------
+        tuple
+            The matrix of shape (n_words, n_topics) with the prevalence of every word in
+            every topic, and the sorted vocabulary of its rows.
+
+        Raises
+        ------
+        RuntimeError
+            If the model has not been trained yet.
+        """
+        if self._status != TrainingStatus.SUCCEEDED:
+            raise RuntimeError("Model has not been trained yet or failed.")
+        assert hasattr(self, "topic_dict"), "Model has no topic dictionary."
+
+        signature = _topic_dict_signature(self.topic_dict)
+        cache = getattr(self, "_topic_word_matrix_cache", None)
+        if signature is None or cache is None or cache[0] != signature:
+            cache = (signature, {})
+            self._topic_word_matrix_cache = cache
+        matrices = cache[1]
+        if True not in matrices:
+            matrices[True] = topic_dict_to_matrix(self.topic_dict, sparse=True)
+        if not sparse and False not in matrices:
+            matrix, vocabulary = matrices[True]
+            matrices[False] = (matrix.toarray(), vocabulary)
+        matrix, vocabulary = matrices[sparse]
+        return matrix.copy(), list(vocabulary)
+
     def get_theta(self):
         """
         Retrieve the topic-document distribution matrix.
@@ -316,6 +398,8 @@ class BaseModel(ABC):
         criterion="aic",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         Optimize model parameters using Optuna.
@@ -334,6 +418,13 @@ class BaseModel(ABC):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, each on its own copy of the
+            model, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL (e.g. ``sqlite:///optuna.db``) or journal file path to
+            store the study, by default None. A study of the model class in the storage
+            is resumed.
 
         Returns
         -------
@@ -351,39 +442,18 @@ class BaseModel(ABC):
                 custom_metric is not None
             ), "Custom metric must be provided for criterion 'custom'."
 
-        def objective(trial):
-            # Suggest number of topics
-            self.hparams["n_topics"] = trial.suggest_int(
-                "n_topics", min_topics, max_topics
-            )
-
-            # Call the model-specific parameter suggestion method
-            self.suggest_hyperparameters(trial)
-
-            # Perform dimensionality reduction and clustering
-            self.fit(dataset)
-
-            # Calculate the score based on the criterion
-            if criterion in ["aic", "bic", "recon"]:
-
-                if criterion == "aic":
-                    score = self.calculate_aic(n_topics=self.hparams["n_topics"])
-                elif criterion == "bic":
-                    score = self.calculate_bic(n_topics=self.hparams["n_topics"])
-                elif criterion == "recon":
-                    score = self.reconstruction_loss()
-            else:
-                # Compute the custom metric score
-                topics = self.get_topics()
-                score = -custom_metric.score(
-                    topics
-                )  # Assuming higher metric score is better, negate for minimization
-
-            return score
-
-        # Create an Optuna study and optimize the objective function
-        study = optuna.create_study(direction="minimize")
-        study.optimize(objective, n_trials=n_trials)
+        study = run_study(
+            self,
+            "_score_trial",
+            dataset,
+            n_trials,
+            n_jobs=n_jobs,
+            storage=storage,
+            custom_metric=custom_metric,
+            min_topics=min_topics,
+            max_topics=max_topics,
+            criterion=criterion,
+        )
 
         best_params = study.best_params
         best_score = study.best_value
@@ -435,10 +505,15 @@ class BaseModel(ABC):
         criterion="val_loss",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         Optimize model parameters using Optuna.
 
+        Trials that are worse than the median of the previous trials at the same epoch
+        are pruned; in parallel runs the median covers the trials of all processes.
+
         Parameters
         ----------
         dataset : TMDataset
@@ -453,6 +528,13 @@ class BaseModel(ABC):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, each on its own copy of the
+            model, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL (e.g. ``sqlite:///optuna.db``) or journal file path to
+            store the study, by default None. A study of the model class in the storage
+            is resumed.
 
         Returns
         -------
@@ -468,37 +550,19 @@ class BaseModel(ABC):
                 custom_metric is not None
             ), "Custom metric must be provided for criterion 'custom'."
 
-        def objective(trial):
-            # Suggest number of topics
-            self.hparams["n_topics"] = trial.suggest_int(
-                "n_topics", min_topics, max_topics
-            )
-
-            # Call the model-specific parameter suggestion method
-            self.suggest_hyperparameters(trial)
-
-            # Perform dimensionality reduction and clustering
-            self.fit(dataset, trial=trial, optimize=True)
-
-            if criterion == "val_loss":
-
-                score = self.trainer.validate(self.model, self.data_module)[0][
-                    "val_loss_epoch"
-                ]
-
-            else:
-                topics = self.get_topics()
-                score = -custom_metric.score(
-                    topics
-                )  # Assuming higher metric score is better, negate for minimization
-
-            return score
-
-        # Create an Optuna study and optimize the objective function
-        study = optuna.create_study(
-            direction="minimize", pruner=optuna.pruners.MedianPruner()
+        study = run_study(
+            self,
+            "_score_trial_neural",
+            dataset,
+            n_trials,
+            n_jobs=n_jobs,
+            storage=storage,
+            pruner=optuna.pruners.MedianPruner(),
+            custom_metric=custom_metric,
+            min_topics=min_topics,
+            max_topics=max_topics,
+            criterion=criterion,
         )
-        study.optimize(objective, n_trials=n_trials)
 
         best_params = study.best_params
         best_score = study.best_value
@@ -545,6 +609,62 @@ class BaseModel(ABC):
             "best_score": best_score,
         }
 
+    def _score_trial(
+        self, trial, dataset, min_topics, max_topics, criterion, custom_metric=None
+    ):
+        """
+        Fit the model with the parameters suggested by a trial and score it.
+
+        Returns
+        -------
+        float
+            The score of the trial, lower is better.
+        """
+        # Suggest number of topics
+        self.hparams["n_topics"] = trial.suggest_int("n_topics", min_topics, max_topics)
+
+        # Call the model-specific parameter suggestion method
+        self.suggest_hyperparameters(trial)
+
+        # Perform dimensionality reduction and clustering
+        self.fit(dataset)
+
+        # Calculate the score based on the criterion
+        if criterion == "aic":
+            return self.calculate_aic(n_topics=self.hparams["n_topics"])
+        if criterion == "bic":
+            return self.calculate_bic(n_topics=self.hparams["n_topics"])
+        if criterion == "recon":
+            return self.reconstruction_loss()
+        # Assuming higher metric score is better, negate for minimization
+        return -custom_metric.score(self.get_topics())
+
+    def _score_trial_neural(
+        self, trial, dataset, min_topics, max_topics, criterion, custom_metric=None
+    ):
+        """
+        Train the neural model with the parameters suggested by a trial and score it.
+
+        Returns
+        -------
+        float
+            The score of the trial, lower is better.
+        """
+        # Suggest number of topics
+        self.hparams["n_topics"] = trial.suggest_int("n_topics", min_topics, max_topics)
+
+        # Call the model-specific parameter suggestion method
+        self.suggest_hyperparameters(trial)
+
+        self.fit(dataset, trial=trial, optimize=True)
+
+        if criterion == "val_loss":
+            return self.trainer.validate(self.model, self.data_module)[0][
+                "val_loss_epoch"
+            ]
+        # Assuming higher metric score is better, negate for minimization
+        return -custom_metric.score(self.get_topics())
+
     def suggest_hyperparameters(self, trial):
         """
         This method should be overridden in the child class to suggest model-specific hyperparameters.
@@ -1,15 +1,27 @@
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from tqdm import tqdm
+from loguru import logger
+from scipy.sparse import csr_matrix
+
+from ...commons.embedding_cache import EmbeddingCache
+from ...commons.embedding_registry import get_embedding_model
+from .base import TrainingStatus
 
 EMBEDDING_MODEL_NAME = "paraphrase-MiniLM-L3-v2"
+ENCODING_BATCH_SIZE = 64
+INFERENCE_BATCH_SIZE = 1024
 
 
 class SentenceEncodingMixin:
     """
     Mixin class for models that require sentence encoding before fitting or transforming.
+
+    Models using this mixin can set the attributes ``encoding_batch_size`` and
+    ``encoding_num_workers`` to control how documents are encoded. They are used
+    whenever ``encode_documents`` is called without explicit values. If the attribute
+    ``embedding_cache_dir`` is set, embeddings are looked up in and added to a
+    persistent ``EmbeddingCache`` in that directory, so only new texts are encoded.
     """
 
     def encode_documents(
@@ -17,36 +29,163 @@ class SentenceEncodingMixin:
         documents: List[str],
         encoder_model: str = EMBEDDING_MODEL_NAME,
         use_average: bool = True,
+        batch_size: int = None,
+        num_workers: int = None,
     ) -> np.ndarray:
         """
         Encode a list of documents into embeddings.
 
+        All segments of all documents are collected into one flat list and encoded
+        in batches. Documents longer than the encoder's maximum sequence length are
+        split into segments whose embeddings are averaged per document.
+
         Parameters:
             documents (List[str]): List of documents to encode.
-            encoder_model (str): Name or path of the sentence encoder model. Defaults to 'all-MiniLM-L6-v2'.
+            encoder_model (str): Name or path of the sentence encoder model. Defaults to 'paraphrase-MiniLM-L3-v2'.
             use_average (bool): Whether to use average embeddings for long documents. Defaults to True.
+            batch_size (int, optional): Number of segments encoded per batch. Defaults to the
+                instance's ``encoding_batch_size`` or 64.
+            num_workers (int, optional): Number of local encoding processes. Values above 1 encode
+                the segments with a multi-process pool. Defaults to the instance's
+                ``encoding_num_workers`` or a single process.
 
         Returns:
             np.ndarray: Array of shape (n_documents, embedding_size) containing document embeddings.
         """
-        encoder = SentenceTransformer(encoder_model)
+        if batch_size is None:
+            batch_size = getattr(self, "encoding_batch_size", None) or ENCODING_BATCH_SIZE
+        if num_workers is None:
+            num_workers = getattr(self, "encoding_num_workers", None)
+
+        cache_dir = getattr(self, "embedding_cache_dir", None)
+        documents = list(documents)
+        if cache_dir is not None and len(documents) > 0:
+            # truncated and segment-averaged embeddings of long texts differ
+            cache_key = encoder_model if use_average else f"{encoder_model}__truncated"
+            return EmbeddingCache(cache_dir).encode(
+                cache_key,
+                documents,
+                lambda texts: self._encode_uncached(
+                    texts, encoder_model, use_average, batch_size, num_workers
+                ),
+            )
+
+        return self._encode_uncached(
+            documents, encoder_model, use_average, batch_size, num_workers
+        )
+
+    def _encode_uncached(
+        self,
+        documents: List[str],
+        encoder_model: str,
+        use_average: bool,
+        batch_size: int,
+        num_workers: int,
+    ) -> np.ndarray:
+        """
+        Encode documents with the sentence encoder, without consulting the embedding cache.
+
+        Parameters:
+            documents (List[str]): List of documents to encode.
+            encoder_model (str): Name or path of the sentence encoder model.
+            use_average (bool): Whether to use average embeddings for long documents.
+            batch_size (int): Number of segments encoded per batch.
+            num_workers (int): Number of local encoding processes.
+
+        Returns:
+            np.ndarray: Array of shape (n_documents, embedding_size) containing document embeddings.
+        """
+        encoder = get_embedding_model(encoder_model)
         max_length = (
             encoder.max_seq_length
         )  # Extract maximum length from the encoder model
-        embeddings = []
-        for doc in tqdm(documents):
+
+        if len(documents) == 0:
+            return np.empty(
+                (0, encoder.get_sentence_embedding_dimension()), dtype=np.float32
+            )
+
+        segments, segment_owners = self._collect_segments(
+            documents, max_length, use_average
+        )
+
+        if num_workers is not None and num_workers > 1:
+            pool = encoder.start_multi_process_pool(
+                target_devices=["cpu"] * num_workers
+            )
+            try:
+                segment_embeddings = encoder.encode_multi_process(
+                    segments, pool, batch_size=batch_size
+                )
+            finally:
+                encoder.stop_multi_process_pool(pool)
+        else:
+            segment_embeddings = encoder.encode(
+                segments,
+                batch_size=batch_size,
+                show_progress_bar=True,
+                convert_to_numpy=True,
+            )
+
+        return self._average_segments(
+            np.asarray(segment_embeddings), segment_owners, len(documents)
+        )
+
+    def _collect_segments(
+        self, documents: List[str], max_length: int, use_average: bool
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Flatten documents into a single list of segments.
+
+        Parameters:
+            documents (List[str]): Documents to split.
+            max_length (int): Maximum length of each segment.
+            use_average (bool): Whether long documents are split into segments.
+
+        Returns:
+            Tuple[List[str], np.ndarray]: The segments and, for each segment, the index of
+            the document it belongs to.
+        """
+        segments = []
+        segment_owners = []
+        for doc_idx, doc in enumerate(documents):
             if len(doc) > max_length and use_average:
-                # Split document into segments of max_length and encode each segment
-                segments = self.split_document(doc, max_length)
-                segment_embeddings = [encoder.encode(seg) for seg in segments]
-                # Compute average embedding across segments
-                avg_embedding = np.mean(segment_embeddings, axis=0)
-                embeddings.append(avg_embedding)
+                doc_segments = self.split_document(doc, max_length)
             else:
-                # Encode the entire document
-                embeddings.append(encoder.encode(doc))
+                doc_segments = [doc]
+            segments.extend(doc_segments)
+            segment_owners.extend([doc_idx] * len(doc_segments))
+        return segments, np.asarray(segment_owners, dtype=np.int64)
+
+    @staticmethod
+    def _average_segments(
+        segment_embeddings: np.ndarray, segment_owners: np.ndarray, n_documents: int
+    ) -> np.ndarray:
+        """
+        Average segment embeddings per document with a single sparse scatter-mean.
+
+        Parameters:
+            segment_embeddings (np.ndarray): Array of shape (n_segments, embedding_size).
+            segment_owners (np.ndarray): Document index of every segment.
+            n_documents (int): Number of documents.
+
+        Returns:
+            np.ndarray: Array of shape (n_documents, embedding_size).
+        """
+        if len(segment_owners) == n_documents:
+            # every document was encoded as a single segment
+            return segment_embeddings
 
-        return np.array(embeddings)
+        counts = np.bincount(segment_owners, minlength=n_documents)
+        averaging = csr_matrix(
+            (
+                1.0 / counts[segment_owners],
+                (segment_owners, np.arange(len(segment_owners))),
+            ),
+            shape=(n_documents, len(segment_owners)),
+            dtype=segment_embeddings.dtype,
+        )
+        return np.asarray(averaging @ segment_embeddings)
 
     def split_document(self, document: str, max_length: int) -> List[str]:
         """
@@ -64,3 +203,195 @@ class SentenceEncodingMixin:
             segment = document[start: start + max_length]
             segments.append(segment)
         return segments
+
+
+class NeuralInferenceMixin:
+    """
+    Mixin for topic models built on ``NeuralBaseModel`` that computes document-topic
+    distributions by streaming documents through the trained model in batches.
+
+    Models using this mixin can set the attributes ``inference_batch_size`` and
+    ``theta_memmap_path`` to control the chunk size and to write theta to a
+    memory-mapped ``.npy`` file. Models whose base model does not take a batch
+    dictionary override ``_theta_from_batch``.
+    """
+
+    def _theta_from_batch(self, model, batch):
+        """
+        Compute theta for one batch with the wrapped base model.
+
+        Parameters:
+            model (nn.Module): The base model, e.g. ``CTMBase``.
+            batch (dict): Batch of input tensors.
+
+        Returns:
+            torch.Tensor: Theta of shape (batch_size, n_topics).
+        """
+        return model.get_theta(batch, only_theta=True)
+
+    def _inference_inputs(self, dataset) -> dict:
+        """
+        Collect the model inputs for a dataset.
+
+        The bag-of-words of the training dataset is used as it is. Other datasets are
+        vectorized with the training vocabulary, so the columns match the model.
+
+        Parameters:
+            dataset (TMDataset): Dataset to compute theta for.
+
+        Returns:
+            dict: Model inputs by batch key.
+        """
+        datamodule_args = self.hparams["datamodule_args"]
+        inputs = {}
+        if datamodule_args.get("embeddings"):
+            if getattr(dataset, "embeddings", None) is None:
+                dataset, _ = self.prepare_embeddings(dataset, logger)
+            inputs["embedding"] = dataset.embeddings
+        if datamodule_args.get("bow"):
+            if dataset is getattr(self, "dataset", None) and dataset.bow is not None:
+                inputs["bow"] = dataset.bow
+            else:
+                from sklearn.feature_extraction.text import CountVectorizer
+
+                vectorizer = CountVectorizer(vocabulary=list(self.data_module.vocab))
+                corpus = [" ".join(tokens) for tokens in dataset.get_corpus()]
+                inputs["bow"] = vectorizer.transform(corpus).astype(np.float32).tocsr()
+        return inputs
+
+    def infer_theta(
+        self, dataset, batch_size: int = None, memmap_path: str = None
+    ) -> np.ndarray:
+        """
+        Compute the document-topic distribution of every document in a dataset.
+
+        The base model runs in eval mode, see ``NeuralBaseModel.infer_theta``, so theta
+        no longer depends on dropout as it did when it was computed in train mode.
+
+        Parameters:
+            dataset (TMDataset): Dataset to compute theta for.
+            batch_size (int, optional): Number of documents per chunk. Defaults to the
+                instance's ``inference_batch_size`` or 1024.
+            memmap_path (str, optional): Path of a ``.npy`` file theta is written to as a
+                memory map. Defaults to the instance's ``theta_memmap_path`` or an in-memory array.
+
+        Returns:
+            np.ndarray: Array of shape (n_documents, n_topics) whose rows sum to 1.
+        """
+        if batch_size is None:
+            batch_size = getattr(self, "inference_batch_size", None) or INFERENCE_BATCH_SIZE
+        if memmap_path is None:
+            memmap_path = getattr(self, "theta_memmap_path", None)
+
+        return self.model.infer_theta(
+            self._inference_inputs(dataset),
+            theta_fn=self._theta_from_batch,
+            batch_size=batch_size,
+            memmap_path=memmap_path,
+        )
+
+    def predict(self, dataset, proba: bool = True, batch_size: int = None, memmap_path: str = None):
+        """
+        Predict the topics of the documents of a (possibly unseen) dataset.
+
+        Parameters:
+            dataset (TMDataset): Dataset to predict topics for.
+            proba (bool): Whether to return the topic distributions instead of the most
+                likely topic of every document. Defaults to True.
+            batch_size (int, optional): Number of documents per chunk.
+            memmap_path (str, optional): Path of a ``.npy`` file the topic distributions are
+                written to as a memory map.
+
+        Returns:
+            np.ndarray: Topic distributions of shape (n_documents, n_topics), or topic labels.
+        """
+        if getattr(self, "model", None) is None or self._status != TrainingStatus.SUCCEEDED:
+            raise RuntimeError("Model has not been trained yet or failed.")
+        theta = self.infer_theta(dataset, batch_size=batch_size, memmap_path=memmap_path)
+        if proba:
+            return theta
+        return np.argmax(theta, axis=1)
+
+
+class CentroidPredictionMixin:
+    """
+    Mixin for clustering-based topic models that adds low-latency prediction paths.
+
+    Besides the ``"umap"`` path of the models (encode, UMAP ``transform``, cluster model),
+    documents can be assigned in the full embedding space, without UMAP:
+
+    - ``"centroid"``: by cosine similarity to the ``topic_centroids`` of the model,
+    - ``"ann"``: by the topic distributions (``theta``) of their nearest training
+      documents, found with an approximate nearest-neighbour index over ``embeddings``.
+
+    ``prepare_prediction`` builds the normalized centroid matrix and, optionally, the
+    ANN index, and loads the encoder, so the first request does not pay for them.
+    """
+
+    def prepare_prediction(self, ann: bool = False, n_neighbors: int = 15, warm_up: bool = True):
+        """
+        Precompute everything the fast prediction paths need.
+
+        Parameters:
+            ann (bool): Whether to build the approximate nearest-neighbour index over the
+                training embeddings. Defaults to False.
+            n_neighbors (int): Number of training documents used per prediction with the
+                ``"ann"`` method. Defaults to 15.
+            warm_up (bool): Whether to load the encoder and encode a dummy text. Defaults to True.
+        """
+        if self._status != TrainingStatus.SUCCEEDED:
+            raise RuntimeError("Model has not been trained yet or failed.")
+
+        centroids = np.asarray(self.topic_centroids, dtype=np.float32)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self._normalized_centroids = np.divide(
+            centroids, norms, out=np.zeros_like(centroids), where=norms > 0
+        )
+
+        self.prediction_neighbors = n_neighbors
+        if ann:
+            from pynndescent import NNDescent
+
+            logger.info("--- Building nearest-neighbour index of the training documents ---")
+            self._ann_index = NNDescent(
+                np.asarray(self.embeddings, dtype=np.float32),
+                metric="cosine",
+                n_neighbors=max(n_neighbors, 15),
+            )
+            self._ann_index.prepare()
+            self._ann_topics = np.asarray(self.theta, dtype=np.float32)
+
+        if warm_up:
+            get_embedding_model(self.embedding_model_name).encode(["warm up"])
+
+    def topic_scores(self, embeddings: np.ndarray, method: str = "centroid") -> np.ndarray:
+        """
+        Score every topic for every embedding, without UMAP.
+
+        Parameters:
+            embeddings (np.ndarray): Document embeddings of shape (n_documents, embedding_size).
+            method (str): "centroid" for the cosine similarity to the topic centroids, or
+                "ann" for the mean topic distribution of the nearest training documents.
+
+        Returns:
+            np.ndarray: Scores of shape (n_documents, n_topics); the highest score is the topic.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if method == "centroid":
+            if getattr(self, "_normalized_centroids", None) is None:
+                self.prepare_prediction(warm_up=False)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            normalized = np.divide(
+                embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0
+            )
+            return normalized @ self._normalized_centroids.T
+        if method == "ann":
+            if getattr(self, "_ann_index", None) is None:
+                self.prepare_prediction(
+                    ann=True,
+                    n_neighbors=getattr(self, "prediction_neighbors", 15),
+                    warm_up=False,
+                )
+            neighbors, _ = self._ann_index.query(embeddings, k=self.prediction_neighbors)
+            return self._ann_topics[neighbors].mean(axis=1)
+        raise ValueError(f"Unknown prediction method '{method}'. Choose from 'umap', 'centroid', 'ann'.")
@@ -1,9 +1,23 @@
-from typing import Type
+from typing import Callable, Dict, Type
 
 import lightning as pl
+import numpy as np
+import scipy.sparse as sp
 import torch
 import torch.nn as nn
 
+INFERENCE_BATCH_SIZE = 1024
+
+
+def _rows_to_tensor(values, start, stop):
+    """
+    Convert rows ``start:stop`` of a dense or sparse matrix to a float32 tensor.
+    """
+    rows = values[start:stop]
+    if sp.issparse(rows):
+        rows = rows.toarray()
+    return torch.from_numpy(np.ascontiguousarray(rows, dtype=np.float32))
+
 
 class NeuralBaseModel(pl.LightningModule):
     def __init__(
@@ -92,3 +106,78 @@ class NeuralBaseModel(pl.LightningModule):
         }
 
         return {"optimizer": optimizer, "lr_scheduler": scheduler}
+
+    def infer_theta(
+        self,
+        inputs: Dict[str, object],
+        theta_fn: Callable = None,
+        batch_size: int = INFERENCE_BATCH_SIZE,
+        memmap_path: str = None,
+    ) -> np.ndarray:
+        """
+        Compute the document-topic distributions of a corpus in batches.
+
+        The inputs are streamed through the trained model in chunks of ``batch_size``
+        documents, in eval mode and under ``torch.inference_mode()``, so only one chunk
+        is densified and held on the device at a time. The row-normalized results are
+        written into a preallocated array.
+
+        Eval mode disables dropout and makes batch normalization use its running
+        statistics, and the previous mode is restored afterwards. Theta is therefore
+        deterministic and differs from the theta of earlier versions, which ran the
+        model in train mode after fitting.
+
+        Parameters
+        ----------
+        inputs : dict
+            Model inputs by batch key, e.g. ``{"bow": csr_matrix, "embedding": np.ndarray}``.
+            All inputs must have one row per document.
+        theta_fn : callable, optional
+            Function mapping the wrapped model and a batch dictionary to theta. Defaults to
+            ``model.get_theta(batch, only_theta=True)``.
+        batch_size : int, optional
+            Number of documents per chunk, by default 1024.
+        memmap_path : str, optional
+            If given, theta is written to a memory-mapped ``.npy`` file at this path.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_documents, n_topics), memory-mapped if ``memmap_path`` is set.
+        """
+        if theta_fn is None:
+            def theta_fn(model, batch):
+                return model.get_theta(batch, only_theta=True)
+
+        n_documents = next(iter(inputs.values())).shape[0]
+        theta = None
+        was_training = self.training
+        self.eval()
+        try:
+            with torch.inference_mode():
+                for start in range(0, n_documents, batch_size):
+                    stop = min(start + batch_size, n_documents)
+                    batch = {
+                        key: _rows_to_tensor(values, start, stop).to(self.device)
+                        for key, values in inputs.items()
+                    }
+                    chunk = theta_fn(self.model, batch).float().cpu().numpy()
+                    chunk = chunk / chunk.sum(axis=1, keepdims=True)
+
+                    if theta is None:
+                        shape = (n_documents, chunk.shape[1])
+                        if memmap_path is not None:
+                            theta = np.lib.format.open_memmap(
+                                memmap_path, mode="w+", dtype=np.float32, shape=shape
+                            )
+                        else:
+                            theta = np.empty(shape, dtype=np.float32)
+                    theta[start:stop] = chunk
+        finally:
+            self.train(was_training)
+
+        if theta is None:
+            return np.empty((0, 0), dtype=np.float32)
+        if memmap_path is not None:
+            theta.flush()
+        return theta
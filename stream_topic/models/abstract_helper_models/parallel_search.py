@@ -0,0 +1,250 @@
+import copy
+import multiprocessing
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import optuna
+import torch
+from loguru import logger
+from optuna.storages import JournalFileStorage, JournalStorage
+
+from ...utils.reduction_cache import ReductionCache
+
+SHARED_ARRAY_MIN_BYTES = 2**20
+
+
+def _load_shared_array(path):
+    return np.load(path, mmap_mode="r")
+
+
+class SharedArrayPickler(pickle.Pickler):
+    """
+    Pickler that stores large numpy arrays as ``.npy`` files next to the pickle.
+
+    Unpickling memory-maps the files read-only, so processes that load the same
+    payload share the pages of the arrays, e.g. the embeddings of a dataset or the
+    data, indices and pointers of its sparse bag-of-words matrix.
+
+    Parameters
+    ----------
+    file : file object
+        File the pickle is written to.
+    directory : str
+        Directory of the array files.
+    min_bytes : int, optional
+        Arrays smaller than this are pickled inline, by default 1 MiB.
+    """
+
+    def __init__(self, file, directory, min_bytes=SHARED_ARRAY_MIN_BYTES):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.min_bytes = min_bytes
+        self._paths = {}
+
+    def reducer_override(self, obj):
+        if (
+            not isinstance(obj, np.ndarray)
+            or obj.dtype.hasobject
+            or obj.nbytes < self.min_bytes
+        ):
+            return NotImplemented
+        if id(obj) not in self._paths:
+            path = os.path.join(self.directory, f"array_{len(self._paths)}.npy")
+            np.save(path, obj)
+            self._paths[id(obj)] = path
+        return _load_shared_array, (self._paths[id(obj)],)
+
+
+def make_storage(storage):
+    """
+    Build an Optuna storage that can be shared between processes.
+
+    Parameters
+    ----------
+    storage : str
+        A database URL such as ``sqlite:///optuna.db``, or the path of a journal
+        file.
+
+    Returns
+    -------
+    str or optuna.storages.JournalStorage
+        The database URL, or a journal storage backed by the file.
+    """
+    if "://" in storage:
+        return storage
+    return JournalStorage(JournalFileStorage(storage))
+
+
+def _optimize_in_worker(
+    payload_path,
+    study_name,
+    storage,
+    n_trials,
+    method_name,
+    score_kwargs,
+    pruner,
+    num_threads,
+):
+    torch.set_num_threads(num_threads)
+    study = optuna.load_study(
+        study_name=study_name, storage=make_storage(storage), pruner=pruner
+    )
+    # the payload is loaded once per worker, the large arrays stay memory-mapped
+    with open(payload_path, "rb") as file:
+        model, dataset, custom_metric = pickle.load(file)
+
+    # the trials of all workers share their reductions through the search directory
+    # unless the model already keeps them in its own cache directory
+    cache = getattr(model, "reduction_cache", None)
+    if cache is None:
+        cache = ReductionCache()
+    if cache.cache_dir is None:
+        cache.cache_dir = os.path.join(os.path.dirname(payload_path), "reductions")
+    model.reduction_cache = cache
+
+    def objective(trial):
+        # every trial fits its own copy of the model, all copies share the cache
+        trial_model = copy.deepcopy(model, memo={id(cache): cache})
+        return getattr(trial_model, method_name)(
+            trial, dataset, custom_metric=custom_metric, **score_kwargs
+        )
+
+    study.optimize(objective, n_trials=n_trials)
+
+
+def run_study(
+    model,
+    method_name,
+    dataset,
+    n_trials,
+    n_jobs=1,
+    storage=None,
+    study_name=None,
+    pruner=None,
+    custom_metric=None,
+    **score_kwargs,
+):
+    """
+    Run an Optuna study that minimizes the score of a model method.
+
+    With ``n_jobs=1`` the trials run one after another on ``model`` itself. With
+    more jobs they run in a pool of processes that share the study through a file
+    based storage. The model, dataset and custom metric are pickled once with
+    ``SharedArrayPickler`` and loaded once per process; every trial fits an
+    isolated copy of the model, while the large arrays, e.g. embeddings and
+    bag-of-words, are memory-mapped read-only by all processes. The copies share
+    one ``ReductionCache`` that is backed by the temporary search directory (or by
+    the ``cache_dir`` of the model's cache), so UMAP is not refit for UMAP
+    arguments that another trial already used. Pruners see the intermediate values
+    of the trials of all processes.
+
+    Parameters
+    ----------
+    model : BaseModel
+        The model to optimize.
+    method_name : str
+        Name of the model method ``(trial, dataset, custom_metric=..., **score_kwargs)``
+        that fits the model with the suggested parameters and returns the score.
+    dataset : TMDataset
+        The dataset to train the model on.
+    n_trials : int
+        Number of trials.
+    n_jobs : int, optional
+        Number of processes, -1 for one per core, by default 1.
+    storage : str, optional
+        Database URL (e.g. ``sqlite:///optuna.db``) or journal file path of the
+        study, by default None (in memory, or a temporary journal file for parallel
+        runs). Existing studies of the same name are resumed.
+    study_name : str, optional
+        Name of the study, by default the name of the model class.
+    pruner : optuna.pruners.BasePruner, optional
+        Pruner of the study, by default None (Optuna's default).
+    custom_metric : object, optional
+        Custom metric passed to the score method.
+    **score_kwargs
+        Further keyword arguments of the score method.
+
+    Returns
+    -------
+    optuna.Study
+        The finished study.
+    """
+    n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    study_name = study_name or type(model).__name__
+
+    if n_jobs <= 1:
+        study = optuna.create_study(
+            study_name=study_name,
+            storage=make_storage(storage) if storage is not None else None,
+            direction="minimize",
+            pruner=pruner,
+            load_if_exists=True,
+        )
+        study.optimize(
+            lambda trial: getattr(model, method_name)(
+                trial, dataset, custom_metric=custom_metric, **score_kwargs
+            ),
+            n_trials=n_trials,
+        )
+        return study
+
+    with tempfile.TemporaryDirectory(prefix="stream_topic_search_") as directory:
+        temporary_storage = storage is None
+        storage = storage or os.path.join(directory, "journal.log")
+        study = optuna.create_study(
+            study_name=study_name,
+            storage=make_storage(storage),
+            direction="minimize",
+            pruner=pruner,
+            load_if_exists=True,
+        )
+
+        payload_path = os.path.join(directory, "payload.pkl")
+        with open(payload_path, "wb") as file:
+            SharedArrayPickler(file, directory).dump((model, dataset, custom_metric))
+
+        trials_per_job = [
+            n_trials // n_jobs + (job < n_trials % n_jobs) for job in range(n_jobs)
+        ]
+        num_threads = max(1, (os.cpu_count() or 1) // n_jobs)
+        logger.info(
+            f"--- Running {n_trials} trials in {n_jobs} processes "
+            f"with {num_threads} threads each ---"
+        )
+        # spawned workers do not inherit the threads and locks of torch and lightning
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _optimize_in_worker,
+                    payload_path,
+                    study_name,
+                    storage,
+                    trials,
+                    method_name,
+                    score_kwargs,
+                    pruner,
+                    num_threads,
+                )
+                for trials in trials_per_job
+                if trials > 0
+            ]
+            for future in futures:
+                future.result()
+
+        if not temporary_storage:
+            return optuna.load_study(
+                study_name=study_name, storage=make_storage(storage)
+            )
+        # the temporary journal is deleted with the directory
+        in_memory = optuna.storages.InMemoryStorage()
+        optuna.copy_study(
+            from_study_name=study_name,
+            from_storage=make_storage(storage),
+            to_storage=in_memory,
+        )
+        return optuna.load_study(study_name=study_name, storage=in_memory)
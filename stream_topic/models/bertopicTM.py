@@ -43,6 +43,9 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
         embeddings_folder_path: str = None,
         embeddings_file_path: str = None,
         save_embeddings: bool = False,
+        encoding_batch_size: int = 64,
+        encoding_num_workers: int = None,
+        embedding_cache_dir: str = None,
         **kwargs,
     ):
         """
@@ -55,6 +58,9 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
             umap_args (dict): UMAP arguments. Defaults to an empty dict.
             kmeans_args (dict): KMeans arguments. Defaults to an empty dict.
             random_state (int): Random state for reproducibility. Defaults to None.
+            encoding_batch_size (int): Number of text segments encoded per batch. Defaults to 64.
+            encoding_num_workers (int): Number of local processes used to encode documents. Defaults to None (single process).
+            embedding_cache_dir (str): Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded. Defaults to None (no cache).
         """
         super().__init__(use_pretrained_embeddings=True, **kwargs)
 
@@ -91,6 +97,9 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
         self.embeddings_file_path = embeddings_file_path
 
         self.save_embeddings = save_embeddings
+        self.encoding_batch_size = encoding_batch_size
+        self.encoding_num_workers = encoding_num_workers
+        self.embedding_cache_dir = embedding_cache_dir
         self.n_topics = None
 
         self._status = TrainingStatus.NOT_STARTED
@@ -187,7 +196,7 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
             ).agg({"text": " ".join})
 
             tfidf, count = c_tf_idf(
-                docs_per_topic["text"].values, m=len(self.dataframe)
+                docs_per_topic["text"].values, m=len(self.dataframe), sparse=True
             )
 
             self.topic_dict = extract_tfidf_topics(tfidf, count, docs_per_topic, n=100)
@@ -197,7 +206,7 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
                 self.dataframe[["predictions"]]
             )
 
-            self.beta = tfidf
+            self.beta = tfidf.toarray()
             self.theta = predictions_one_hot
         except Exception as e:
             logger.error(f"Error in training: {e}")
@@ -285,6 +294,8 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
         criterion="aic",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -303,6 +314,10 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -316,6 +331,8 @@ class BERTopicTM(BaseModel, SentenceEncodingMixin):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
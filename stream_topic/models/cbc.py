@@ -3,12 +3,12 @@ from datetime import datetime
 import community as community_louvain
 import networkx as nx
 import numpy as np
-import pandas as pd
+import scipy.sparse as sp
 from loguru import logger
 from sklearn.preprocessing import OneHotEncoder
 
 from ..commons.check_steps import check_dataset_steps
-from ..preprocessor import c_tf_idf, extract_tfidf_topics
+from ..preprocessor import ClassTfidf, c_tf_idf, extract_tfidf_topics
 from ..utils.cbc_utils import (DocumentCoherence,
                                get_top_tfidf_words_per_document)
 from ..utils.dataset import TMDataset
@@ -20,15 +20,26 @@ time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 
 
 class CBC(BaseModel):
-    def __init__(self):
+    def __init__(
+        self,
+        n_neighbors: int = 50,
+        coherence_threshold: float = 0.0,
+    ):
         """
-        Initializes the DocumentClusterer with a DataFrame of coherence scores.
+        Initializes the CBC model.
 
         Parameters:
-            coherence_scores (DataFrame): DataFrame containing coherence scores between documents.
+            n_neighbors (int, optional): Number of most coherent neighbours kept per document (or
+                cluster) in the coherence graph. None keeps all pairs. Defaults to 50.
+            coherence_threshold (float, optional): Only pairs with a coherence above this value
+                become edges of the coherence graph. Defaults to 0.0.
         """
         self._status = TrainingStatus.NOT_STARTED
         self.n_topics = None
+        self.n_neighbors = n_neighbors
+        self.coherence_threshold = coherence_threshold
+        # reused across fits, so refits only vectorize the clusters that changed
+        self._class_tfidf = ClassTfidf()
 
     def get_info(self):
         """
@@ -48,20 +59,17 @@ class CBC(BaseModel):
 
     def _create_coherence_graph(self):
         """
-        Initializes the CBC model.
+        Creates the coherence graph from the sparse coherence matrix.
 
-        Attributes
-        ----------
-        trained : bool
-            Indicator whether the model has been trained.
+        Documents without any edge are not part of the graph.
+
+        Returns
+        -------
+        nx.Graph
+            Weighted graph with one node per document (or cluster).
         """
-        G = nx.Graph()
-        for i in self.coherence_scores.index:
-            for j in self.coherence_scores.columns:
-                # Add an edge if coherence score is above a certain threshold
-                # Threshold can be adjusted
-                if self.coherence_scores.at[i, j] > 0:
-                    G.add_edge(i, j, weight=self.coherence_scores.at[i, j])
+        G = nx.from_scipy_sparse_array(self.coherence_matrix, edge_attribute="weight")
+        G.remove_nodes_from(list(nx.isolates(G)))
         return G
 
     def cluster_documents(self):
@@ -87,33 +95,6 @@ class CBC(BaseModel):
 
         return clusters
 
-    def combine_documents(self, documents, clusters):
-        """
-        Combines documents within each cluster.
-
-        Parameters
-        ----------
-        documents : DataFrame
-            Original DataFrame of documents.
-        clusters : dict
-            Dictionary of document clusters.
-
-        Returns
-        -------
-        DataFrame
-            New DataFrame with combined documents.
-        """
-        combined_docs = []
-        for cluster_id, doc_indices in clusters.items():
-            combined_text = " ".join(
-                documents.iloc[idx]["text"] for idx in doc_indices
-            )  # Assuming 'text' column
-            combined_docs.append(
-                {"cluster_id": cluster_id, "combined_text": combined_text}
-            )
-
-        return pd.DataFrame(combined_docs)
-
     def prepare_data(
         self,
         dataset,
@@ -169,8 +150,12 @@ class CBC(BaseModel):
         )
 
         iteration = 0
-        current_documents = self.dataframe.copy()
-        document_indices = [[i] for i in range(len(current_documents))]
+        # the word index and NPMI values are computed once and reused for the clusters
+        document_coherence = DocumentCoherence(
+            self.dataframe, column="tfidf_top_words"
+        )
+        document_indices = [np.array([i]) for i in range(len(self.dataframe))]
+        membership = None
 
         self._status = TrainingStatus.INITIALIZED
 
@@ -180,31 +165,46 @@ class CBC(BaseModel):
             while True:
                 print(f"Iteration: {iteration}")
                 # Calculate coherence scores for the current set of documents
-                coherence_scores = DocumentCoherence(
-                    current_documents, column="tfidf_top_words"
-                ).calculate_document_coherence()
+                self.coherence_matrix = document_coherence.calculate_sparse_coherence(
+                    membership,
+                    n_neighbors=self.n_neighbors,
+                    threshold=self.coherence_threshold,
+                )
 
                 # Cluster the documents based on the current coherence scores
-                self.coherence_scores = coherence_scores
                 clusters = self.cluster_documents()
 
                 num_clusters = len(clusters)
                 print(
                     f"Iteration {iteration}: {num_clusters} clusters formed.")
-
-                # Prepare for the next iteration
-                combined_documents = self.combine_documents(
-                    current_documents, clusters)
-                current_documents = combined_documents
                 iteration += 1
 
+                if num_clusters == 0:
+                    # no coherent pairs left, keep the clusters of the previous iteration
+                    print("No clusters formed. Stopping clustering process.")
+                    break
+
                 # Update document indices to reflect their new combined form
-                new_document_indices = []
-                for cluster_ids in clusters.values():
-                    new_document_indices.append(
-                        [document_indices[idx] for idx in cluster_ids]
-                    )
-                document_indices = new_document_indices
+                document_indices = [
+                    np.concatenate([document_indices[idx] for idx in cluster_ids])
+                    for cluster_ids in clusters.values()
+                ]
+                # The words of a cluster are the union of the words of its documents
+                membership = sp.csr_matrix(
+                    (
+                        np.ones(sum(len(indices) for indices in document_indices)),
+                        (
+                            np.repeat(
+                                np.arange(len(document_indices)),
+                                [len(indices) for indices in document_indices],
+                            ),
+                            np.concatenate(document_indices)
+                            if document_indices
+                            else np.empty(0, dtype=int),
+                        ),
+                    ),
+                    shape=(len(document_indices), len(self.dataframe)),
+                )
 
                 # Check if the number of clusters is within the threshold
                 if 2 <= num_clusters <= self.max_topics:
@@ -230,10 +230,9 @@ class CBC(BaseModel):
             raise
 
         labels = {}
-        for cluster_label, doc_indices_group in enumerate(document_indices):
-            for doc_indices in doc_indices_group:
-                for index in doc_indices:
-                    labels[index] = cluster_label
+        for cluster_label, doc_indices in enumerate(document_indices):
+            for index in doc_indices:
+                labels[int(index)] = cluster_label
 
         self.dataframe["predictions"] = self.dataframe.index.map(labels)
         self.labels = np.array(self.dataframe["predictions"])
@@ -260,7 +259,11 @@ class CBC(BaseModel):
         )
         logger.info("--- Extract topics ---")
         tfidf, count = c_tf_idf(
-            docs_per_topic["text"].values, m=len(self.dataframe))
+            docs_per_topic["text"].values,
+            m=len(self.dataframe),
+            sparse=True,
+            engine=self._class_tfidf,
+        )
         self.topic_dict = extract_tfidf_topics(
             tfidf, count, docs_per_topic, n=10)
 
@@ -274,7 +277,7 @@ class CBC(BaseModel):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        self.beta = tfidf
+        self.beta = tfidf.toarray()
         self.theta = predictions_one_hot
 
     def predict(self, texts):
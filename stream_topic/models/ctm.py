@@ -3,6 +3,7 @@ import numpy as np
 from loguru import logger
 from datetime import datetime
 from ..utils.dataset import TMDataset
+from ..utils.performance import PerformanceProfile
 from .abstract_helper_models.base import BaseModel, TrainingStatus
 from .abstract_helper_models.neural_basemodel import NeuralBaseModel
 import lightning as pl
@@ -12,7 +13,8 @@ from lightning.pytorch.callbacks import EarlyStopping, ModelCheckpoint, ModelSum
 import torch.nn as nn
 from optuna.integration import PyTorchLightningPruningCallback
 from ..commons.check_steps import check_dataset_steps
-from .abstract_helper_models.mixins import SentenceEncodingMixin
+from .abstract_helper_models.mixins import (NeuralInferenceMixin,
+                                          SentenceEncodingMixin)
 
 time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 MODEL_NAME = "CTM"
@@ -20,7 +22,7 @@ MODEL_NAME = "CTM"
 EMBEDDING_MODEL_NAME = "paraphrase-MiniLM-L3-v2"
 
 
-class CTM(BaseModel, SentenceEncodingMixin):
+class CTM(NeuralInferenceMixin, BaseModel, SentenceEncodingMixin):
     """
     CTM (Combined Topic Model) class.
 
@@ -59,6 +61,12 @@ class CTM(BaseModel, SentenceEncodingMixin):
         Whether to shuffle the dataset before splitting, by default True.
     random_state : int, optional
         Random seed for shuffling and splitting the dataset, by default 42.
+    encoding_batch_size : int, optional
+        Number of text segments encoded per batch, by default 64.
+    encoding_num_workers : int, optional
+        Number of local processes used to encode documents, by default None.
+    embedding_cache_dir : str, optional
+        Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded, by default None (no cache).
 
     Attributes
     ----------
@@ -107,6 +115,9 @@ class CTM(BaseModel, SentenceEncodingMixin):
         val_size=0.2,
         shuffle=True,
         random_state=42,
+        encoding_batch_size=64,
+        encoding_num_workers=None,
+        embedding_cache_dir=None,
     ):
         """
         Initialize the CTM model.
@@ -143,6 +154,12 @@ class CTM(BaseModel, SentenceEncodingMixin):
             Whether to shuffle the dataset before splitting, by default True.
         random_state : int, optional
             Random seed for shuffling and splitting the dataset, by default 42.
+        encoding_batch_size : int, optional
+            Number of text segments encoded per batch, by default 64.
+        encoding_num_workers : int, optional
+            Number of local processes used to encode documents, by default None.
+        embedding_cache_dir : str, optional
+            Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded, by default None (no cache).
         """
         super().__init__(
             use_pretrained_embeddings=False,
@@ -170,6 +187,9 @@ class CTM(BaseModel, SentenceEncodingMixin):
         self.embeddings_path = embeddings_folder_path
         self.embeddings_file_path = embeddings_file_path
         self.save_embeddings = save_embeddings
+        self.encoding_batch_size = encoding_batch_size
+        self.encoding_num_workers = encoding_num_workers
+        self.embedding_cache_dir = embedding_cache_dir
         self.n_topics = None
 
         self._status = TrainingStatus.NOT_STARTED
@@ -296,7 +316,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
         self.trainer = pl.Trainer(
             max_epochs=max_epochs,
             callbacks=model_callbacks,
-            **trainer_kwargs,
+            **{**self.performance_profile.trainer_kwargs(), **trainer_kwargs},
         )
 
     def _initialize_datamodule(self, dataset):
@@ -315,6 +335,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
             shuffle=self.hparams["datamodule_args"]["shuffle"],
             val_size=self.hparams["datamodule_args"]["val_size"],
             random_state=self.hparams["datamodule_args"]["random_state"],
+            **self.performance_profile.dataloader_kwargs(),
         )
 
         self.data_module.preprocess_data(
@@ -347,6 +368,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
         mode: str = "min",
         trial=None,
         optimize=False,
+        performance_profile=None,
         **kwargs,
     ):
         """
@@ -388,6 +410,9 @@ class CTM(BaseModel, SentenceEncodingMixin):
             The Optuna trial for hyperparameter optimization. Defaults to None.
         optimize : bool, optional
             Whether to optimize hyperparameters. Defaults to False.
+        performance_profile : PerformanceProfile, str or dict, optional
+            Throughput settings for training, e.g. "cpu" for bf16 autocast,
+            thread control and persistent dataloader workers. Defaults to None.
         **kwargs
             Additional keyword arguments to be passed to the trainer.
 
@@ -404,6 +429,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
         """
 
         self.optimize = optimize
+        self.performance_profile = PerformanceProfile.resolve(performance_profile)
         assert isinstance(
             dataset, TMDataset
         ), "The dataset must be an instance of TMDataset."
@@ -434,6 +460,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
             }
         )
 
+        previous_threads = self.performance_profile.apply_threads()
         try:
             self._status = TrainingStatus.INITIALIZED
 
@@ -444,6 +471,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
             self._initialize_datamodule(dataset=dataset)
 
             self._initialize_model()
+            self.performance_profile.compile_module(self.model.model)
 
             self._initialize_trainer(
                 max_epochs=self.hparams["max_epochs"],
@@ -467,6 +495,8 @@ class CTM(BaseModel, SentenceEncodingMixin):
             logger.error("Training interrupted.")
             self._status = TrainingStatus.INTERRUPTED
             raise
+        finally:
+            self.performance_profile.restore_threads(previous_threads)
 
         if self.n_topics <= 0:
             raise ValueError("Number of topics must be greater than 0.")
@@ -474,16 +504,7 @@ class CTM(BaseModel, SentenceEncodingMixin):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        data = {
-            "embedding": torch.tensor(dataset.embeddings),
-            "bow": torch.tensor(dataset.bow),
-        }
-
-        self.theta = (
-            self.model.model.get_theta(data, only_theta=True).detach().cpu().numpy()
-        )
-
-        self.theta = self.theta / self.theta.sum(axis=1, keepdims=True)
+        self.theta = self.infer_theta(dataset)
 
         self.beta = self.model.model.get_beta().detach().cpu().numpy()
         self.labels = np.array(np.argmax(self.theta, axis=1))
@@ -514,9 +535,6 @@ class CTM(BaseModel, SentenceEncodingMixin):
             topic_word_dict[topic_idx] = top_words_probs
         return topic_word_dict
 
-    def predict(self, dataset):
-        pass
-
     def suggest_hyperparameters(self, trial, max_topics=100):
         """
         Suggests hyperparameters for the model using an Optuna trial.
@@ -582,6 +600,8 @@ class CTM(BaseModel, SentenceEncodingMixin):
         criterion="val_loss",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -600,6 +620,10 @@ class CTM(BaseModel, SentenceEncodingMixin):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -613,6 +637,8 @@ class CTM(BaseModel, SentenceEncodingMixin):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
@@ -9,12 +9,14 @@ from loguru import logger
 from ..commons.check_steps import check_dataset_steps
 from ..utils.datamodule import TMDataModule
 from ..utils.dataset import TMDataset
+from ..utils.performance import PerformanceProfile
 from .abstract_helper_models.base import BaseModel, TrainingStatus
 from .abstract_helper_models.neural_basemodel import NeuralBaseModel
 from .neural_base_models.ctmneg_base import CTMNegBase
 import torch.nn as nn
 from optuna.integration import PyTorchLightningPruningCallback
-from .abstract_helper_models.mixins import SentenceEncodingMixin
+from .abstract_helper_models.mixins import (NeuralInferenceMixin,
+                                          SentenceEncodingMixin)
 
 time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 MODEL_NAME = "CTMNeg"
@@ -22,7 +24,7 @@ MODEL_NAME = "CTMNeg"
 EMBEDDING_MODEL_NAME = "paraphrase-MiniLM-L3-v2"
 
 
-class CTMNeg(BaseModel, SentenceEncodingMixin):
+class CTMNeg(NeuralInferenceMixin, BaseModel, SentenceEncodingMixin):
     """
     CTMNeg (Combined Topic Model with negative sampling) class.
 
@@ -61,6 +63,12 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         Whether to shuffle the dataset before splitting, by default True.
     random_state : int, optional
         Random seed for shuffling and splitting the dataset, by default 42.
+    encoding_batch_size : int, optional
+        Number of text segments encoded per batch, by default 64.
+    encoding_num_workers : int, optional
+        Number of local processes used to encode documents, by default None.
+    embedding_cache_dir : str, optional
+        Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded, by default None (no cache).
 
     Attributes
     ----------
@@ -109,6 +117,9 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         val_size=0.2,
         shuffle=True,
         random_state=42,
+        encoding_batch_size=64,
+        encoding_num_workers=None,
+        embedding_cache_dir=None,
     ):
         """
         Initialize the CTMNeg model.
@@ -145,6 +156,12 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             Whether to shuffle the dataset before splitting, by default True.
         random_state : int, optional
             Random seed for shuffling and splitting the dataset, by default 42.
+        encoding_batch_size : int, optional
+            Number of text segments encoded per batch, by default 64.
+        encoding_num_workers : int, optional
+            Number of local processes used to encode documents, by default None.
+        embedding_cache_dir : str, optional
+            Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded, by default None (no cache).
         """
 
         super().__init__(
@@ -173,6 +190,9 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         self.embeddings_path = embeddings_folder_path
         self.embeddings_file_path = embeddings_file_path
         self.save_embeddings = save_embeddings
+        self.encoding_batch_size = encoding_batch_size
+        self.encoding_num_workers = encoding_num_workers
+        self.embedding_cache_dir = embedding_cache_dir
         self.n_topics = None
 
         self._status = TrainingStatus.NOT_STARTED
@@ -298,7 +318,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         self.trainer = pl.Trainer(
             max_epochs=max_epochs,
             callbacks=model_callbacks,
-            **trainer_kwargs,
+            **{**self.performance_profile.trainer_kwargs(), **trainer_kwargs},
         )
 
     def _initialize_datamodule(self, dataset):
@@ -317,6 +337,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             shuffle=self.hparams["datamodule_args"]["shuffle"],
             val_size=self.hparams["datamodule_args"]["val_size"],
             random_state=self.hparams["datamodule_args"]["random_state"],
+            **self.performance_profile.dataloader_kwargs(),
         )
 
         self.data_module.preprocess_data(
@@ -349,6 +370,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         mode: str = "min",
         trial=None,
         optimize=False,
+        performance_profile=None,
         **kwargs,
     ):
         """
@@ -390,6 +412,9 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             The Optuna trial for hyperparameter optimization. Defaults to None.
         optimize : bool, optional
             Whether to optimize hyperparameters. Defaults to False.
+        performance_profile : PerformanceProfile, str or dict, optional
+            Throughput settings for training, e.g. "cpu" for bf16 autocast,
+            thread control and persistent dataloader workers. Defaults to None.
         **kwargs
             Additional keyword arguments to be passed to the trainer.
 
@@ -406,6 +431,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         """
 
         self.optimize = optimize
+        self.performance_profile = PerformanceProfile.resolve(performance_profile)
         assert isinstance(
             dataset, TMDataset
         ), "The dataset must be an instance of TMDataset."
@@ -435,6 +461,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             }
         )
 
+        previous_threads = self.performance_profile.apply_threads()
         try:
             self._status = TrainingStatus.INITIALIZED
             if not self.embeddings_prepared:
@@ -443,6 +470,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             self._initialize_datamodule(dataset=dataset)
 
             self._initialize_model()
+            self.performance_profile.compile_module(self.model.model)
 
             self._initialize_trainer(
                 max_epochs=self.hparams["max_epochs"],
@@ -466,6 +494,8 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             logger.error("Training interrupted.")
             self._status = TrainingStatus.INTERRUPTED
             raise
+        finally:
+            self.performance_profile.restore_threads(previous_threads)
 
         if self.n_topics <= 0:
             raise ValueError("Number of topics must be greater than 0.")
@@ -473,16 +503,7 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        data = {
-            "embedding": torch.tensor(dataset.embeddings),
-            "bow": torch.tensor(dataset.bow),
-        }
-
-        self.theta = (
-            self.model.model.get_theta(data, only_theta=True).detach().cpu().numpy()
-        )
-
-        self.theta = self.theta / self.theta.sum(axis=1, keepdims=True)
+        self.theta = self.infer_theta(dataset)
 
         self.beta = self.model.model.get_beta().detach().cpu().numpy()
         self.labels = np.array(np.argmax(self.theta, axis=1))
@@ -513,9 +534,6 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             topic_word_dict[topic_idx] = top_words_probs
         return topic_word_dict
 
-    def predict(self, dataset):
-        pass
-
     def suggest_hyperparameters(self, trial, max_topics=100):
         """
         Suggests hyperparameters for the model using an Optuna trial.
@@ -581,6 +599,8 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
         criterion="val_loss",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -599,6 +619,10 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -612,6 +636,8 @@ class CTMNeg(BaseModel, SentenceEncodingMixin):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
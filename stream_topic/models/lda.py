@@ -1,9 +1,13 @@
+import os
 from datetime import datetime
+from time import perf_counter
 
 import gensim.corpora as corpora
 import numpy as np
 import pandas as pd
-from gensim.models import ldamodel
+import scipy.sparse as sp
+from gensim import matutils, utils
+from gensim.models import ldamodel, ldamulticore
 from loguru import logger
 from nltk.tokenize import word_tokenize
 
@@ -12,13 +16,23 @@ from ..utils.dataset import TMDataset
 from .abstract_helper_models.base import BaseModel, TrainingStatus
 
 MODEL_NAME = "LDA"
+LDA_BACKENDS = ("single", "multicore")
 time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 # logger.add(f"{MODEL_NAME}_{time}.log", backtrace=True, diagnose=True)
 
 
 class LDA(BaseModel):
 
-    def __init__(self, id2word=None, id_corpus=None, random_state=None, **kwargs):
+    def __init__(
+        self,
+        id2word=None,
+        id_corpus=None,
+        random_state=None,
+        backend: str = "single",
+        workers: int = None,
+        corpus_path: str = None,
+        **kwargs,
+    ):
         """
         Initialize the LDA model.
 
@@ -26,19 +40,38 @@ class LDA(BaseModel):
         ----------
         id2word : Dictionary or None, optional
             A Gensim dictionary mapping word ids to words.
-        id_corpus : List of lists or None, optional
-            The corpus represented as a list of lists of (word_id, word_frequency) tuples.
+        id_corpus : List of lists, scipy.sparse matrix, str or None, optional
+            The corpus represented as a list of lists of (word_id, word_frequency) tuples,
+            as a sparse document-term matrix (e.g. a memory-mapped CSR matrix) or as the
+            path of a Matrix Market file. Sparse matrices and files are streamed.
         random_state : int or None, optional
             Seed for random number generation.
+        backend : str, optional
+            "single" trains gensim's LdaModel, "multicore" trains LdaMulticore with
+            ``workers`` worker processes (default is "single").
+        workers : int or None, optional
+            Number of worker processes of the "multicore" backend (default is the
+            number of cores minus one).
+        corpus_path : str or None, optional
+            If given, the corpus built from the dataset is serialized to this Matrix
+            Market file and streamed from disk instead of being held in memory.
         """
         super().__init__(use_pretrained_embeddings=True, **kwargs)
         self.save_hyperparameters(ignore=["id2word", "id_corpus"])
 
+        if backend not in LDA_BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}', expected one of {LDA_BACKENDS}."
+            )
+
         self._status = TrainingStatus.NOT_STARTED
         self.n_topics = None
         self.id2word = id2word
         self.id_corpus = id_corpus
         self.random_state = random_state
+        self.backend = backend
+        self.workers = workers
+        self.corpus_path = corpus_path
 
     def get_info(self):
         """
@@ -52,6 +85,7 @@ class LDA(BaseModel):
         info = {
             "model_name": MODEL_NAME,
             "num_topics": self.n_topics,
+            "backend": self.backend,
             "trained": self._status.name,
         }
         return info
@@ -106,13 +140,49 @@ class LDA(BaseModel):
         if self.id2word is None:
             self.id2word = corpora.Dictionary(dataset.dataframe["tokens"])
 
-        if self.id_corpus is None:
+        if self.id_corpus is None and self.corpus_path is not None:
+            corpora.MmCorpus.serialize(
+                self.corpus_path,
+                (
+                    self.id2word.doc2bow(document)
+                    for document in dataset.dataframe["tokens"]
+                ),
+                id2word=self.id2word,
+            )
+            self.id_corpus = self.corpus_path
+        elif self.id_corpus is None:
             self.id_corpus = [
                 self.id2word.doc2bow(document)
                 for document in dataset.dataframe["tokens"]
             ]
 
-    def fit(self, dataset: TMDataset = None, n_topics: int = 20, **lda_params):
+    def _corpus(self):
+        """
+        Get the corpus as an iterable of bag-of-words documents.
+
+        Returns
+        -------
+        corpus : iterable of list of tuples
+            The list of documents, or a stream over the sparse matrix or Matrix Market file.
+        """
+        if sp.issparse(self.id_corpus):
+            return matutils.Sparse2Corpus(self.id_corpus, documents_columns=False)
+        if isinstance(self.id_corpus, (str, os.PathLike)):
+            return corpora.MmCorpus(os.fspath(self.id_corpus))
+        return self.id_corpus
+
+    def _n_workers(self):
+        if self.backend == "single":
+            return 1
+        return self.workers or max(1, (os.cpu_count() or 1) - 1)
+
+    def fit(
+        self,
+        dataset: TMDataset = None,
+        n_topics: int = 20,
+        theta_as_dataframe: bool = True,
+        **lda_params,
+    ):
         """
         Fit the LDA model to the dataset.
 
@@ -122,6 +192,9 @@ class LDA(BaseModel):
             The dataset to fit the model to. Must be an instance of TMDataset.
         n_topics : int, optional
             The number of topics to extract (default is 20).
+        theta_as_dataframe : bool, optional
+            Whether ``theta`` is stored as a DataFrame or as a float32 array
+            (default is True).
         **lda_params : dict, optional
             Additional parameters to pass to the Gensim LdaModel.
 
@@ -145,16 +218,25 @@ class LDA(BaseModel):
             self._status = TrainingStatus.INITIALIZED
             logger.info(f"--- Training {MODEL_NAME} topic model ---")
             self._status = TrainingStatus.RUNNING
-            if not self.id_corpus and not self.id2word:
+            if self.id_corpus is None and self.id2word is None:
                 self._prepare_documents(dataset)
             lda_params = {
                 key: value
                 for key, value in {**self.hparams, **lda_params}.items()
                 if key != "n_topics"
             }
-            self.model = ldamodel.LdaModel(
-                self.id_corpus, num_topics=n_topics, **lda_params
-            )
+            corpus = self._corpus()
+            n_workers = self._n_workers()
+            start = perf_counter()
+            if self.backend == "multicore":
+                self.model = ldamulticore.LdaMulticore(
+                    corpus, num_topics=n_topics, workers=n_workers, **lda_params
+                )
+            else:
+                self.model = ldamodel.LdaModel(
+                    corpus, num_topics=n_topics, **lda_params
+                )
+            elapsed = perf_counter() - start
         except Exception as e:
             logger.error(f"Error in training: {e}")
             self._status = TrainingStatus.FAILED
@@ -167,7 +249,15 @@ class LDA(BaseModel):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        self.theta = self.get_theta()
+        n_documents = len(corpus) * lda_params.get("passes", 1)
+        docs_per_second = n_documents / max(elapsed, 1e-9)
+        logger.info(
+            f"--- {MODEL_NAME} ({self.backend}) trained on {n_documents} documents in "
+            f"{elapsed:.1f}s: {docs_per_second:.0f} documents/s, "
+            f"{docs_per_second / n_workers:.0f} documents/s per core ({n_workers} cores) ---"
+        )
+
+        self.theta = self.get_theta(as_dataframe=theta_as_dataframe)
         self.labels = np.array(np.argmax(self.theta, axis=1))
 
         self.topic_dict = self._get_topic_word_dict()
@@ -179,6 +269,8 @@ class LDA(BaseModel):
         min_topics=2,
         max_topics=20,
         n_trials=100,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -197,6 +289,10 @@ class LDA(BaseModel):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -210,6 +306,8 @@ class LDA(BaseModel):
             criterion="custom",
             n_trials=n_trials,
             custom_metric=metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
@@ -217,15 +315,31 @@ class LDA(BaseModel):
     def predict(self, dataset):
         pass
 
-    def get_theta(self):
+    def get_theta(self, as_dataframe=True, sparse=False, chunksize=None):
         """
         Get the topic distribution for each document.
 
+        The documents are streamed in chunks with one call of gensim's batched
+        ``inference`` per chunk. As in ``get_document_topics``, the topic
+        distributions are normalized and probabilities below the model's
+        ``minimum_probability`` are set to zero.
+
+        Parameters
+        ----------
+        as_dataframe : bool, optional
+            Whether to return a DataFrame with one column ``topic_<id>`` per topic
+            (default is True). Otherwise a float32 array is returned.
+        sparse : bool, optional
+            Whether to return a CSR matrix instead of a dense array, only used if
+            ``as_dataframe`` is False (default is False).
+        chunksize : int or None, optional
+            Number of documents per inference call (default is the model's ``chunksize``).
+
         Returns
         -------
-        topic_document_matrix : pd.DataFrame
-            DataFrame where each row corresponds to a document and each column to a topic,
-            with the values representing the topic probabilities for each document.
+        topic_document_matrix : pd.DataFrame, np.ndarray or scipy.sparse.csr_matrix
+            Matrix of shape (n_documents, n_topics) with the topic probabilities
+            of each document.
 
         Raises
         ------
@@ -235,57 +349,40 @@ class LDA(BaseModel):
         if self._status != TrainingStatus.SUCCEEDED:
             raise RuntimeError("Model has not been trained yet or failed.")
 
-        topic_document_matrix = []
-        for doc_bow in self.id_corpus:
-            topic_distribution = self.model.get_document_topics(doc_bow)
-            topic_document_matrix.append(topic_distribution)
-        return self._convert_to_dataframe(topic_document_matrix, self.n_topics)
-
-    def _convert_to_dataframe(self, topic_distributions, num_topics):
-        """
-        Convert topic distributions to a DataFrame.
-
-        Parameters
-        ----------
-        topic_distributions : list of list of tuples
-            List of topic distributions, where each distribution is a list of (topic_id, probability) tuples.
-        num_topics : int
-            The number of topics.
-
-        Returns
-        -------
-        df : pd.DataFrame
-            DataFrame where each row corresponds to a document and each column to a topic,
-            with the values representing the topic probabilities for each document.
-        """
-        # Initialize an empty list to store the document-topic distributions
-        data = []
-
-        # Iterate through each document's topic distribution
-        for doc_distribution in topic_distributions:
-            # Create a dictionary with the topic probabilities
-            doc_data = {
-                f"topic_{topic_id}": prob for topic_id, prob in doc_distribution
-            }
-            # Add missing topics with probability 0
-            for topic_id in range(num_topics):
-                if f"topic_{topic_id}" not in doc_data:
-                    doc_data[f"topic_{topic_id}"] = 0.0
-            data.append(doc_data)
-
-        # Create a DataFrame from the list of dictionaries
-        df = pd.DataFrame(data)
-
-        return df
+        chunksize = chunksize or self.model.chunksize
+        minimum_probability = max(self.model.minimum_probability, 1e-8)
+        chunks = []
+        for chunk in utils.chunkize_serial(self._corpus(), chunksize):
+            gamma, _ = self.model.inference(chunk)
+            theta = (gamma / gamma.sum(axis=1, keepdims=True)).astype(np.float32)
+            theta[theta < minimum_probability] = 0
+            chunks.append(sp.csr_matrix(theta) if sparse and not as_dataframe else theta)
+
+        if not chunks:
+            topic_document_matrix = np.zeros((0, self.model.num_topics), dtype=np.float32)
+        elif sparse and not as_dataframe:
+            topic_document_matrix = sp.vstack(chunks, format="csr")
+        else:
+            topic_document_matrix = np.vstack(chunks)
+
+        if as_dataframe:
+            return pd.DataFrame(
+                topic_document_matrix,
+                columns=[f"topic_{topic_id}" for topic_id in range(self.model.num_topics)],
+            )
+        return topic_document_matrix
 
     def get_beta(self):
         """
         Get the word distribution for each topic.
 
+        The distributions are taken from the normalized topic-word state of the model.
+
         Returns
         -------
-        topic_word_matrix : list of list of tuples
-            List of topics, where each topic is a list of (word_id, probability) tuples.
+        topic_word_matrix : np.ndarray
+            Matrix of shape (vocabulary_size, n_topics), where each column is the word
+            distribution of a topic.
 
         Raises
         ------
@@ -295,26 +392,7 @@ class LDA(BaseModel):
         if self._status != TrainingStatus.SUCCEEDED:
             raise RuntimeError("Model has not been trained yet or failed.")
 
-        topic_word_matrix = []
-        for topic_id in range(self.n_topics):
-            word_distribution = self.model.get_topic_terms(
-                topic_id, topn=len(self.id2word)
-            )
-            topic_word_matrix.append(word_distribution)
-
-        n = max(max(t[0] for t in topic) for topic in topic_word_matrix) + 1
-        num_topics = len(topic_word_matrix)
-        num_words_per_topic = len(topic_word_matrix[0])
-
-        # Initialize the matrix with zeros
-        beta_matrix = np.zeros((n, num_topics))
-
-        # Fill the matrix with values from the beta list
-        for topic_idx, topic in enumerate(topic_word_matrix):
-            for word_index, probability in topic:
-                beta_matrix[word_index, topic_idx] = probability
-
-        self.beta = beta_matrix
+        self.beta = self.model.get_topics().T
         return self.beta
 
     def _get_topic_word_dict(self, num_words=100):
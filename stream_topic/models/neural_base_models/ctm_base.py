@@ -252,7 +252,7 @@ class CTMBase(nn.Module):
         torch.Tensor
             The computed loss.
         """
-        recon_x, mu, logvar = self.forward(x)
+        recon_x, mu, logvar = self(x)
         loss = self.loss_function(x["bow"], recon_x, mu, logvar)
         if self.rescale_loss:
             loss *= self.rescale_factor
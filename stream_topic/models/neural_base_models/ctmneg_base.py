@@ -264,7 +264,7 @@ class CTMNegBase(nn.Module):
         torch.Tensor
             The computed loss.
         """
-        word_dist, mu, logvar, word_dist_neg = self.forward(x)
+        word_dist, mu, logvar, word_dist_neg = self(x)
         loss = self.loss_function(x["bow"], word_dist, mu, logvar, word_dist_neg)
         if self.rescale_loss:
             loss *= self.rescale_factor
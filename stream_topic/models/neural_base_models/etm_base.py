@@ -175,7 +175,7 @@ class ETMBase(nn.Module):
         torch.Tensor
             The computed loss.
         """
-        recon_x, mu, logvar = self.forward(x)
+        recon_x, mu, logvar = self(x)
         x = x["bow"]
         loss = self.loss_function(x, recon_x, mu, logvar)
         return loss * 1e-02
@@ -1,7 +1,7 @@
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from ...utils.sinkhorn_loss import sinkhorn_loss
+from ...utils.sinkhorn_loss import SINKHORN_CHECK_EVERY, SinkhornSolver
 
 
 class NSTMBase(nn.Module):
@@ -34,6 +34,14 @@ class NSTMBase(nn.Module):
         The weight given to the reconstruction loss, by default 0.07.
     sinkhorn_alpha : float, optional
         The scaling factor for the Sinkhorn loss, by default 20.
+    sinkhorn_max_iter : int, optional
+        The maximum number of Sinkhorn iterations per batch, by default 5000.
+    sinkhorn_stop_threshold : float, optional
+        The convergence threshold of the Sinkhorn iterations, by default 0.5e-2.
+    sinkhorn_check_every : int, optional
+        The number of Sinkhorn iterations between two convergence checks, by default 20.
+    sinkhorn_warm_start : bool, optional
+        Whether to warm-start the Sinkhorn dual variables from the previous batch, by default False.
 
     Attributes
     ----------
@@ -41,6 +49,8 @@ class NSTMBase(nn.Module):
         The weight of the reconstruction loss in the final loss computation.
     sinkhorn_alpha : float
         The scaling factor applied to the Sinkhorn loss for optimal transport.
+    sinkhorn : SinkhornSolver
+        The log-domain solver computing the Sinkhorn loss.
     encoder : nn.Sequential
         The neural network that encodes bag-of-words input into topic distribution.
     word_embeddings : nn.Parameter
@@ -72,6 +82,10 @@ class NSTMBase(nn.Module):
         embed_size: int = 256,
         recon_loss_weight=0.07,
         sinkhorn_alpha=20,
+        sinkhorn_max_iter: int = 5000,
+        sinkhorn_stop_threshold: float = 0.5e-2,
+        sinkhorn_check_every: int = SINKHORN_CHECK_EVERY,
+        sinkhorn_warm_start: bool = False,
     ):
         """
         Initializes the Neural Topic Model.
@@ -98,6 +112,14 @@ class NSTMBase(nn.Module):
             Weight of the reconstruction loss, by default 0.07.
         sinkhorn_alpha : float, optional
             Scaling factor for the Sinkhorn loss, by default 20.
+        sinkhorn_max_iter : int, optional
+            Maximum number of Sinkhorn iterations per batch, by default 5000.
+        sinkhorn_stop_threshold : float, optional
+            Convergence threshold of the Sinkhorn iterations, by default 0.5e-2.
+        sinkhorn_check_every : int, optional
+            Number of Sinkhorn iterations between two convergence checks, by default 20.
+        sinkhorn_warm_start : bool, optional
+            Whether to warm-start the Sinkhorn dual variables from the previous batch, by default False.
         """
         super().__init__()
 
@@ -105,6 +127,13 @@ class NSTMBase(nn.Module):
 
         self.recon_loss_weight = recon_loss_weight
         self.sinkhorn_alpha = sinkhorn_alpha
+        self.sinkhorn = SinkhornSolver(
+            sinkhorn_alpha,
+            max_iter=sinkhorn_max_iter,
+            stop_threshold=sinkhorn_stop_threshold,
+            check_every=sinkhorn_check_every,
+            warm_start=sinkhorn_warm_start,
+        )
 
         self.encoder = nn.Sequential(
             nn.Linear(vocab_size, encoder_dim),
@@ -198,10 +227,8 @@ class NSTMBase(nn.Module):
         torch.Tensor
             The total loss, averaged over the batch.
         """
-        theta, beta, M = self.forward(x)
-        sh_loss = sinkhorn_loss(
-            M, theta.T, F.softmax(x["bow"], dim=-1).T, lambda_sh=self.sinkhorn_alpha
-        )
+        theta, beta, M = self(x)
+        sh_loss = self.sinkhorn(M, theta.T, F.softmax(x["bow"], dim=-1).T)
         recon = F.softmax(torch.matmul(theta, beta), dim=-1)
         recon_loss = -(x["bow"] * recon.log()).sum(axis=1)
 
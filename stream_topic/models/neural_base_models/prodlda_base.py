@@ -181,7 +181,7 @@ class ProdLDABase(nn.Module):
         torch.Tensor
             The computed loss.
         """
-        word_dist, mu, logvar = self.forward(x)
+        word_dist, mu, logvar = self(x)
         x = x["bow"]
         loss = self.loss_function(x, word_dist, mu, logvar)
         return loss
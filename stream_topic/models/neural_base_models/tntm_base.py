@@ -1,8 +1,9 @@
+import math
+
 import numpy as np
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from torch.distributions.lowrank_multivariate_normal import LowRankMultivariateNormal
 
 from ..abstract_helper_models.inference_networks import InferenceNetwork
 from .ctm_base import CTMBase
@@ -24,6 +25,7 @@ class TNTMBase(CTMBase):
             dropout: float = 0.1,
             inference_activation = nn.Softplus(),
             n_layers_inference_network: int = 1,
+            cache_beta: bool = True,
     ):
         """
             Initialize the topic model parameters.
@@ -52,13 +54,22 @@ class TNTMBase(CTMBase):
                 Activation function for inference, by default nn.Softplus().
             n_layers_inference_network : int, optional
                 Number of layers in the inference network, by default 3.
+            cache_beta : bool, optional
+                Whether to reuse log beta outside of training while the topic parameters are unchanged, by default True.
         """
         super().__init__(dataset = dataset, n_topics = n_topics, encoder_dim = encoder_dim, dropout = dropout)
 
         self.mus = nn.Parameter(mus_init)   #create topic means as learnable paramter
         self.L_lower = nn.Parameter(L_lower_init)   # factor of covariance per topic
         self.log_diag = nn.Parameter(log_diag_init)  # summand for diagonal of covariance
-        self.word_embeddings_projected = torch.tensor(word_embeddings_projected)
+        # buffer, so the projected vocabulary follows the model to its device
+        self.register_buffer(
+            "word_embeddings_projected",
+            torch.as_tensor(word_embeddings_projected).clone(),
+            persistent=False,
+        )
+        self.cache_beta = cache_beta
+        self._log_beta_cache = None
 
         emb_dim = word_embeddings_projected.shape[1]
 
@@ -101,23 +112,76 @@ class TNTMBase(CTMBase):
     def calc_log_beta(self):
         """
         Calculate the log of beta given self.mus, self.L_lower, and self.log_diag.
+
+        The log densities of the projected vocabulary under the low-rank Gaussians of all
+        topics, with covariance L L^T + diag(exp(log_diag)), are evaluated at once on the
+        device of the model, using the Woodbury identity and the matrix determinant lemma.
+
+        Returns
+        -------
+        torch.Tensor
+            Log beta of shape (n_topics, vocab_size).
         """
+        dtype = self.mus.dtype
+        for tensor in (self.L_lower, self.log_diag, self.word_embeddings_projected):
+            dtype = torch.promote_types(dtype, tensor.dtype)
+        log_diag = self.log_diag.to(dtype)
+        diag_inv = torch.exp(-log_diag)                                  # (K, E)
+        L = self.L_lower.to(dtype)                                       # (K, E, R)
+        mus = self.mus.to(dtype)                                         # (K, E)
+        x = self.word_embeddings_projected.to(dtype)                     # (V, E)
+        emb_dim = x.shape[1]
+
+        # capacitance C = I + L^T D^-1 L and its Cholesky factor W
+        Lt_Dinv = L.transpose(-1, -2) * diag_inv.unsqueeze(-2)           # (K, R, E)
+        capacitance = torch.matmul(Lt_Dinv, L)
+        capacitance = capacitance + torch.eye(
+            capacitance.shape[-1], dtype=capacitance.dtype, device=capacitance.device
+        )
+        W = torch.linalg.cholesky(capacitance)                           # (K, R, R)
 
-        diag = torch.exp(self.log_diag)
+        # log det(L L^T + D) = log det(C) + log det(D)
+        log_det = 2 * torch.diagonal(W, dim1=-2, dim2=-1).log().sum(-1) + log_diag.sum(-1)
 
-        normal_dis_lis = [LowRankMultivariateNormal(mu, cov_factor= lower, cov_diag = D) for mu, lower, D in zip(self.mus, self.L_lower, diag)]
-        log_probs = torch.zeros(self.n_topics, self.vocab_size)
+        # Mahalanobis distance (x - mu)^T (D^-1 - D^-1 L C^-1 L^T D^-1) (x - mu)
+        diff = x.unsqueeze(0) - mus.unsqueeze(1)                         # (K, V, E)
+        A = torch.linalg.solve_triangular(W, Lt_Dinv, upper=False)       # (K, R, E)
+        projected = torch.matmul(diff, A.transpose(-1, -2))              # (K, V, R)
+        mahalanobis = (diff.pow(2) * diag_inv.unsqueeze(1)).sum(-1) - projected.pow(2).sum(-1)
 
-        for i, dis in enumerate(normal_dis_lis):
-            log_probs[i] = dis.log_prob(self.word_embeddings_projected)
-        return log_probs
+        log_probs = -0.5 * (
+            emb_dim * math.log(2 * math.pi) + log_det.unsqueeze(-1) + mahalanobis
+        )
+        return log_probs.to(torch.get_default_dtype())
+
+    def _log_beta(self):
+        """
+        Return log beta, reusing the last result outside of training while the topic
+        parameters have not been modified.
+        """
+        if not self.cache_beta or (self.training and torch.is_grad_enabled()):
+            self._log_beta_cache = None
+            return self.calc_log_beta()
+
+        # in-place updates, e.g. by an optimizer or load_state_dict, bump the version counters
+        key = tuple(
+            (p._version, p.data_ptr(), p.device)
+            for p in (self.mus, self.L_lower, self.log_diag, self.word_embeddings_projected)
+        )
+        if self._log_beta_cache is None or self._log_beta_cache[0] != key:
+            with torch.no_grad():
+                self._log_beta_cache = (key, self.calc_log_beta())
+        return self._log_beta_cache[1]
 
     def get_beta(self):
         """
         Get the beta distribution given self.mus, self.L_lower, and self.log_diag.
+
+        Outside of training (in eval mode or with gradients disabled) and with ``cache_beta``
+        enabled, beta is only recomputed after the topic parameters have changed.
         """
 
-        log_beta = self.calc_log_beta()
+        log_beta = self._log_beta()
         return torch.exp(log_beta)
     #@override
     def forward(self, x):
@@ -140,7 +204,7 @@ class TNTMBase(CTMBase):
         """
         theta, posterior_mean, posterior_logvar = self.get_theta(x)
 
-        log_beta = self.calc_log_beta()
+        log_beta = self._log_beta()
 
 
 
@@ -212,7 +276,7 @@ class TNTMBase(CTMBase):
             The computed loss.
         """
         x_bow = x['bow']
-        log_recon, posterior_mean, posterior_logvar = self.forward(x)
+        log_recon, posterior_mean, posterior_logvar = self(x)
         loss = self.loss_function(x_bow, log_recon, posterior_mean, posterior_logvar)
         return loss
 
@@ -11,7 +11,9 @@ from loguru import logger
 from ..commons.check_steps import check_dataset_steps
 from ..utils.datamodule import TMDataModule
 from ..utils.dataset import TMDataset
+from ..utils.performance import PerformanceProfile
 from .abstract_helper_models.base import BaseModel, TrainingStatus
+from .abstract_helper_models.mixins import NeuralInferenceMixin
 from .abstract_helper_models.neural_basemodel import NeuralBaseModel
 from .neural_base_models.neurallda_base import NeuralLDABase
 
@@ -20,7 +22,7 @@ MODEL_NAME = "NeuralLDA"
 # logger.add(f"{MODEL_NAME}_{time}.log", backtrace=True, diagnose=True)
 
 
-class NeuralLDA(BaseModel):
+class NeuralLDA(NeuralInferenceMixin, BaseModel):
     """
     NeuralLDA model class.
 
@@ -240,7 +242,7 @@ class NeuralLDA(BaseModel):
         self.trainer = pl.Trainer(
             max_epochs=max_epochs,
             callbacks=model_callbacks,
-            **trainer_kwargs,
+            **{**self.performance_profile.trainer_kwargs(), **trainer_kwargs},
         )
 
     def _initialize_datamodule(self, dataset):
@@ -259,6 +261,7 @@ class NeuralLDA(BaseModel):
             shuffle=self.hparams["datamodule_args"]["shuffle"],
             val_size=self.hparams["datamodule_args"]["val_size"],
             random_state=self.hparams["datamodule_args"]["random_state"],
+            **self.performance_profile.dataloader_kwargs(),
         )
 
         self.data_module.preprocess_data(
@@ -291,6 +294,7 @@ class NeuralLDA(BaseModel):
         mode: str = "min",
         trial=None,
         optimize=False,
+        performance_profile=None,
         **kwargs,
     ):
         """
@@ -332,6 +336,9 @@ class NeuralLDA(BaseModel):
             The Optuna trial for hyperparameter optimization. Defaults to None.
         optimize : bool, optional
             Whether to optimize hyperparameters. Defaults to False.
+        performance_profile : PerformanceProfile, str or dict, optional
+            Throughput settings for training, e.g. "cpu" for bf16 autocast,
+            thread control and persistent dataloader workers. Defaults to None.
         **kwargs
             Additional keyword arguments to be passed to the trainer.
 
@@ -348,6 +355,7 @@ class NeuralLDA(BaseModel):
         """
 
         self.optimize = optimize
+        self.performance_profile = PerformanceProfile.resolve(performance_profile)
         assert isinstance(
             dataset, TMDataset
         ), "The dataset must be an instance of TMDataset."
@@ -378,12 +386,14 @@ class NeuralLDA(BaseModel):
             }
         )
 
+        previous_threads = self.performance_profile.apply_threads()
         try:
 
             self._status = TrainingStatus.INITIALIZED
             self._initialize_datamodule(dataset=dataset)
 
             self._initialize_model()
+            self.performance_profile.compile_module(self.model.model)
 
             self._initialize_trainer(
                 max_epochs=self.hparams["max_epochs"],
@@ -407,6 +417,8 @@ class NeuralLDA(BaseModel):
             logger.error("Training interrupted.")
             self._status = TrainingStatus.INTERRUPTED
             raise
+        finally:
+            self.performance_profile.restore_threads(previous_threads)
 
         if self.n_topics <= 0:
             raise ValueError("Number of topics must be greater than 0.")
@@ -416,15 +428,7 @@ class NeuralLDA(BaseModel):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        data = {
-            "bow": torch.tensor(dataset.bow),
-        }
-
-        self.theta = (
-            self.model.model.get_theta(data, only_theta=True).detach().cpu().numpy()
-        )
-
-        self.theta = self.theta / self.theta.sum(axis=1, keepdims=True)
+        self.theta = self.infer_theta(dataset)
 
         self.beta = self.model.model.get_beta().detach().cpu().numpy()
         self.labels = np.array(np.argmax(self.theta, axis=1))
@@ -455,9 +459,6 @@ class NeuralLDA(BaseModel):
             topic_word_dict[topic_idx] = top_words_probs
         return topic_word_dict
 
-    def predict(self, dataset):
-        pass
-
     def suggest_hyperparameters(self, trial, max_topics=100):
         """
         Suggests hyperparameters for the model using Optuna trial.
@@ -516,6 +517,8 @@ class NeuralLDA(BaseModel):
         criterion="val_loss",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -534,6 +537,10 @@ class NeuralLDA(BaseModel):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -547,6 +554,8 @@ class NeuralLDA(BaseModel):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
@@ -184,7 +184,7 @@ class NMFTM(BaseModel):
                 raise RuntimeError("No topics were extracted, model training failed.")
 
             tfidf, count = c_tf_idf(
-                topic_data["text"].tolist(), len(self.dataset.texts)
+                topic_data["text"].tolist(), len(self.dataset.texts), sparse=True
             )
             self.topic_dict = extract_tfidf_topics(tfidf, count, topic_data)
 
@@ -228,6 +228,8 @@ class NMFTM(BaseModel):
         criterion="recon",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -246,6 +248,10 @@ class NMFTM(BaseModel):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -259,6 +265,8 @@ class NMFTM(BaseModel):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
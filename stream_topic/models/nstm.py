@@ -9,7 +9,9 @@ import torch.nn as nn
 from ..commons.check_steps import check_dataset_steps
 from ..utils.datamodule import TMDataModule
 from ..utils.dataset import TMDataset
+from ..utils.performance import PerformanceProfile
 from .abstract_helper_models.base import BaseModel, TrainingStatus
+from .abstract_helper_models.mixins import NeuralInferenceMixin
 from .abstract_helper_models.neural_basemodel import NeuralBaseModel
 from .neural_base_models.nstm_base import NSTMBase
 from optuna.integration import PyTorchLightningPruningCallback
@@ -19,7 +21,7 @@ MODEL_NAME = "NSTM"
 # logger.add(f"{MODEL_NAME}_{time}.log", backtrace=True, diagnose=True)
 
 
-class NSTM(BaseModel):
+class NSTM(NeuralInferenceMixin, BaseModel):
     """
     Neural Topic Model via Optimal Transport (NSTM). Based on the paper presented at ICLR 2021 by
     He Zhao, Dinh Phung, Viet Huynh, Trung Le, and Wray Buntine.
@@ -84,6 +86,10 @@ class NSTM(BaseModel):
         val_size=0.2,
         shuffle=True,
         random_state=42,
+        sinkhorn_max_iter: int = 5000,
+        sinkhorn_stop_threshold: float = 0.5e-2,
+        sinkhorn_check_every: int = 20,
+        sinkhorn_warm_start: bool = False,
         **kwargs,
     ):
         """
@@ -111,6 +117,14 @@ class NSTM(BaseModel):
             Whether to shuffle the dataset before splitting, by default True.
         random_state : int, optional
             Random seed for shuffling and splitting the dataset, by default 42.
+        sinkhorn_max_iter : int, optional
+            Maximum number of Sinkhorn iterations per batch, by default 5000.
+        sinkhorn_stop_threshold : float, optional
+            Convergence threshold of the Sinkhorn iterations, by default 0.5e-2.
+        sinkhorn_check_every : int, optional
+            Number of Sinkhorn iterations between two convergence checks, by default 20.
+        sinkhorn_warm_start : bool, optional
+            Whether to warm-start the Sinkhorn dual variables from the previous batch, by default False.
         **kwargs : dict
             Additional keyword arguments to pass to the parent class constructor.
         """
@@ -123,6 +137,10 @@ class NSTM(BaseModel):
             pretrained_WE=pretrained_WE,
             train_WE=train_WE,
             encoder_activation=encoder_activation,
+            sinkhorn_max_iter=sinkhorn_max_iter,
+            sinkhorn_stop_threshold=sinkhorn_stop_threshold,
+            sinkhorn_check_every=sinkhorn_check_every,
+            sinkhorn_warm_start=sinkhorn_warm_start,
         )
         self.save_hyperparameters(
             ignore=[
@@ -251,7 +269,7 @@ class NSTM(BaseModel):
         self.trainer = pl.Trainer(
             max_epochs=max_epochs,
             callbacks=model_callbacks,
-            **trainer_kwargs,
+            **{**self.performance_profile.trainer_kwargs(), **trainer_kwargs},
         )
 
     def _initialize_datamodule(
@@ -273,6 +291,7 @@ class NSTM(BaseModel):
             shuffle=self.hparams["datamodule_args"]["shuffle"],
             val_size=self.hparams["datamodule_args"]["val_size"],
             random_state=self.hparams["datamodule_args"]["random_state"],
+            **self.performance_profile.dataloader_kwargs(),
         )
 
         self.data_module.preprocess_data(
@@ -304,6 +323,7 @@ class NSTM(BaseModel):
         mode: str = "min",
         trial=None,
         optimize=False,
+        performance_profile=None,
         **kwargs,
     ):
         """
@@ -343,6 +363,9 @@ class NSTM(BaseModel):
             The Optuna trial for hyperparameter optimization. Defaults to None.
         optimize : bool, optional
             Whether to optimize hyperparameters. Defaults to False.
+        performance_profile : PerformanceProfile, str or dict, optional
+            Throughput settings for training, e.g. "cpu" for bf16 autocast,
+            thread control and persistent dataloader workers. Defaults to None.
         **kwargs
             Additional keyword arguments to be passed to the trainer.
 
@@ -359,6 +382,7 @@ class NSTM(BaseModel):
         """
 
         self.optimize = optimize
+        self.performance_profile = PerformanceProfile.resolve(performance_profile)
         assert isinstance(
             dataset, TMDataset
         ), "The dataset must be an instance of TMDataset."
@@ -387,12 +411,14 @@ class NSTM(BaseModel):
             }
         )
 
+        previous_threads = self.performance_profile.apply_threads()
         try:
 
             self._status = TrainingStatus.INITIALIZED
             self._initialize_datamodule(dataset=dataset)
 
             self._initialize_model()
+            self.performance_profile.compile_module(self.model.model)
 
             self._initialize_trainer(
                 max_epochs=self.hparams["max_epochs"],
@@ -416,6 +442,8 @@ class NSTM(BaseModel):
             logger.error("Training interrupted.")
             self._status = TrainingStatus.INTERRUPTED
             raise
+        finally:
+            self.performance_profile.restore_threads(previous_threads)
 
         if self.n_topics <= 0:
             raise ValueError("Number of topics must be greater than 0.")
@@ -423,20 +451,19 @@ class NSTM(BaseModel):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        self.theta = (
-            self.model.model.get_theta(torch.tensor(self.dataset.bow))
-            .detach()
-            .cpu()
-            .numpy()
-        )
-
-        self.theta = self.theta / self.theta.sum(axis=1, keepdims=True)
+        self.theta = self.infer_theta(self.dataset)
 
         self.beta = self.model.model.get_beta().detach().cpu().numpy()
         self.labels = np.array(np.argmax(self.theta, axis=1))
 
         self.topic_dict = self.get_topic_word_dict(self.data_module.vocab)
 
+    def _theta_from_batch(self, model, batch):
+        """
+        Compute theta for one batch; the base model only takes the bag-of-words.
+        """
+        return model.get_theta(batch["bow"])
+
     def get_topic_word_dict(self, vocab, num_words=100):
         """
         Get the topic-word dictionary.
@@ -461,9 +488,6 @@ class NSTM(BaseModel):
             topic_word_dict[topic_idx] = top_words_probs
         return topic_word_dict
 
-    def predict(self, dataset):
-        pass
-
     def suggest_hyperparameters(self, trial, max_topics=100):
         self.hparams["n_topics"] = trial.suggest_int("n_topics", 1, max_topics)
         self.hparams["encoder_dim"] = trial.suggest_int("encoder_dim", 16, 512)
@@ -498,6 +522,8 @@ class NSTM(BaseModel):
         criterion="val_loss",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -516,6 +542,10 @@ class NSTM(BaseModel):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -529,6 +559,8 @@ class NSTM(BaseModel):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
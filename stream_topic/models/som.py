@@ -1,3 +1,4 @@
+import time as timer
 from datetime import datetime
 from itertools import product
 
@@ -8,7 +9,7 @@ from sklearn.preprocessing import OneHotEncoder
 from tqdm import tqdm
 
 from ..commons.check_steps import check_dataset_steps
-from ..preprocessor._tf_idf import c_tf_idf, extract_tfidf_topics
+from ..preprocessor._tf_idf import ClassTfidf, c_tf_idf, extract_tfidf_topics
 from ..utils.dataset import TMDataset
 from .abstract_helper_models.base import BaseModel, TrainingStatus
 from .abstract_helper_models.mixins import SentenceEncodingMixin
@@ -16,6 +17,7 @@ from .abstract_helper_models.mixins import SentenceEncodingMixin
 time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 MODEL_NAME = "SOMTM"
 EMBEDDING_MODEL_NAME = "paraphrase-MiniLM-L3-v2"
+LABEL_CHUNK_SIZE = 8192
 # logger.add(f"{MODEL_NAME}_{time}.log", backtrace=True, diagnose=True)
 
 
@@ -32,6 +34,9 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         reduce_dim: bool = True,
         reduced_dimension: int = 16,
         dim: int = None,
+        encoding_batch_size: int = 64,
+        encoding_num_workers: int = None,
+        embedding_cache_dir: str = None,
         **kwargs,
     ):
         """
@@ -59,6 +64,12 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
             Reduced dimensionality (default is 16).
         dim : int, optional
             Dimensionality of the training inputs (default is None).
+        encoding_batch_size : int, optional
+            Number of text segments encoded per batch (default is 64).
+        encoding_num_workers : int, optional
+            Number of local processes used to encode documents (default is None, a single process).
+        embedding_cache_dir : str, optional
+            Directory of a persistent per-document embedding cache; only documents not yet in the cache are encoded (default is None, no cache).
         kwargs : dict
             Additional arguments.
         """
@@ -95,6 +106,10 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         self.weights = torch.randn(self.m * self.n, self.dim)
         self.locations = torch.tensor(
             list(product(range(self.m), range(self.n))))
+        # squared grid distances between all pairs of neurons
+        self.grid_distances = torch.cdist(
+            self.locations.float(), self.locations.float()
+        ).pow(2)
         self.train_history = []
 
         self.umap_args = self.hparams.get(
@@ -108,6 +123,11 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         )
 
         self.save_embeddings = save_embeddings
+        self.encoding_batch_size = encoding_batch_size
+        self.encoding_num_workers = encoding_num_workers
+        self.embedding_cache_dir = embedding_cache_dir
+        # reused across fits, so refits only vectorize the clusters that changed
+        self._class_tfidf = ClassTfidf()
         self._status = TrainingStatus.NOT_STARTED
 
     def get_info(self):
@@ -145,10 +165,46 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         int
             Index of the BMU.
         """
-        differences = self.weights - x
-        distances = torch.sum(torch.pow(differences, 2), 1)
-        min_index = torch.argmin(distances)
-        return min_index
+        return self._find_bmus(x.unsqueeze(0))[0]
+
+    def _find_bmus(self, batch):
+        """
+        Find the Best Matching Units (BMUs) for a batch of vectors.
+
+        Parameters
+        ----------
+        batch : torch.Tensor
+            Input vectors of shape (batch_size, dim).
+
+        Returns
+        -------
+        torch.Tensor
+            Index of the BMU of every input vector.
+        """
+        return torch.argmin(torch.cdist(batch, self.weights), dim=1)
+
+    def _neighborhood(self, bmu_indices, rad_squared):
+        """
+        Compute the neighborhood influence of the BMUs on all neurons.
+
+        Parameters
+        ----------
+        bmu_indices : torch.Tensor
+            BMU index of every input vector.
+        rad_squared : float
+            Squared neighborhood radius.
+
+        Returns
+        -------
+        torch.Tensor
+            Influence matrix of shape (batch_size, m * n).
+        """
+        distance_squares = self.grid_distances[bmu_indices]
+        if self.use_softmax:
+            return torch.nn.functional.softmax(
+                -distance_squares / (2 * rad_squared), dim=1
+            )
+        return torch.exp(-distance_squares / (2 * rad_squared))
 
     def _decay_learning_rate(self, iteration):
         """
@@ -186,12 +242,16 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         """
         Update the weight vectors for a batch of data.
 
+        In batch mode every neuron moves towards the influence-weighted average of
+        the batch, computed with a single matrix product. Otherwise the samples
+        are applied one after another as in the online SOM.
+
         Parameters
         ----------
         batch : torch.Tensor
             Batch of input vectors.
-        bmu_indices : list of int
-            List of BMU indices for the batch.
+        bmu_indices : torch.Tensor
+            BMU indices for the batch.
         iteration : int
             Current iteration.
         """
@@ -199,21 +259,18 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         rad = self._decay_radius(iteration)
         rad_squared = rad**2
 
-        for i, x in enumerate(batch):
-            bmu = bmu_indices[i]
-            distance_squares = torch.sum(
-                torch.pow(self.locations - self.locations[bmu], 2), 1
-            )
+        influence = self._neighborhood(bmu_indices, rad_squared)
 
-            if self.use_softmax:
-                influence = torch.nn.functional.softmax(
-                    -distance_squares / (2 * rad_squared), dim=0
-                )
-            else:
-                influence = torch.exp(-distance_squares / (2 * rad_squared))
+        if self.batch_som:
+            total_influence = influence.sum(dim=0)
+            weighted_sum = influence.T @ batch
+            updated = total_influence > 1e-12
+            target = weighted_sum[updated] / total_influence[updated].unsqueeze(1)
+            self.weights[updated] += lr * (target - self.weights[updated])
+            return
 
-            influence = influence.unsqueeze(1)
-            self.weights += lr * influence * (x - self.weights)
+        for i, x in enumerate(batch):
+            self.weights += lr * influence[i].unsqueeze(1) * (x - self.weights)
 
     def _train_batch(self, data, batch_size):
         """
@@ -226,20 +283,28 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         batch_size : int
             Size of each mini-batch.
         """
-        n_samples = len(data)
+        data_tensor = torch.as_tensor(np.asarray(data, dtype=np.float32))
+        self.weights = self.weights.to(data_tensor.dtype)
+        n_samples = len(data_tensor)
+
+        start = timer.perf_counter()
         for iteration in tqdm(range(self.n_iterations)):
             # Shuffle data at each epoch
-            np.random.shuffle(data)
+            permutation = torch.randperm(n_samples)
 
             for i in range(0, n_samples, batch_size):
-                batch = data[i: i + batch_size]
-                batch_tensor = torch.tensor(batch)
-                bmu_indices = [self._find_bmu(x) for x in batch_tensor]
+                batch_tensor = data_tensor[permutation[i: i + batch_size]]
+                bmu_indices = self._find_bmus(batch_tensor)
 
                 self._update_weights_batch(
                     batch_tensor, bmu_indices, iteration)
+        elapsed = timer.perf_counter() - start
+        logger.info(
+            f"--- SOM training: {self.n_iterations} iterations in {elapsed:.2f}s "
+            f"({self.n_iterations / max(elapsed, 1e-12):.2f} iterations/s) ---"
+        )
 
-        self.labels = self._get_cluster_labels(data)
+        self.labels = self._get_cluster_labels(data_tensor)
 
     def _get_weights(self):
         """
@@ -252,26 +317,30 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         """
         return self.weights
 
-    def _get_cluster_labels(self, data):
+    def _get_cluster_labels(self, data, chunk_size=LABEL_CHUNK_SIZE):
         """
         Assigns each data point to the closest cluster (BMU).
 
         Parameters
         ----------
-        data : numpy.ndarray
+        data : numpy.ndarray or torch.Tensor
             Input data points.
+        chunk_size : int, optional
+            Number of data points assigned at once (default is 8192).
 
         Returns
         -------
-        list of int
-            List of cluster indices corresponding to each data point.
+        numpy.ndarray
+            Cluster index of each data point.
         """
-        labels = []
-        for x in data:
-            x_tensor = torch.tensor(x)
-            bmu_index = self._find_bmu(x_tensor)
-            labels.append(bmu_index.item())  # Convert tensor to integer
-        return labels
+        data = torch.as_tensor(data, dtype=self.weights.dtype)
+        labels = [
+            self._find_bmus(data[start: start + chunk_size])
+            for start in range(0, len(data), chunk_size)
+        ]
+        if not labels:
+            return np.empty(0, dtype=np.int64)
+        return torch.cat(labels).numpy()
 
     def fit(
         self,
@@ -281,6 +350,7 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         lr: float = None,
         sigma: float = None,
         use_softmax: bool = True,
+        batch_som: bool = False,
     ):
         """
         Fit the SOMTM model to the dataset.
@@ -299,6 +369,9 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
             Initial neighborhood value (default is None, which sets it to max(m, n) / 2).
         use_softmax : bool, optional
             Whether to use softmax for mapping (default is True).
+        batch_som : bool, optional
+            Whether to update the weights once per mini-batch with the batch SOM rule
+            instead of once per sample (default is False).
         """
 
         self.n_iterations = n_iterations
@@ -306,6 +379,7 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
         self.sigma = sigma if sigma is not None else max(self.m, self.n) / 2
         self.batch_size = batch_size
         self.use_softmax = use_softmax
+        self.batch_som = batch_som
 
         self.hparams.update(
             {
@@ -314,6 +388,7 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
                 "lr": self.alpha,
                 "sigma": self.sigma,
                 "use_softmax": use_softmax,
+                "batch_som": batch_som,
             }
         )
 
@@ -341,7 +416,10 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
             ).agg({"text": " ".join})
 
             tfidf, count = c_tf_idf(
-                docs_per_topic["text"].values, m=len(self.dataframe)
+                docs_per_topic["text"].values,
+                m=len(self.dataframe),
+                sparse=True,
+                engine=self._class_tfidf,
             )
             self.topic_dict = extract_tfidf_topics(
                 tfidf, count, docs_per_topic, n=100)
@@ -350,7 +428,7 @@ class SOMTM(BaseModel, SentenceEncodingMixin):
             predictions_one_hot = one_hot_encoder.fit_transform(
                 self.dataframe[["predictions"]]
             )
-            self.beta = tfidf.T
+            self.beta = tfidf.T.toarray()
             self.theta = predictions_one_hot.T
         except Exception as e:
             logger.error(f"Error in training: {e}")
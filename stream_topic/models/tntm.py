@@ -11,12 +11,13 @@ import umap
 from lightning.pytorch.callbacks import EarlyStopping, ModelCheckpoint, ModelSummary
 from loguru import logger
 from optuna.integration import PyTorchLightningPruningCallback
-from sentence_transformers import SentenceTransformer
 from sklearn.mixture import GaussianMixture
 
 from ..utils.datamodule import TMDataModule
 from ..utils.dataset import TMDataset
+from ..utils.performance import PerformanceProfile
 from .abstract_helper_models.base import BaseModel, TrainingStatus
+from .abstract_helper_models.mixins import NeuralInferenceMixin
 from .abstract_helper_models.neural_basemodel import NeuralBaseModel
 from .neural_base_models.tntm_base import TNTMBase
 
@@ -29,7 +30,7 @@ WORD_EMBEDDING_MODEL_NAME = (
 )
 
 
-class TNTM(BaseModel):
+class TNTM(NeuralInferenceMixin, BaseModel):
     def __init__(
         self,
         word_embedding_model_name: str = WORD_EMBEDDING_MODEL_NAME,
@@ -300,7 +301,7 @@ class TNTM(BaseModel):
         self.trainer = pl.Trainer(
             max_epochs=max_epochs,
             callbacks=model_callbacks,
-            **trainer_kwargs,
+            **{**self.performance_profile.trainer_kwargs(), **trainer_kwargs},
         )
 
     def _prepare_word_embeddings(self, data_module, dataset, logger):
@@ -370,6 +371,7 @@ class TNTM(BaseModel):
             shuffle=self.hparams["datamodule_args"]["shuffle"],
             val_size=self.hparams["datamodule_args"]["val_size"],
             random_state=self.hparams["datamodule_args"]["random_state"],
+            **self.performance_profile.dataloader_kwargs(),
         )
 
         self.data_module.preprocess_data(
@@ -403,6 +405,7 @@ class TNTM(BaseModel):
         mode: str = "min",
         trial=None,
         optimize=False,
+        performance_profile=None,
         **kwargs,
     ):
         """
@@ -424,6 +427,8 @@ class TNTM(BaseModel):
             checkpoint_path (str, optional): The path to save model checkpoints. Defaults to "checkpoints".
             monitor (str, optional): The metric to monitor for early stopping. Defaults to "val_loss".
             mode (str, optional): The mode for early stopping. Defaults to "min".
+            performance_profile (PerformanceProfile, str or dict, optional): Throughput settings for training, e.g. "cpu" for bf16
+                autocast, thread control and persistent dataloader workers. Defaults to None.
             **kwargs: Additional keyword arguments to be passed to the trainer.
 
         Raises:
@@ -431,6 +436,7 @@ class TNTM(BaseModel):
         """
 
         self.optimize = optimize
+        self.performance_profile = PerformanceProfile.resolve(performance_profile)
         assert isinstance(
             dataset, TMDataset
         ), "The dataset must be an instance of TMDataset."
@@ -458,6 +464,7 @@ class TNTM(BaseModel):
             }
         )
 
+        previous_threads = self.performance_profile.apply_threads()
         try:
             self._status = TrainingStatus.RUNNING
             if not self.embeddings_prepared:
@@ -471,6 +478,7 @@ class TNTM(BaseModel):
                 self._prepare_word_embeddings(self.data_module, dataset, logger)
 
             self._initialize_model()
+            self.performance_profile.compile_module(self.model.model)
 
             self._initialize_trainer(
                 max_epochs=self.hparams["max_epochs"],
@@ -494,6 +502,8 @@ class TNTM(BaseModel):
             logger.error("Training interrupted.")
             self._status = TrainingStatus.INTERRUPTED
             raise
+        finally:
+            self.performance_profile.restore_threads(previous_threads)
 
         if self.n_topics <= 0:
             raise ValueError("Number of topics must be greater than 0.")
@@ -514,16 +524,7 @@ class TNTM(BaseModel):
         logger.info("--- Training completed successfully. ---")
         self._status = TrainingStatus.SUCCEEDED
 
-        data = {
-            "embedding": torch.tensor(dataset.embeddings),
-            "bow": torch.tensor(dataset.bow),
-        }
-
-        self.theta = (
-            self.model.model.get_theta(data, only_theta=True).detach().cpu().numpy()
-        )
-
-        self.theta = self.theta / self.theta.sum(axis=1, keepdims=True)
+        self.theta = self.infer_theta(dataset)
 
         self.beta = self.model.model.get_beta().detach().cpu().numpy()
         self.beta = self.beta.transpose(1, 0)
@@ -557,9 +558,6 @@ class TNTM(BaseModel):
             topic_word_dict[topic_idx] = top_words_probs
         return topic_word_dict
 
-    def predict(self, dataset):
-        pass
-
     def get_beta(self):
         """
         Get the beta distribution.
@@ -607,6 +605,8 @@ class TNTM(BaseModel):
         criterion="val_loss",
         n_trials=100,
         custom_metric=None,
+        n_jobs=1,
+        storage=None,
     ):
         """
         A new method in the child class that calls the parent class's optimize_hyperparameters method.
@@ -625,6 +625,10 @@ class TNTM(BaseModel):
             Number of trials for optimization, by default 100.
         custom_metric : object, optional
             Custom metric object with a `score` method for evaluation, by default None.
+        n_jobs : int, optional
+            Number of processes running trials in parallel, -1 for one per core, by default 1.
+        storage : str, optional
+            Optuna database URL or journal file path to store and resume the study, by default None.
 
         Returns
         -------
@@ -638,6 +642,8 @@ class TNTM(BaseModel):
             criterion=criterion,
             n_trials=n_trials,
             custom_metric=custom_metric,
+            n_jobs=n_jobs,
+            storage=storage,
         )
 
         return best_params
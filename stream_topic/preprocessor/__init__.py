@@ -1,7 +1,7 @@
 from ._cleaning import clean_topics
 from ._embedder import BaseEmbedder, GensimBackend
 from ._preprocessor import TextPreprocessor
-from ._tf_idf import c_tf_idf, extract_tfidf_topics, extract_topic_sizes
+from ._tf_idf import ClassTfidf, c_tf_idf, extract_tfidf_topics, extract_topic_sizes
 from .topic_extraction import TopicExtractor
 from .arabic_preprocessing import ArabicPreprocessor
 
@@ -10,6 +10,7 @@ __all__ = [
     "BaseEmbedder",
     "GensimBackend",
     "TextPreprocessor",
+    "ClassTfidf",
     "c_tf_idf",
     "extract_tfidf_topics",
     "extract_topic_sizes",
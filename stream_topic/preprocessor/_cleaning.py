@@ -1,6 +1,5 @@
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from tqdm import tqdm
+import scipy.sparse as sp
 
 from ._embedder import BaseEmbedder
 
@@ -22,6 +21,9 @@ def clean_topics(topics, embedding_model, similarity=0.75):
 
     The resulting topics can hence vary in their lengths.
 
+    The union of the words of all topics is embedded with a single call of the embedding model,
+    and the weighted topic means are computed as one matrix product.
+
 
     Args:
         topics (_type_): the models topics
@@ -33,53 +35,61 @@ def clean_topics(topics, embedding_model, similarity=0.75):
     """
 
     word_embedding_model = BaseEmbedder(embedding_model)
-
-    cleaned_topics = []
-    # iterate through every topic
-    for topic in tqdm(range(len(topics))):
-        # extract words from topics
-        keys = [word for t in topics[topic]
-                for word in t if isinstance(word, str)]
-
-        keys_ = word_embedding_model.create_word_embeddings(keys)
-
-        mat = cosine_similarity(keys_)
-
-        np.fill_diagonal(mat, 0)
-        mat = np.triu(mat)
-
-        sim_mat = np.where(mat >= similarity)
-
-        word_list = []
-        for a, b in zip(sim_mat[0], sim_mat[1]):
-            word_list.append((keys[a], keys[b]))
-
-        drop_values = []
-        for i in range(len(word_list)):
-            if word_list[i][0] not in drop_values:
-                drop_values.append(word_list[i][1])
-
-        k = [key for key in topics[topic] if key[0] not in drop_values]
-        cleaned_topics.append(k)
+    if len(topics) == 0:
+        return {}, []
+
+    topic_words = [
+        [word for t in topics[topic] for word in t if isinstance(word, str)]
+        for topic in range(len(topics))
+    ]
+
+    # embed the union of all topic words with a single call
+    vocabulary, inverse = np.unique(
+        np.array([word for words in topic_words for word in words], dtype=str),
+        return_inverse=True,
+    )
+    embeddings = np.asarray(word_embedding_model.create_word_embeddings(list(vocabulary)))
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = np.divide(
+        embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0
+    )
+    word_ids = np.split(inverse, np.cumsum([len(words) for words in topic_words])[:-1])
 
     # create dictionary of cleaned topics
     dict_tops = {}
-    for i in range(len(cleaned_topics)):
-        dict_tops[i] = cleaned_topics[i]
+    for topic, ids in enumerate(word_ids):
+        above = np.triu(normalized[ids] @ normalized[ids].T >= similarity, k=1)
+
+        # top-down: a word that is not dropped yet drops all later words too similar to it
+        dropped = np.zeros(len(vocabulary), dtype=bool)
+        for a in range(len(ids)):
+            if not dropped[ids[a]]:
+                dropped[ids[above[a]]] = True
+
+        drop_values = set(vocabulary[dropped])
+        dict_tops[topic] = [key for key in topics[topic] if key[0] not in drop_values]
 
-    topic_mean_embeddings = []
+    # weighted mean embedding of every topic as one sparse-dense product
+    rows, columns, values = [], [], []
     for k in range(len(dict_tops)):
-        temp = 0
-        words = [word for t in dict_tops[k]
-                 for word in t if isinstance(word, str)]
-        weights = [
-            weight for t in dict_tops[k] for weight in t if isinstance(weight, float)
-        ]
-        weights = [weight / sum(weights) for weight in weights]
-        for i in range(len(words)):
-            temp += word_embedding_model.create_word_embeddings(
-                words[i]) * weights[i]
-        temp /= len(words)
-        topic_mean_embeddings.append(temp)
+        words = [word for t in dict_tops[k] for word in t if isinstance(word, str)]
+        weights = np.array(
+            [
+                weight
+                for t in dict_tops[k]
+                for weight in t
+                if isinstance(weight, (float, np.floating))
+            ],
+            dtype=np.float64,
+        )
+        rows.append(np.full(len(words), k))
+        columns.append(np.searchsorted(vocabulary, np.array(words, dtype=str)))
+        values.append(weights / weights.sum() / len(words))
+
+    weight_matrix = sp.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+        shape=(len(dict_tops), len(vocabulary)),
+    )
+    topic_mean_embeddings = list(weight_matrix @ embeddings)
 
     return dict_tops, topic_mean_embeddings
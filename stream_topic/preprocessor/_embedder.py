@@ -5,8 +5,11 @@ from typing import List
 import numpy as np
 import pandas as pd
 from gensim.models.keyedvectors import Word2VecKeyedVectors
+from scipy.sparse import csr_matrix
 from tqdm import tqdm
 
+from ..commons.embedding_registry import get_embedding_model
+
 
 class GensimBackend:
     """
@@ -52,39 +55,43 @@ class GensimBackend:
         """
         Embed a list of documents/words into an n-dimensional matrix of embeddings.
 
+        Every document is tokenized on spaces and mapped to vocabulary indices once. The
+        embeddings are the mean of the word vectors of each document, computed as a
+        single product of a sparse (documents x vocabulary) averaging matrix with the
+        vector table. Documents without any in-vocabulary word get a zero vector.
+
         Args:
             documents (List[str]): A list of documents or words to be embedded.
             verbose (bool, optional): Controls the verbosity of the process.
 
         Returns:
-            np.ndarray: Document/words embeddings with shape (n, m) with `n` documents/words
-            that each have an embeddings size of `m`.
+            np.ndarray: Contiguous float32 document/words embeddings with shape (n, m) with
+            `n` documents/words that each have an embeddings size of `m`.
 
         """
-        # unused variables
-        # vector_shape = self.embedding_model.get_vector(
-        #     list(self.embedding_model.index_to_key)[0]
-        # ).shape[0]
-        # empty_vector = np.zeros(vector_shape)
+        key_to_index = self.embedding_model.key_to_index
+        vectors = self.embedding_model.vectors
 
-        embeddings = []
+        indices = []
+        indptr = [0]
         for doc in tqdm(documents, disable=not verbose, position=0, leave=True):
-            doc_embedding = []
-
-            # Extract word embeddings
-            for word in doc.split(" "):
-                try:
-                    word_embedding = self.embedding_model.get_vector(word)
-                    doc_embedding.append(word_embedding)
-                except KeyError:
-                    continue
-
-            # Pool word embeddings
-            doc_embedding = np.mean(doc_embedding, axis=0)
-            embeddings.append(doc_embedding)
+            indices.extend(
+                key_to_index[word] for word in doc.split(" ") if word in key_to_index
+            )
+            indptr.append(len(indices))
+
+        indptr = np.asarray(indptr, dtype=np.int64)
+        counts = np.diff(indptr)
+        weights = np.repeat(
+            1.0 / np.maximum(counts, 1), counts
+        ).astype(vectors.dtype, copy=False)
+        averaging = csr_matrix(
+            (weights, np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(counts), vectors.shape[0]),
+        )
 
-        embeddings = np.array(embeddings, dtype=object)
-        return embeddings
+        embeddings = averaging @ vectors
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
 
 class BaseEmbedder:
@@ -113,9 +120,12 @@ class BaseEmbedder:
         Initialize the BaseEmbedder with an embedding model.
 
         Args:
-            embedding_model: The embedding model used for generating embeddings.
+            embedding_model: The embedding model used for generating embeddings. A model name
+                is resolved to the shared SentenceTransformer from the embedding model registry.
 
         """
+        if isinstance(embedding_model, str):
+            embedding_model = get_embedding_model(embedding_model)
         if isinstance(embedding_model, Word2VecKeyedVectors):
             self.embedder = GensimBackend(embedding_model)
         else:
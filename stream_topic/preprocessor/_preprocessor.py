@@ -1,7 +1,12 @@
+import os
 import re
 import unicodedata
-from collections import Counter
-from typing import List, Set
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Set, Union
 
 from langdetect import detect
 from langdetect.lang_detect_exception import LangDetectException
@@ -12,6 +17,39 @@ from nltk.tokenize.treebank import TreebankWordDetokenizer
 from tqdm import tqdm
 from .arabic_preprocessing import ArabicPreprocessor
 
+TOKEN_CACHE_SIZE = 2**18
+
+_HTML_TAGS = re.compile("<.*?>")
+_SPECIAL_CHARS = re.compile(r"[^a-zA-Z0-9\s]")
+_NUMBERS = re.compile(r"\d+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+_LEMMATIZER = WordNetLemmatizer()
+_STEMMER = PorterStemmer()
+_DETOKENIZER = TreebankWordDetokenizer()
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _lemmatize_token(word):
+    return _LEMMATIZER.lemmatize(word)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _stem_token(word):
+    return _STEMMER.stem(word)
+
+
+_WORKER_PREPROCESSOR = None
+
+
+def _init_worker(preprocessor):
+    global _WORKER_PREPROCESSOR
+    _WORKER_PREPROCESSOR = preprocessor
+
+
+def _run_in_worker(method_name, args):
+    return getattr(_WORKER_PREPROCESSOR, method_name)(*args)
 
 
 class TextPreprocessor:
@@ -60,6 +98,28 @@ class TextPreprocessor:
         Whether to remove words containing numbers from the text data (default is False).
     remove_words_with_special_chars : bool, optional
         Whether to remove words containing special characters from the text data (default is False).
+    detect_language : bool, optional
+        Whether to detect the language of each document and leave documents in other languages
+        unchanged (default is True).
+    language_sample_rate : float, optional
+        Fraction of documents whose language is detected when ``detect_language`` is True. The
+        remaining documents are assumed to be in ``language``. Documents are selected by a hash of
+        their text, so the selection is deterministic (default is 1.0).
+    n_jobs : int, optional
+        Number of processes used to preprocess collections of documents. Values above 1 process
+        the documents in chunks across a process pool (default is 1).
+    chunk_size : int, optional
+        Number of documents per chunk (default is 1000).
+
+    Notes
+    -----
+    Collections of documents are preprocessed in two passes. The first pass tokenizes the
+    documents and counts the word frequencies, the second pass filters every document against
+    the final counts, so ``min_word_freq`` and ``max_word_freq`` do not depend on the order of
+    the documents. Both passes stream over the documents chunk by chunk, so a corpus stored in a
+    file can be preprocessed with ``preprocess_file`` without loading it into memory.
+
+    Lemmatization and stemming results are memoized per token in a process-wide LRU cache.
 
     """
 
@@ -90,6 +150,10 @@ class TextPreprocessor:
         self.remove_words_with_special_chars = kwargs.get(
             "remove_words_with_special_chars", False
         )
+        self.detect_language = kwargs.get("detect_language", True)
+        self.language_sample_rate = kwargs.get("language_sample_rate", 1.0)
+        self.n_jobs = kwargs.get("n_jobs", 1)
+        self.chunk_size = kwargs.get("chunk_size", 1000)
 
         if self.language != "en" and self.remove_stopwords:
             self.stop_words = set(stopwords.words(self.language))
@@ -98,13 +162,11 @@ class TextPreprocessor:
 
         self.stop_words.update(self.custom_stopwords)
 
-        if self.lemmatize:
-            self.lemmatizer = WordNetLemmatizer()
-
-        if self.stem:
-            self.stemmer = PorterStemmer()
-
         self.contractions_dict = self._load_contractions()
+        self.contractions_pattern = re.compile(
+            "({})".format("|".join(self.contractions_dict.keys())),
+            flags=re.IGNORECASE | re.DOTALL,
+        )
         self.word_freq = Counter()
 
         if self.language == "ar":
@@ -135,32 +197,26 @@ class TextPreprocessor:
         return contractions_dict
 
     def _expand_contractions(self, text):
-        contractions_pattern = re.compile(
-            "({})".format("|".join(self.contractions_dict.keys())),
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
         def expand_match(contraction):
             match = contraction.group(0)
             expanded_contraction = self.contractions_dict.get(match.lower())
             return expanded_contraction
 
-        expanded_text = contractions_pattern.sub(expand_match, text)
+        expanded_text = self.contractions_pattern.sub(expand_match, text)
         return expanded_text
 
     def _remove_html_tags(self, text):
-        clean = re.compile("<.*?>")
-        return re.sub(clean, " ", text)
+        return _HTML_TAGS.sub(" ", text)
 
     def _remove_special_characters(self, text):
-        return re.sub(r"[^a-zA-Z0-9\s]", " ", text)
+        return _SPECIAL_CHARS.sub(" ", text)
 
     def _remove_accents(self, text):
         text = unicodedata.normalize("NFD", text)
         text = text.encode("ascii", "ignore")
         return text.decode("utf-8")
 
-    def _clean_text(self, text):
+    def _tokenize(self, text):
         text = text.strip()
         if self.lowercase:
             text = text.lower()
@@ -173,24 +229,25 @@ class TextPreprocessor:
         if self.remove_accents:
             text = self._remove_accents(text)
         if self.remove_numbers:
-            text = re.sub(r"\d+", " ", text)
+            text = _NUMBERS.sub(" ", text)
         if self.remove_punctuation:
-            text = re.sub(r"[^\w\s]", " ", text)
-
-        words = word_tokenize(text)
+            text = _PUNCTUATION.sub(" ", text)
 
-        # Update word frequency counter
-        self.word_freq.update(words)
+        return word_tokenize(text)
 
+    def _transform_tokens(self, words):
         if self.remove_stopwords:
             words = [word for word in words if word not in self.stop_words]
 
         if self.lemmatize:
-            words = [self.lemmatizer.lemmatize(word) for word in words]
+            words = [_lemmatize_token(word) for word in words]
 
         if self.stem:
-            words = [self.stemmer.stem(word) for word in words]
+            words = [_stem_token(word) for word in words]
 
+        return words
+
+    def _filter_tokens(self, words):
         if self.min_word_freq is not None:
             words = [
                 word for word in words if self.word_freq[word] >= self.min_word_freq
@@ -214,22 +271,127 @@ class TextPreprocessor:
             words = [word for word in words if not any(char.isdigit() for char in word)]
 
         if self.remove_words_with_special_chars:
-            words = [word for word in words if not re.search(r"[^a-zA-Z0-9\s]", word)]
+            words = [word for word in words if not _SPECIAL_CHARS.search(word)]
+
+        return words
 
+    def _join_tokens(self, words):
         if self.detokenize:
-            text = TreebankWordDetokenizer().detokenize(words)
+            text = _DETOKENIZER.detokenize(words)
         else:
             text = " ".join(words)
 
         # Remove double spaces
-        text = re.sub(r"\s+", " ", text)
+        text = _WHITESPACE.sub(" ", text)
 
         return text
 
+    def _clean_text(self, text):
+        words = self._transform_tokens(self._tokenize(text))
+
+        # Update word frequency counter with the tokens that are filtered below
+        self.word_freq.update(words)
+
+        words = self._filter_tokens(words)
+        return self._join_tokens(words)
+
+    def _is_target_language(self, text):
+        if not self.detect_language:
+            return True
+        if self.language_sample_rate < 1.0:
+            bucket = zlib.crc32(text.encode("utf-8")) % 10_000
+            if bucket >= self.language_sample_rate * 10_000:
+                return True
+        try:
+            return detect(text) == self.language
+        except LangDetectException:
+            return True
+
+    def _count_chunk(self, start, documents):
+        """
+        First pass over a chunk: count the tokens of all documents in the target language.
+
+        The tokens are counted after stopword removal, lemmatization and stemming, i.e. in the
+        form that ``_filter_tokens`` compares against ``word_freq``.
+
+        Returns
+        -------
+        tuple
+            A Counter of the token frequencies and the indices of the documents that are left
+            unchanged because they are in another language.
+        """
+        word_freq = Counter()
+        skipped = []
+        for offset, doc in enumerate(documents):
+            if not self._is_target_language(doc):
+                skipped.append(start + offset)
+                continue
+            word_freq.update(self._transform_tokens(self._tokenize(doc)))
+        return word_freq, skipped
+
+    def _filter_chunk(self, start, documents, skipped):
+        """
+        Second pass over a chunk: clean the documents and filter them against ``word_freq``.
+        """
+        return [
+            doc
+            if start + offset in skipped
+            else self._join_tokens(
+                self._filter_tokens(self._transform_tokens(self._tokenize(doc)))
+            )
+            for offset, doc in enumerate(documents)
+        ]
+
+    @staticmethod
+    def _iter_documents(documents):
+        if isinstance(documents, (str, os.PathLike)):
+            with open(documents, encoding="utf-8") as f:
+                for line in f:
+                    yield line.rstrip("\n")
+        else:
+            yield from documents
+
+    def _iter_chunks(self, documents, chunk_size):
+        iterator = self._iter_documents(documents)
+        start = 0
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+    def _map_chunks(self, method_name, chunks, n_jobs):
+        """
+        Apply a chunk method to every chunk, in order, in this process or in a process pool.
+
+        At most ``2 * n_jobs`` chunks are in flight at any time, so memory usage does not grow
+        with the number of documents.
+        """
+        if n_jobs is None or n_jobs <= 1:
+            method = getattr(self, method_name)
+            for chunk in chunks:
+                yield method(*chunk)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_run_in_worker, method_name, chunk))
+                if len(pending) >= 2 * n_jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
     def preprocess_text(self, text):
         """
         Preprocess a single text document.
 
+        The word frequency filters use the frequencies counted so far, including this
+        document. Use ``preprocess_documents`` to filter against the whole corpus.
+
         Parameters
         ----------
         text : str
@@ -241,12 +403,8 @@ class TextPreprocessor:
             Preprocessed text document.
 
         """
-        try:
-            language = detect(text)
-            if language != self.language:
-                return text
-        except LangDetectException:
-            pass
+        if not self._is_target_language(text):
+            return text
         return self._clean_text(text)
 
     def preprocess_dataframe(self, df, text_column):
@@ -266,14 +424,169 @@ class TextPreprocessor:
             Preprocessed DataFrame.
 
         """
-        df[text_column] = df[text_column].apply(self.preprocess_text)
+        df[text_column] = self.preprocess_documents(df[text_column].tolist())
         return df
 
-    def preprocess_documents(self, documents: List[str]) -> List[str]:
-        preprocessed_docs = []
-        for doc in tqdm(documents, desc="Preprocessing documents"):
-            preprocessed_docs.append(self.preprocess_text(doc))
-        return preprocessed_docs
+    def count_words(
+        self,
+        documents: Union[Iterable[str], str, os.PathLike],
+        n_jobs: int = None,
+        chunk_size: int = None,
+    ) -> Counter:
+        """
+        Count the word frequencies of a collection of documents (first pass).
+
+        The counts of all chunks are merged into ``word_freq``.
+
+        Parameters
+        ----------
+        documents : iterable of str or path
+            Documents to count, or the path of a text file with one document per line.
+        n_jobs : int, optional
+            Number of processes to use. Defaults to the preprocessor's ``n_jobs``.
+        chunk_size : int, optional
+            Number of documents per chunk. Defaults to the preprocessor's ``chunk_size``.
+
+        Returns
+        -------
+        Counter
+            The updated word frequencies.
+
+        """
+        self._count_pass(documents, n_jobs, chunk_size)
+        return self.word_freq
+
+    def _count_pass(self, documents, n_jobs, chunk_size):
+        n_jobs = n_jobs or self.n_jobs
+        chunk_size = chunk_size or self.chunk_size
+        skipped = set()
+        for chunk_freq, chunk_skipped in tqdm(
+            self._map_chunks(
+                "_count_chunk", self._iter_chunks(documents, chunk_size), n_jobs
+            ),
+            desc="Counting words",
+            unit="chunk",
+        ):
+            self.word_freq.update(chunk_freq)
+            skipped.update(chunk_skipped)
+        return skipped
+
+    def iter_preprocess(
+        self,
+        documents: Union[Iterable[str], str, os.PathLike],
+        n_jobs: int = None,
+        chunk_size: int = None,
+    ) -> Iterator[str]:
+        """
+        Preprocess a collection of documents lazily, in two passes.
+
+        The first pass counts the word frequencies of all documents, the second pass yields
+        the preprocessed documents in their original order.
+
+        Parameters
+        ----------
+        documents : iterable of str or path
+            Documents to preprocess, or the path of a text file with one document per line.
+            Since the documents are read twice, iterators that can only be consumed once are
+            not accepted.
+        n_jobs : int, optional
+            Number of processes to use. Defaults to the preprocessor's ``n_jobs``.
+        chunk_size : int, optional
+            Number of documents per chunk. Defaults to the preprocessor's ``chunk_size``.
+
+        Yields
+        ------
+        str
+            Preprocessed documents.
+
+        """
+        if not isinstance(documents, (str, os.PathLike)) and iter(documents) is documents:
+            raise TypeError(
+                "documents must be a re-iterable collection or a file path, not an iterator."
+            )
+        n_jobs = n_jobs or self.n_jobs
+        chunk_size = chunk_size or self.chunk_size
+
+        skipped = self._count_pass(documents, n_jobs, chunk_size)
+
+        chunks = (
+            (start, chunk, {i for i in range(start, start + len(chunk)) if i in skipped})
+            for start, chunk in self._iter_chunks(documents, chunk_size)
+        )
+        for processed in self._map_chunks("_filter_chunk", chunks, n_jobs):
+            yield from processed
+
+    def preprocess_documents(
+        self,
+        documents: Union[Iterable[str], str, os.PathLike],
+        n_jobs: int = None,
+        chunk_size: int = None,
+    ) -> List[str]:
+        """
+        Preprocess a list of documents.
+
+        Parameters
+        ----------
+        documents : list of str or path
+            Documents to preprocess, or the path of a text file with one document per line.
+        n_jobs : int, optional
+            Number of processes to use. Defaults to the preprocessor's ``n_jobs``.
+        chunk_size : int, optional
+            Number of documents per chunk sent to a worker. Defaults to the
+            preprocessor's ``chunk_size``.
+
+        Returns
+        -------
+        list of str
+            Preprocessed documents.
+
+        """
+        if not isinstance(documents, (str, os.PathLike)):
+            documents = list(documents)
+        return list(
+            tqdm(
+                self.iter_preprocess(documents, n_jobs=n_jobs, chunk_size=chunk_size),
+                desc="Preprocessing documents",
+            )
+        )
+
+    def preprocess_file(
+        self,
+        input_path: Union[str, os.PathLike],
+        output_path: Union[str, os.PathLike],
+        n_jobs: int = None,
+        chunk_size: int = None,
+    ) -> int:
+        """
+        Preprocess a text file with one document per line and write the result line by line.
+
+        Only one chunk of documents per worker is held in memory at a time.
+
+        Parameters
+        ----------
+        input_path : str or path
+            Text file with one document per line.
+        output_path : str or path
+            File the preprocessed documents are written to, one per line.
+        n_jobs : int, optional
+            Number of processes to use. Defaults to the preprocessor's ``n_jobs``.
+        chunk_size : int, optional
+            Number of documents per chunk. Defaults to the preprocessor's ``chunk_size``.
+
+        Returns
+        -------
+        int
+            Number of documents written.
+
+        """
+        n_documents = 0
+        with open(output_path, "w", encoding="utf-8") as f:
+            for doc in self.iter_preprocess(
+                input_path, n_jobs=n_jobs, chunk_size=chunk_size
+            ):
+                f.write(doc.replace("\n", " ") + "\n")
+                n_documents += 1
+        return n_documents
 
     def add_custom_stopwords(self, stopwords: Set[str]):
         """
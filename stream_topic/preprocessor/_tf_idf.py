@@ -1,42 +1,274 @@
+import hashlib
+
 import numpy as np
+import scipy.sparse as sp
 from loguru import logger
 from sklearn.feature_extraction.text import CountVectorizer
 
 
-def c_tf_idf(documents, m, ngram_range=(1, 1)):
+def _top_k_per_row(matrix, n):
+    """
+    Column indices of the ``n`` largest entries of every row of a CSR matrix.
+
+    Only the stored entries of a row are partitioned with ``argpartition``. The
+    implicit zeros of a row rank above its negative entries; if they are needed to
+    fill the ``n`` places, the columns with the lowest indices are used.
+
+    Args:
+        matrix (scipy.sparse.csr_matrix): Matrix of shape (n_rows, n_columns).
+        n (int): Number of entries per row.
+
+    Returns:
+        list of np.ndarray: For every row, the column indices in descending order of value.
+    """
+    n = min(n, matrix.shape[1])
+    top = []
+    for row in range(matrix.shape[0]):
+        start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+        columns, values = matrix.indices[start:stop], matrix.data[start:stop]
+
+        positive = values > 0
+        columns_pos, values_pos = columns[positive], values[positive]
+        if len(values_pos) > n:
+            keep = np.argpartition(-values_pos, n - 1)[:n]
+            columns_pos, values_pos = columns_pos[keep], values_pos[keep]
+        order = np.lexsort((columns_pos, -values_pos))
+        selected = [columns_pos[order]]
+
+        missing = n - len(columns_pos)
+        if missing > 0:
+            stored = np.zeros(matrix.shape[1], dtype=bool)
+            stored[columns[values != 0]] = True
+            zeros = np.flatnonzero(~stored)[:missing]
+            selected.append(zeros)
+            missing -= len(zeros)
+        if missing > 0:
+            negative = values < 0
+            columns_neg, values_neg = columns[negative], values[negative]
+            order = np.lexsort((columns_neg, -values_neg))[:missing]
+            selected.append(columns_neg[order])
+        top.append(np.concatenate(selected).astype(np.int64))
+    return top
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class ClassTfidf:
+    """Sparse class-based TF-IDF of clusters of documents.
+
+    The documents of every cluster are concatenated into one text per cluster. Counts,
+    term frequencies and the c-TF-IDF are kept as CSR matrices of shape
+    (n_clusters, vocab_size), so memory grows with the number of distinct words per
+    cluster instead of the full cluster x vocabulary product.
+
+    The c-TF-IDF of word ``j`` in cluster ``i`` is ``tf[i, j] * log(m / total[j])`` with
+    ``tf[i, j] = count[i, j] / sum_j count[i, j]``, ``total[j] = sum_i count[i, j]`` and
+    ``m`` the number of documents, as in ``c_tf_idf``. Clusters can be replaced or
+    added with ``update`` without re-vectorizing the unchanged clusters, and ``refit``
+    uses it to follow a new clustering of the same corpus.
+
+    Args:
+        ngram_range (tuple, optional): N-gram range of the vectorizer. Defaults to (1, 1).
+        stop_words (str or list, optional): Stop words of the vectorizer. Defaults to "english".
+    """
+
+    def __init__(self, ngram_range=(1, 1), stop_words="english"):
+        self.ngram_range = ngram_range
+        self.stop_words = stop_words
+        self.count = None
+        self.labels = None
+        self.counts = None
+        self.m = None
+        self.tf_idf = None
+        self._digests = {}
+
+    def fit(self, documents, m, labels=None):
+        """Vectorize the texts of the clusters and compute their c-TF-IDF.
+
+        Args:
+            documents (list of str): One concatenated text per cluster.
+            m (int): Total number of documents.
+            labels (list, optional): Label of every cluster. Defaults to 0, 1, ...
+
+        Returns:
+            ClassTfidf: The fitted instance.
+        """
+        self.count = CountVectorizer(
+            ngram_range=self.ngram_range, stop_words=self.stop_words
+        )
+        self.counts = self.count.fit_transform(documents).astype(np.float64).tocsr()
+        self.labels = list(range(len(documents)) if labels is None else labels)
+        self._digests = {
+            label: _digest(text) for label, text in zip(self.labels, documents)
+        }
+        self.m = m
+        self._compute()
+        return self
+
+    def update(self, documents, m=None):
+        """Replace or add the texts of some clusters and recompute the c-TF-IDF.
+
+        Only the given clusters are vectorized. Words that are not in the vocabulary of
+        ``fit`` are ignored. The IDF, which depends on all clusters, is recomputed from the
+        updated column sums in one pass over the stored entries.
+
+        Args:
+            documents (dict): New concatenated text by cluster label. Unknown labels add
+                new clusters.
+            m (int, optional): New total number of documents. Defaults to the current one.
+
+        Returns:
+            ClassTfidf: The updated instance.
+        """
+        if self.counts is None:
+            raise RuntimeError("ClassTfidf has to be fitted before it can be updated.")
+        if m is not None:
+            self.m = m
+
+        position = {label: i for i, label in enumerate(self.labels)}
+        new_labels = [label for label in documents if label not in position]
+        for label in new_labels:
+            position[label] = len(self.labels)
+            self.labels.append(label)
+
+        changed = list(documents)
+        new_rows = self.count.transform([documents[label] for label in changed])
+        rows = np.array([position[label] for label in changed], dtype=np.int64)
+
+        counts = sp.vstack(
+            [self.counts, sp.csr_matrix((len(new_labels), self.counts.shape[1]))],
+            format="lil",
+        )
+        counts[rows] = new_rows.astype(np.float64)
+        self.counts = counts.tocsr()
+        self._digests.update({label: _digest(documents[label]) for label in changed})
+        self._compute()
+        return self
+
+    def refit(self, documents, m, labels=None):
+        """Follow a new clustering of the corpus the instance was fitted on.
+
+        Clusters whose text is already stored, under any label, keep their counts; the
+        other clusters are vectorized with ``update``. The result equals
+        ``fit(documents, m, labels)``. Falls back to ``fit`` if the instance is not
+        fitted or the vocabulary differs, i.e. the texts are not of the same corpus.
+
+        Args:
+            documents (list of str): One concatenated text per cluster.
+            m (int): Total number of documents.
+            labels (list, optional): Label of every cluster. Defaults to 0, 1, ...
+
+        Returns:
+            ClassTfidf: The updated instance.
+        """
+        labels = list(range(len(documents)) if labels is None else labels)
+        if self.counts is None:
+            return self.fit(documents, m, labels)
+
+        digests = [_digest(text) for text in documents]
+        stored = {self._digests[label]: i for i, label in enumerate(self.labels)}
+        changed = {
+            label: text
+            for label, text, digest in zip(labels, documents, digests)
+            if digest not in stored
+        }
+        analyzer = self.count.build_analyzer()
+        vocabulary = self.count.vocabulary_
+        if any(
+            token not in vocabulary
+            for text in changed.values()
+            for token in analyzer(text)
+        ):
+            return self.fit(documents, m, labels)
+
+        # the rows of changed clusters are placeholders until ``update`` overwrites them
+        self.counts = self.counts[[stored.get(digest, 0) for digest in digests]]
+        self.labels = labels
+        self._digests = dict(zip(labels, digests))
+        if changed:
+            logger.debug(f"Re-vectorizing {len(changed)} of {len(labels)} clusters")
+            self.update(changed, m)
+        else:
+            self.m = m
+            self._compute()
+        if np.any(np.asarray(self.counts.sum(axis=0)).ravel() == 0):
+            return self.fit(documents, m, labels)
+        return self
+
+    def _compute(self):
+        words_per_cluster = np.asarray(self.counts.sum(axis=1)).ravel()
+        totals = np.asarray(self.counts.sum(axis=0)).ravel()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse_words = np.where(
+                words_per_cluster > 0, 1.0 / words_per_cluster, 0.0
+            )
+            idf = np.where(totals > 0, np.log(self.m / totals), 0.0)
+        if np.any(words_per_cluster == 0):
+            logger.warning("NaNs or inf in tf matrix")
+        self.tf_idf = (sp.diags(inverse_words) @ self.counts @ sp.diags(idf)).tocsr()
+
+    def get_feature_names_out(self):
+        """Vocabulary of the vectorizer."""
+        return self.count.get_feature_names_out()
+
+    def top_words(self, n=100):
+        """The ``n`` words with the highest c-TF-IDF of every cluster.
+
+        Args:
+            n (int, optional): Number of words per cluster. Defaults to 100.
+
+        Returns:
+            dict: List of (word, c-TF-IDF) tuples by cluster label, in descending order.
+        """
+        return _topic_dict(self.tf_idf, self.get_feature_names_out(), self.labels, n)
+
+
+def _topic_dict(tf_idf, words, labels, n):
+    top = _top_k_per_row(tf_idf, n)
+    topics = {}
+    for i, label in enumerate(labels):
+        scores = tf_idf[i, top[i]].toarray().ravel()
+        topics[label] = [(words[j], score) for j, score in zip(top[i], scores)]
+    return topics
+
+
+def c_tf_idf(documents, m, ngram_range=(1, 1), sparse=False, engine=None):
     """class based tf_idf retrieval from cluster of documents
 
+    The counts and c-TF-IDF are computed as sparse matrices, see ``ClassTfidf``.
+
     Args:
         documents (_type_): _description_
         m (_type_): _description_
         ngram_range (tuple, optional): _description_. Defaults to (1, 1).
+        sparse (bool, optional): Whether to return the c-TF-IDF as a CSR matrix instead
+            of a dense array. Defaults to False.
+        engine (ClassTfidf, optional): Instance to reuse, e.g. from the previous fit of a
+            model on the same corpus. Only the clusters whose text changed are vectorized
+            again, see ``ClassTfidf.refit``; its own n-gram range is used. Defaults to a
+            new instance.
 
     Returns:
         _type_: _description_
     """
-    count = CountVectorizer(ngram_range=ngram_range, stop_words="english").fit(
-        documents
-    )
-    t = count.transform(documents).toarray()
-    w = t.sum(axis=1)
-
-    # Suppress divide by zero warning
-    with np.errstate(divide="ignore", invalid="ignore"):
-        tf = np.divide(t.T, w)
-        if np.any(np.isnan(tf)) or np.any(np.isinf(tf)):
-            logger.warning("NaNs or inf in tf matrix")
-            tf[~np.isfinite(tf)] = 0
-
-    sum_t = t.sum(axis=0)
-    idf = np.log(np.divide(m, sum_t)).reshape(-1, 1)
-    tf_idf = np.multiply(tf, idf)
-
-    return tf_idf, count
+    if engine is None:
+        engine = ClassTfidf(ngram_range=ngram_range).fit(documents, m)
+    else:
+        engine.refit(documents, m)
+    tf_idf = engine.tf_idf.T.tocsr()
+    if not sparse:
+        tf_idf = tf_idf.toarray()
+    return tf_idf, engine.count
 
 
 def extract_tfidf_topics(tf_idf, count, docs_per_topic, n=100):
     """class based tf_idf retrieval from cluster of documents
 
+    The top words are selected on the stored entries of a CSR matrix, as returned by
+    ``c_tf_idf(..., sparse=True)``; dense arrays are converted first.
+
     Args:
         tf_idf (_type_): _description_
         count (_type_): _description_
@@ -48,14 +280,11 @@ def extract_tfidf_topics(tf_idf, count, docs_per_topic, n=100):
     """
     words = count.get_feature_names_out()
     labels = list(docs_per_topic.predictions)
-    tf_idf_transposed = tf_idf.T
-    indices = tf_idf_transposed.argsort()[:, -n:]
-    top_n_words = {
-        label: [((words[j]), (tf_idf_transposed[i][j])) for j in indices[i]][::-1]
-        for i, label in enumerate(labels)
-    }
-
-    return top_n_words
+    if sp.issparse(tf_idf):
+        tf_idf_transposed = tf_idf.T.tocsr()
+    else:
+        tf_idf_transposed = sp.csr_matrix(tf_idf.T)
+    return _topic_dict(tf_idf_transposed, words, labels, n)
 
 
 def extract_topic_sizes(df):
@@ -1,16 +1,15 @@
 import re
-from itertools import compress
 
 import numpy as np
-import pandas as pd
-from gensim.models.keyedvectors import Word2VecKeyedVectors
 from nltk import pos_tag
 from nltk.corpus import brown as nltk_words
 from nltk.corpus import words as eng_dict
-from numpy.linalg import norm
-# from ..utils.dataset import TMDataset : removed to avoid circular import
 
+# from ..utils.dataset import TMDataset : removed to avoid circular import
 from ._embedder import BaseEmbedder
+from .word_bank import WordBank
+
+STREAM_DATASETS = ["20NewsGroups", "Spotify", "BBC_News", "Poliblogs"]
 
 
 class TopicExtractor:
@@ -22,6 +21,8 @@ class TopicExtractor:
         topic_assignments (list): List of topic assignments
         n_topics (int): Number of topics
         embedding_model (str): Path to the embedding model
+        embedding_model_name (str, optional): Name of the embedding model, used to key the word bank
+        word_bank_dir (str, optional): Directory of the persistent word banks. If None, the word bank is built on every call
 
     """
 
@@ -31,129 +32,129 @@ class TopicExtractor:
         topic_assignments,
         n_topics,
         embedding_model,
+        embedding_model_name=None,
+        word_bank_dir=None,
     ):
         self.dataset = dataset
         self.topic_assignments = topic_assignments
         self.embedder = BaseEmbedder(embedding_model)
         self.n_topics = n_topics
+        self.embedding_model_name = embedding_model_name
+        self.word_bank_dir = word_bank_dir
 
-    def _noun_extractor_haystack(self, embeddings, n, corpus="brown", only_nouns=True):
-        """
-        Extracts the topics most probable words, which are the words nearest to the topics centroid.
-        We extract all nouns from the corpus and the brown corpus. Afterwards we compute the cosine similarity between every word and every centroid.
-
-        Note, that here we did not use the  sklearn.metrics.pairwise cosine_similarity function due to a faster computation when using numpy.
-        Hecen we used:
-            np.inner(centroids, nouns) / np.multiply.outer(
-                norm(centroids, axis=1), norm(nouns, axis=1)
-            )
-
-        Args:
-            embeddings (_type_): _document embeddings to compute centroid of the topic
-            n (_type_): n_top number of words per topic
-            corpus (str, optional): corpus to be used for word extraction. Defaults to "brown". One of "brown", "stream", "words".
-
-        Returns:
-            dict: extracted topics
-        """
+    @staticmethod
+    def _clean_words(word_list):
+        word_list = [word.lower().strip() for word in word_list]
+        return [re.sub(r"[^a-zA-Z0-9]+\s*", "", word) for word in word_list]
 
+    @staticmethod
+    def _filter_pos(word_list, only_nouns):
         # define whether word is a noun
         def is_noun(pos):
             return pos[:2] == "NN"
 
-        # not used for now
-        # DATADIR = "../datasets/preprocessed_datasets"
+        return [
+            word
+            for (word, pos) in pos_tag(word_list)
+            if word and (is_noun(pos) or not only_nouns)
+        ]
+
+    def _corpus_words(self, corpus, only_nouns):
+        """
+        Read, clean and POS-filter the words of an expansion corpus.
 
-        # extend the corpus
+        For the "stream" corpus these are the words of the STREAM datasets, without
+        the vocabulary of the dataset the topics are extracted from.
+        """
         if corpus == "brown":
             word_list = nltk_words.words()
-            word_list = [word.lower().strip() for word in word_list]
-            word_list = [re.sub(r"[^a-zA-Z0-9]+\s*", "", word) for word in word_list]
         elif corpus == "words":
             word_list = eng_dict.words()
-            word_list = [word.lower().strip() for word in word_list]
-            word_list = [re.sub(r"[^a-zA-Z0-9]+\s*", "", word) for word in word_list]
         elif corpus == "stream":
+            from ..utils.dataset import TMDataset
+
             data = TMDataset()
-            data.fetch_dataset("20NewsGroups")
-            word_list = data.get_vocabulary()
-            data.fetch_dataset("Spotify")
-            word_list += data.get_vocabulary()
-            data.fetch_dataset("BBC_News")
-            word_list += data.get_vocabulary()
-            data.fetch_dataset("Poliblogs")
-            word_list += data.get_vocabulary()
+            word_list = []
+            for name in STREAM_DATASETS:
+                data.fetch_dataset(name)
+                word_list += data.get_vocabulary()
 
             # include reuters etc datasets
             # data.load_custom_dataset_from_folder(DATADIR + "/GN")
             # word_list += data.get_vocabulary()
-
-            word_list += self.dataset.get_vocabulary()
-
-            word_list = [word.lower().strip() for word in word_list]
-            word_list = [re.sub(r"[^a-zA-Z0-9]+\s*", "", word) for word in word_list]
         else:
             raise ValueError(
                 "There are no words to be extracted for the Topics: Please specify a corpus"
             )
+        return self._filter_pos(self._clean_words(word_list), only_nouns)
 
-        if only_nouns:
-            word_list = [word for (word, pos) in pos_tag(word_list) if is_noun(pos)]
-        else:
-            word_list = [word for (word, pos) in pos_tag(word_list)]
-
-        word_list = list(set(word_list))
-
-        # embedd the noun_corpus
-        nouns = self.embedder.create_word_embeddings(word_list)
+    def word_bank(self, corpus="brown", only_nouns=True):
+        """
+        Get the embedded word bank of an expansion corpus.
 
-        if isinstance(self.embedder.embedder, Word2VecKeyedVectors):
-            word_list = list(compress(word_list, list(~pd.isnull(nouns))))
-            nouns = nouns[~pd.isnull(nouns)]
-            try:
-                nouns.shape[1]
-            except IndexError:
-                nouns = np.stack([noun for noun in nouns])
+        If ``word_bank_dir`` and ``embedding_model_name`` are set, the bank is loaded
+        from (or, the first time, stored in) that directory.
 
-        mean_embeddings = []
+        Args:
+            corpus (str, optional): One of "brown", "stream", "words". Defaults to "brown".
+            only_nouns (bool, optional): Whether to only keep nouns. Defaults to True.
 
-        # create topic centroids
-        for t in range(self.n_topics):
-            weighted_topic = np.multiply(
-                np.array(self.topic_assignments[t])[:, np.newaxis], embeddings
+        Returns:
+            WordBank: Words of the corpus and their normalized embeddings.
+        """
+        if self.word_bank_dir is not None and self.embedding_model_name is not None:
+            bank = WordBank.load_or_build(
+                self.word_bank_dir,
+                corpus,
+                self.embedding_model_name,
+                only_nouns,
+                lambda: self._corpus_words(corpus, only_nouns),
+                self.embedder,
             )
-            mean_embedding = sum(weighted_topic) / len(embeddings)
-            mean_embeddings.append(mean_embedding)
+        else:
+            bank = WordBank.build(self._corpus_words(corpus, only_nouns), self.embedder)
 
-        topic_words = []
-        topic_word_scores = []
+        if corpus == "stream":
+            # the vocabulary of the current dataset is not part of the stored bank
+            dataset_words = self._filter_pos(
+                self._clean_words(self.dataset.get_vocabulary()), only_nouns
+            )
+            bank = bank.extend(dataset_words, self.embedder)
+        return bank
 
-        # compute cosine similarity between all nouns and the centroids
-        res = np.inner(mean_embeddings, nouns) / np.multiply.outer(
-            norm(mean_embeddings, axis=1), norm(nouns, axis=1)
-        )
+    def _noun_extractor_haystack(self, embeddings, n, corpus="brown", only_nouns=True):
+        """
+        Extracts the topics most probable words, which are the words nearest to the topics centroid.
+        We extract all nouns from the corpus and the brown corpus. Afterwards we compute the cosine similarity between every word and every centroid.
 
-        # get the top words according to the similarity
-        top_words = np.flip(np.argsort(res, axis=1), axis=1)
-        top_scores = np.flip(np.sort(res, axis=1), axis=1)
+        The words and their normalized embeddings come from a word bank (see ``word_bank``), so
+        the cosine similarities are a single matrix product, and only the top ``n`` words of
+        every topic are sorted.
 
-        # for cleaner visualization
-        for words, scores in zip(top_words, top_scores):
-            topic_words.append([word_list[i] for i in words[0:n]])
-            topic_word_scores.append(scores[0:n])
+        Args:
+            embeddings (_type_): _document embeddings to compute centroid of the topic
+            n (_type_): n_top number of words per topic
+            corpus (str, optional): corpus to be used for word extraction. Defaults to "brown". One of "brown", "stream", "words".
 
-        topic_words = np.array(topic_words)
-        topic_word_scores = np.array(topic_word_scores)
+        Returns:
+            dict: extracted topics
+        """
+        bank = self.word_bank(corpus, only_nouns)
 
-        # return as dict of lists
-        topics = []
-        for i in range(len(topic_words)):
-            topics.append(list(zip(topic_words[i], topic_word_scores[i])))
+        # create topic centroids
+        weights = np.column_stack(
+            [np.asarray(self.topic_assignments[t]) for t in range(self.n_topics)]
+        )
+        mean_embeddings = list(weights.T @ np.asarray(embeddings) / len(embeddings))
 
-        topics_ = {}
+        # get the top words according to the cosine similarity
+        top_words, top_scores = bank.most_similar(np.array(mean_embeddings), n)
 
-        for i in range(len(topics)):
-            topics_[i] = topics[i]
+        # return as dict of lists
+        topics_ = {
+            i: [(bank.words[j], score) for j, score in zip(words, scores)]
+            for i, (words, scores) in enumerate(zip(top_words, top_scores))
+        }
 
         # return topics and centroid of topics
         return topics_, mean_embeddings
@@ -0,0 +1,259 @@
+import json
+import os
+import re
+
+import numpy as np
+from loguru import logger
+
+WORD_BANK_VERSION = 1
+
+
+def word_bank_key(corpus: str, model_name: str, only_nouns: bool) -> str:
+    """
+    Directory name of the word bank of a corpus and embedding model.
+    """
+    safe = [re.sub(r"[^A-Za-z0-9_.-]+", "_", name) for name in (corpus, model_name)]
+    return "__".join(safe + ["nouns" if only_nouns else "all"])
+
+
+class WordBank:
+    """
+    Deduplicated word list with L2-normalized embeddings of its words.
+
+    A word bank is stored as a directory with
+
+    - ``words.txt``: one word per line,
+    - ``embeddings.npy``: the float32 embedding matrix, one row per word,
+    - ``meta.json``: corpus, embedding model, POS filter and dimensions.
+
+    Loaded banks memory-map ``embeddings.npy``, so they are available in
+    milliseconds and shared between processes on the same node.
+
+    Parameters
+    ----------
+    words : list of str
+        The words of the bank.
+    embeddings : np.ndarray
+        L2-normalized embeddings of shape (n_words, dim).
+    """
+
+    def __init__(self, words, embeddings):
+        self.words = list(words)
+        self.embeddings = embeddings
+
+    def __len__(self):
+        return len(self.words)
+
+    @classmethod
+    def build(cls, words, embedder):
+        """
+        Embed a list of words.
+
+        Duplicates are removed, keeping the first occurrence. Words without an
+        embedding (zero vectors of the gensim backend) are dropped.
+
+        Parameters
+        ----------
+        words : list of str
+            Words of the bank.
+        embedder : BaseEmbedder
+            Embedder used for the words.
+
+        Returns
+        -------
+        WordBank
+            The word bank.
+        """
+        words = list(dict.fromkeys(words))
+        if not words:
+            return cls([], np.empty((0, 0), dtype=np.float32))
+        embeddings = np.asarray(
+            embedder.create_word_embeddings(words), dtype=np.float32
+        )
+        norms = np.linalg.norm(embeddings, axis=1)
+        known = norms > 0
+        embeddings = embeddings[known] / norms[known, np.newaxis]
+        words = [word for word, keep in zip(words, known) if keep]
+        return cls(words, embeddings)
+
+    def extend(self, words, embedder):
+        """
+        Add the words that are not in the bank yet.
+
+        The result is held in memory.
+
+        Parameters
+        ----------
+        words : list of str
+            Words to add.
+        embedder : BaseEmbedder
+            Embedder used for the new words.
+
+        Returns
+        -------
+        WordBank
+            A bank with the words of this bank followed by the new words.
+        """
+        known = set(self.words)
+        extra = WordBank.build([word for word in words if word not in known], embedder)
+        if len(extra) == 0:
+            return self
+        if len(self) == 0:
+            return extra
+        return WordBank(
+            self.words + extra.words, np.vstack([self.embeddings, extra.embeddings])
+        )
+
+    def save(self, path: str, **meta):
+        """
+        Store the bank in a directory.
+
+        The files are written under temporary names and renamed, so concurrent
+        readers never see a partially written bank.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the bank.
+        **meta
+            Additional entries of ``meta.json``, e.g. the corpus name.
+        """
+        os.makedirs(path, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        with open(
+            os.path.join(path, "words.txt" + suffix), "w", encoding="utf-8"
+        ) as file:
+            file.write("\n".join(self.words))
+        np.save(
+            os.path.join(path, "embeddings" + suffix + ".npy"),
+            np.ascontiguousarray(self.embeddings, dtype=np.float32),
+        )
+        meta = dict(
+            meta,
+            version=WORD_BANK_VERSION,
+            n_words=len(self.words),
+            dim=int(self.embeddings.shape[1]) if len(self.words) else 0,
+        )
+        with open(
+            os.path.join(path, "meta.json" + suffix), "w", encoding="utf-8"
+        ) as file:
+            json.dump(meta, file)
+
+        os.replace(
+            os.path.join(path, "words.txt" + suffix), os.path.join(path, "words.txt")
+        )
+        os.replace(
+            os.path.join(path, "embeddings" + suffix + ".npy"),
+            os.path.join(path, "embeddings.npy"),
+        )
+        # the manifest is written last and marks the bank as complete
+        os.replace(
+            os.path.join(path, "meta.json" + suffix), os.path.join(path, "meta.json")
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Load a stored bank, memory-mapping its embeddings.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the bank.
+
+        Returns
+        -------
+        WordBank or None
+            The bank, or None if there is no complete bank in the directory.
+        """
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as file:
+            meta = json.load(file)
+        if meta.get("version") != WORD_BANK_VERSION:
+            return None
+        with open(os.path.join(path, "words.txt"), encoding="utf-8") as file:
+            words = file.read().split("\n") if meta["n_words"] else []
+        embeddings = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="r")
+        if len(words) != meta["n_words"] or embeddings.shape[0] != meta["n_words"]:
+            logger.warning(f"Ignoring inconsistent word bank in {path}.")
+            return None
+        return cls(words, embeddings)
+
+    @classmethod
+    def load_or_build(
+        cls, cache_dir, corpus, model_name, only_nouns, word_list_fn, embedder
+    ):
+        """
+        Load the bank of a corpus and embedding model, building and storing it if needed.
+
+        Parameters
+        ----------
+        cache_dir : str
+            Root directory of the word banks.
+        corpus : str
+            Name of the corpus.
+        model_name : str
+            Name of the embedding model.
+        only_nouns : bool
+            Whether the bank only holds nouns.
+        word_list_fn : callable
+            Function returning the (POS-filtered) words of the corpus. Only called if
+            the bank is not stored yet.
+        embedder : BaseEmbedder
+            Embedder used for the words.
+
+        Returns
+        -------
+        WordBank
+            The word bank.
+        """
+        path = os.path.join(
+            os.path.expanduser(os.fspath(cache_dir)),
+            word_bank_key(corpus, model_name, only_nouns),
+        )
+        bank = cls.load(path)
+        if bank is not None:
+            logger.info(f"--- Loaded word bank with {len(bank)} words from {path} ---")
+            return bank
+
+        logger.info(f"--- Building word bank for corpus '{corpus}' ---")
+        bank = cls.build(word_list_fn(), embedder)
+        bank.save(path, corpus=corpus, model_name=model_name, only_nouns=only_nouns)
+        return cls.load(path)
+
+    def most_similar(self, vectors, n):
+        """
+        Find the words with the highest cosine similarity to each vector.
+
+        Computes one matrix product with the normalized vectors and selects the top
+        ``n`` words with ``argpartition`` before sorting only those.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            Query vectors of shape (n_vectors, dim), e.g. topic centroids.
+        n : int
+            Number of words per vector.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Word indices and similarities of shape (n_vectors, n), in descending order
+            of similarity.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarities = (vectors / norms) @ np.asarray(self.embeddings).T
+
+        n = min(n, similarities.shape[1])
+        if n < similarities.shape[1]:
+            top = np.argpartition(-similarities, n - 1, axis=1)[:, :n]
+        else:
+            top = np.broadcast_to(np.arange(n), (similarities.shape[0], n))
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1, kind="stable")
+        indices = np.take_along_axis(top, order, axis=1)
+        return indices, np.take_along_axis(top_similarities, order, axis=1)
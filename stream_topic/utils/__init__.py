@@ -2,6 +2,9 @@ from .benchmarking import benchmarking
 from .cbc_utils import DocumentCoherence, get_top_tfidf_words_per_document
 from .dataset import TMDataset
 from .datamodule import TMDataModule
+from .performance import PerformanceProfile
+from .reduction_cache import ReductionCache
+from .topic_word_matrix import topic_dict_to_matrix
 
 __all__ = [
     "benchmarking",
@@ -9,4 +12,7 @@ __all__ = [
     "get_top_tfidf_words_per_document",
     "TMDataset",
     "TMDataModule",
+    "PerformanceProfile",
+    "ReductionCache",
+    "topic_dict_to_matrix",
 ]
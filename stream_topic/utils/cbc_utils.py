@@ -1,9 +1,13 @@
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from scipy.sparse import csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
 from tqdm import tqdm
 
+COHERENCE_BLOCK_SIZE = 1024
+NPMI_EPS = 1e-12
+
 
 def get_top_tfidf_words_per_document(corpus, n=10):
     """
@@ -15,17 +19,19 @@ def get_top_tfidf_words_per_document(corpus, n=10):
 
     Returns:
         list: A list of lists containing the top TF-IDF words for each document in the corpus.
+            Documents with fewer than ``n`` distinct words get all of their words.
     """
     vectorizer = TfidfVectorizer(stop_words="english")
-    X = vectorizer.fit_transform(corpus)
+    X = vectorizer.fit_transform(corpus).tocsr()
     feature_names = vectorizer.get_feature_names_out()
 
     top_words_per_document = []
-    for row in X:
-        sorted_indices = np.argsort(row.toarray()).flatten()[::-1]
-        top_n_indices = sorted_indices[:n]
-        top_words = [feature_names[i] for i in top_n_indices]
-        top_words_per_document.append(top_words)
+    for i in range(X.shape[0]):
+        # only the non-zero entries of a row can be among its top words
+        start, end = X.indptr[i], X.indptr[i + 1]
+        data, indices = X.data[start:end], X.indices[start:end]
+        top_n_indices = indices[np.argsort(-data, kind="stable")[:n]]
+        top_words_per_document.append([feature_names[j] for j in top_n_indices])
 
     return top_words_per_document
 
@@ -35,6 +41,17 @@ class DocumentCoherence:
     A class for calculating the coherence between documents based on their top words.
     This is achieved through the use of Normalized Pointwise Mutual Information (NPMI).
 
+    The coherence of two documents is the mean NPMI over all pairs of the words they share.
+    It is computed for all document pairs at once with sparse matrix products. The NPMI of
+    two words that never occur together only depends on their word probabilities,
+    ``(log(eps) - log(p_a) - log(p_b)) / -log(eps)``, so its sum over the shared words of
+    every document pair follows from the number of shared words and the sum of their log
+    probabilities. Only the word pairs that co-occur in a document need their own NPMI: with
+    ``Y`` the sparse indicator matrix of the co-occurring word pairs contained in every
+    document and ``w`` the difference of their NPMI to the expression above, ``Y diag(w) Y^T``
+    holds the rest of the sum. The word index and the co-occurrences are computed once and
+    can be reused for groups of documents (see ``calculate_sparse_coherence``).
+
     Attributes:
         documents (DataFrame): DataFrame containing documents and their top words.
         column (str): Column name in DataFrame that contains the top words for each document.
@@ -57,6 +74,8 @@ class DocumentCoherence:
         self.stopwords = set(stopwords) if stopwords else set()
         self.word_index = self._create_word_index()
         self.doc_word_matrix = self._create_doc_word_matrix()
+        self._co_occurrences = None
+        self._word_prob = None
 
     def _create_word_index(self):
         unique_words = set()
@@ -105,6 +124,213 @@ class DocumentCoherence:
 
         return npmi
 
+    def _calculate_pair_npmi(self, first, second):
+        """
+        Calculate the NPMI of the given word pairs from the document co-occurrences.
+
+        Parameters:
+            first (np.ndarray): Word indices of the first word of every pair.
+            second (np.ndarray): Word indices of the second word of every pair.
+
+        Returns:
+            np.ndarray: NPMI of every pair.
+        """
+        eps = NPMI_EPS
+        n_documents = self.doc_word_matrix.shape[0]
+        self._prepare_co_occurrences()
+
+        joint_prob = (
+            np.asarray(self._co_occurrences[first, second]).ravel() / n_documents
+        )
+        pmi = np.log(
+            (joint_prob + eps)
+            / (self._word_prob[first] * self._word_prob[second] + eps)
+        )
+        return pmi / -np.log(joint_prob + eps)
+
+    def _prepare_co_occurrences(self):
+        if self._co_occurrences is None:
+            n_documents = self.doc_word_matrix.shape[0]
+            self._co_occurrences = self._calculate_co_occurrences().tocsr()
+            self._co_occurrences.sort_indices()
+            self._word_prob = (
+                np.asarray(self.doc_word_matrix.sum(axis=0)).ravel() / n_documents
+            )
+
+    def _separable_npmi(self, first, second):
+        """
+        NPMI of word pairs that never occur together, up to ``eps`` in the word probabilities.
+        """
+        log_prob = np.log(self._word_prob)
+        return (np.log(NPMI_EPS) - log_prob[first] - log_prob[second]) / -np.log(NPMI_EPS)
+
+    def _pair_matrix(self, unit_word_matrix):
+        """
+        Build the sparse indicator matrix of the co-occurring (ordered) word pairs contained in
+        every unit.
+
+        Every unit takes the cheaper of two ways to find its pairs: checking all pairs of its
+        words against the co-occurrences, or following the rows of the co-occurrence matrix from
+        its words. Large units such as merged clusters thus cost the co-occurrences of their
+        words instead of the square of their number of words.
+
+        Parameters:
+            unit_word_matrix (csr_matrix): Binary matrix of shape (n_units, n_words).
+
+        Returns:
+            tuple: The pair matrix of shape (n_units, n_pairs) and the difference of the NPMI of
+            every pair to ``_separable_npmi``.
+        """
+        self._prepare_co_occurrences()
+        co_occurrences = self._co_occurrences
+        n_words = unit_word_matrix.shape[1]
+        degrees = np.diff(co_occurrences.indptr)
+        co_occurrence_keys = (
+            np.repeat(np.arange(n_words, dtype=np.int64), degrees) * n_words
+            + co_occurrences.indices
+        )
+
+        rows, pair_ids = [], []
+        for i in range(unit_word_matrix.shape[0]):
+            words = np.sort(
+                unit_word_matrix.indices[
+                    unit_word_matrix.indptr[i]: unit_word_matrix.indptr[i + 1]
+                ]
+            ).astype(np.int64)
+            if len(words) == 0:
+                continue
+            if len(words) ** 2 <= degrees[words].sum():
+                keys = (words[:, None] * n_words + words[None, :]).ravel()
+                candidates, known = keys, co_occurrence_keys
+            else:
+                # the co-occurring words of every word, kept if they belong to the unit
+                starts = co_occurrences.indptr[words]
+                lengths = degrees[words]
+                offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+                second = co_occurrences.indices[offsets + np.arange(lengths.sum())]
+                keys = np.repeat(words, lengths) * n_words + second
+                candidates, known = second, words
+            positions = np.minimum(np.searchsorted(known, candidates), len(known) - 1)
+            keys = keys[known[positions] == candidates]
+            pair_ids.append(keys)
+            rows.append(np.full(len(keys), i, dtype=np.int64))
+
+        pair_ids = np.concatenate(pair_ids) if pair_ids else np.empty(0, np.int64)
+        rows = np.concatenate(rows) if rows else np.empty(0, np.int64)
+        unique_pairs, columns = np.unique(pair_ids, return_inverse=True)
+
+        pair_matrix = csr_matrix(
+            (np.ones(len(rows)), (rows, columns.ravel())),
+            shape=(unit_word_matrix.shape[0], len(unique_pairs)),
+        )
+        first, second = unique_pairs // n_words, unique_pairs % n_words
+        npmi = self._calculate_pair_npmi(first, second) - self._separable_npmi(
+            first, second
+        )
+        return pair_matrix, npmi
+
+    def _mean_npmi(self, terms, start, stop):
+        """
+        Mean NPMI over all pairs of the shared words of the units ``start:stop`` with all units.
+
+        Parameters:
+            terms (tuple): The matrices returned by ``_coherence_terms``.
+            start (int): First unit of the block.
+            stop (int): End of the block.
+
+        Returns:
+            csr_matrix: Matrix of shape (stop - start, n_units) with an entry for every pair of
+            units that share words.
+        """
+        units, unit_word_matrix_t, weighted_units, weighted_pairs, pair_matrix_t = terms
+        # the number of shared words and the sum of their log probabilities
+        shared = (units[start:stop] @ unit_word_matrix_t).tocsr()
+        log_prob_sums = (weighted_units[start:stop] @ unit_word_matrix_t).tocsr()
+
+        # the separable NPMI summed over all pairs of shared words, plus the co-occurring pairs
+        sums = shared.multiply(log_prob_sums) * (2.0 / np.log(NPMI_EPS)) - shared.power(2)
+        sums = sums + weighted_pairs[start:stop] @ pair_matrix_t
+
+        return sums.multiply(shared.power(-2)).tocsr()
+
+    def _coherence_terms(self, unit_word_matrix):
+        unit_word_matrix = unit_word_matrix.astype(float).tocsr()
+        pair_matrix, npmi = self._pair_matrix(unit_word_matrix)
+        weighted_units = unit_word_matrix.multiply(
+            np.log(self._word_prob)[np.newaxis, :]
+        )
+        return (
+            unit_word_matrix,
+            unit_word_matrix.T.tocsr(),
+            weighted_units.tocsr(),
+            pair_matrix.multiply(npmi[np.newaxis, :]).tocsr(),
+            pair_matrix.T.tocsr(),
+        )
+
+    def _unit_word_matrix(self, membership=None):
+        if membership is None:
+            return self.doc_word_matrix
+        unit_word_matrix = (membership @ self.doc_word_matrix).tocsr()
+        unit_word_matrix.data[:] = 1
+        return unit_word_matrix
+
+    def calculate_sparse_coherence(
+        self,
+        membership=None,
+        n_neighbors=None,
+        threshold=None,
+        block_size=COHERENCE_BLOCK_SIZE,
+    ):
+        """
+        Calculate a sparse, symmetric coherence matrix between documents or groups of documents.
+
+        Parameters:
+            membership (csr_matrix, optional): Binary matrix of shape (n_units, n_documents) assigning
+                documents to units, e.g. clusters of documents. The words of a unit are the union of
+                the words of its documents. Defaults to one unit per document.
+            n_neighbors (int, optional): Number of most coherent neighbours kept per unit. Defaults
+                to keeping all pairs.
+            threshold (float, optional): Only pairs with a coherence above this value are kept.
+                Defaults to keeping all pairs with shared words.
+            block_size (int, optional): Number of units whose coherences are computed at once.
+
+        Returns:
+            csr_matrix: Matrix of shape (n_units, n_units) with the coherence of the kept pairs
+            and an empty diagonal.
+        """
+        unit_word_matrix = self._unit_word_matrix(membership)
+        n_units = unit_word_matrix.shape[0]
+        terms = self._coherence_terms(unit_word_matrix)
+
+        blocks = []
+        for start in tqdm(range(0, n_units, block_size), desc="Document coherence"):
+            stop = min(start + block_size, n_units)
+            coherence = self._mean_npmi(terms, start, stop).tocoo()
+            keep = (coherence.row + start != coherence.col) & (coherence.data != 0)
+            if threshold is not None:
+                keep &= coherence.data > threshold
+            row, col, data = coherence.row[keep], coherence.col[keep], coherence.data[keep]
+
+            if n_neighbors is not None:
+                order = np.lexsort((-data, row))
+                row, col, data = row[order], col[order], data[order]
+                row_start = np.searchsorted(row, np.arange(stop - start))
+                rank = np.arange(len(row)) - row_start[row]
+                keep = rank < n_neighbors
+                row, col, data = row[keep], col[keep], data[keep]
+
+            blocks.append(
+                csr_matrix((data, (row, col)), shape=(stop - start, n_units))
+            )
+
+        adjacency = sp.vstack(blocks, format="csr") if blocks else csr_matrix(
+            (0, 0)
+        )
+        if n_neighbors is not None:
+            # keep a pair if it is among the top neighbours of either unit
+            adjacency = adjacency.maximum(adjacency.T).tocsr()
+        return adjacency
+
     def calculate_document_coherence(self):
         """
         Calculate document coherence scores based on NP (Normalized Pointwise) Mutual Information (NPMI).
@@ -113,31 +339,17 @@ class DocumentCoherence:
             pd.DataFrame: A DataFrame containing coherence scores between each pair of documents.
         """
         n_documents = self.doc_word_matrix.shape[0]
-        co_occurrences = self._calculate_co_occurrences()
-        npmi_matrix = self._calculate_npmi(co_occurrences, n_documents)
+        coherence = self._mean_npmi(
+            self._coherence_terms(self.doc_word_matrix), 0, n_documents
+        ).tocoo()
 
-        # Initialize DataFrame for coherence scores
-        coherence_scores = pd.DataFrame(
-            np.nan, index=self.documents.index, columns=self.documents.index
-        )
+        # pairs without shared words have no coherence
+        scores = np.full((n_documents, n_documents), np.nan)
+        scores[coherence.row, coherence.col] = coherence.data
+        np.fill_diagonal(scores, np.nan)
 
-        # Precompute nonzero indices for each document
-        doc_nonzero_indices = [
-            set(self.doc_word_matrix[i, :].nonzero()[1]) for i in range(n_documents)
-        ]
-
-        for i in tqdm(range(n_documents)):
-            for j in range(
-                i + 1, n_documents
-            ):  # Avoid redundant calculations by only doing one half of the matrix
-                combined_indices = doc_nonzero_indices[i] & doc_nonzero_indices[j]
-                if combined_indices:
-                    selected_npmi_values = npmi_matrix[list(combined_indices)][
-                        :, list(combined_indices)
-                    ]
-                    coherence_score = np.nanmean(selected_npmi_values)
-                    coherence_scores.iat[i, j] = coherence_score
-                    # Symmetric matrix
-                    coherence_scores.iat[j, i] = coherence_score
-
-        return coherence_scores
+        return pd.DataFrame(
+            scores,
+            index=self.documents.index,
+            columns=self.documents.index,
+        )
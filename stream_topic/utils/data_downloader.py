@@ -3,10 +3,13 @@ import os
 import pickle
 from urllib.parse import urljoin
 
+import numpy as np
 import pandas as pd
 import requests
 from loguru import logger
 
+from .embedding_store import EmbeddingStore
+
 PACKAGE_NAME = "stream_topic"
 
 
@@ -98,16 +101,15 @@ class DataDownloader:
             )
             return url_exists(git_pkl_path)
 
-        elif path is None:
-            path = self.get_package_embeddings_path(self.name)
-            embeddings_file = (
-                urljoin(path, file_name)
-                if file_name
-                else os.path.join(
-                    path, f"{self.name}_embeddings_{embedding_model_name}.pkl"
-                )
+        else:
+            if path is None:
+                path = self.get_package_embeddings_path(self.name)
+            embeddings_file = self._embeddings_file(
+                embedding_model_name, path, file_name
+            )
+            return EmbeddingStore(embeddings_file).exists() or os.path.exists(
+                embeddings_file
             )
-            return os.path.exists(embeddings_file)
 
     def save_embeddings(
         self, embeddings, embedding_model_name, path=None, file_name=None
@@ -115,6 +117,10 @@ class DataDownloader:
         """
         Save embeddings for the dataset.
 
+        Document embedding matrices are written as a memory-mappable ``.npy`` file
+        with a JSON manifest (see ``EmbeddingStore``). Other objects, such as word
+        embedding dictionaries, are pickled.
+
         Parameters
         ----------
         embeddings : np.ndarray
@@ -136,18 +142,18 @@ class DataDownloader:
                 os.makedirs(path)
                 logger.info(f"Created directory: {path}")
 
-            embeddings_file = (
-                os.path.join(path, file_name)
-                if file_name
-                else os.path.join(
-                    path, f"{self.name}_embeddings_{embedding_model_name}.pkl"
-                )
+            embeddings_file = self._embeddings_file(
+                embedding_model_name, path, file_name
             )
 
-            logger.info(f"Embeddings file path: {embeddings_file}")
-
-            with open(embeddings_file, "wb") as file:
-                pickle.dump(embeddings, file)
+            if isinstance(embeddings, np.ndarray) and embeddings.ndim == 2:
+                store = EmbeddingStore(embeddings_file)
+                logger.info(f"Embeddings file path: {store.array_path}")
+                store.save(embeddings, embedding_model_name)
+            else:
+                logger.info(f"Embeddings file path: {embeddings_file}")
+                with open(embeddings_file, "wb") as file:
+                    pickle.dump(embeddings, file)
 
             logger.info("Embeddings saved successfully.")
 
@@ -162,6 +168,10 @@ class DataDownloader:
         """
         Get embeddings for the dataset.
 
+        Embeddings stored with ``save_embeddings`` are opened as a read-only memory
+        map, so processes loading the same embeddings share memory. Legacy pickled
+        embedding matrices are migrated to this format on first load.
+
         Parameters
         ----------
         embedding_model_name : str
@@ -192,18 +202,41 @@ class DataDownloader:
         if self.embeddings is None:
             if path is None:
                 path = self.get_package_embeddings_path(self.name)
-            embeddings_file = (
-                os.path.join(path, file_name)
-                if file_name
-                else os.path.join(
-                    path, f"{self.name}_embeddings_{embedding_model_name}.pkl"
-                )
+            embeddings_file = self._embeddings_file(
+                embedding_model_name, path, file_name
             )
-            with open(embeddings_file, "rb") as file:
-                self.embeddings = pickle.load(file)
+            store = EmbeddingStore(embeddings_file)
+            if store.exists():
+                self.embeddings = store.load()
+            else:
+                self.embeddings = store.migrate_pickle(
+                    embeddings_file, embedding_model_name
+                )
 
         return self.embeddings
 
+    def _embeddings_file(self, embedding_model_name, path, file_name=None):
+        """
+        Get the path of the (legacy pickle) embeddings file.
+
+        Parameters
+        ----------
+        embedding_model_name : str
+            Name of the embedding model.
+        path : str
+            Directory of the embeddings.
+        file_name : str, optional
+            File name for the embeddings.
+
+        Returns
+        -------
+        str
+            Path to the embeddings file.
+        """
+        if file_name:
+            return os.path.join(path, file_name)
+        return os.path.join(path, f"{self.name}_embeddings_{embedding_model_name}.pkl")
+
     def get_package_embeddings_path(self, name):
         """
         Get the path to the package embeddings.
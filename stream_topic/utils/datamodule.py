@@ -1,5 +1,33 @@
 import lightning as pl
+import scipy.sparse as sp
+import torch
 from torch.utils.data import DataLoader
+from torch.utils.data.dataloader import default_collate
+
+
+def sparse_collate(batch):
+    """
+    Collate a list of samples into a batch, densifying sparse entries.
+
+    Sparse rows (e.g. the BOW or TF-IDF representation of a document) are stacked
+    into one sparse matrix and only then converted to a dense tensor, so a dense
+    matrix only ever exists for a single mini-batch. All other entries are collated
+    with PyTorch's default collate function.
+
+    Args:
+        batch (list of dict): Samples returned by the dataset.
+
+    Returns:
+        dict: The collated batch.
+    """
+    collated = {}
+    for key in batch[0]:
+        values = [sample[key] for sample in batch]
+        if sp.issparse(values[0]):
+            collated[key] = torch.from_numpy(sp.vstack(values, format="csr").toarray())
+        else:
+            collated[key] = default_collate(values)
+    return collated
 
 
 class TMDataModule(pl.LightningDataModule):
@@ -26,6 +54,9 @@ class TMDataModule(pl.LightningDataModule):
             Random seed for reproducibility in data splitting.
         regression: bool, optional
             Whether the problem is regression (True) or classification (False).
+        **dataloader_kwargs:
+            Additional arguments passed to the DataLoaders. Unless a ``collate_fn`` is given,
+            batches are collated with ``sparse_collate``.
     """
 
     def __init__(
@@ -61,6 +92,7 @@ class TMDataModule(pl.LightningDataModule):
         # Initialize placeholders for data
         self.X_train = None
         self.X_val = None
+        dataloader_kwargs.setdefault("collate_fn", sparse_collate)
         self.dataloader_kwargs = dataloader_kwargs
 
     def preprocess_data(
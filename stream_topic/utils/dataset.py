@@ -7,10 +7,10 @@ import gensim.downloader as api
 import numpy as np
 import pandas as pd
 from loguru import logger
-from sentence_transformers import SentenceTransformer
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from torch.utils.data import Dataset, random_split
 
+from ..commons.embedding_registry import get_embedding_model
 from ..commons.load_steps import load_model_preprocessing_steps
 # from ..preprocessor import TextPreprocessor :  moved to preprocessor function
 from .data_downloader import DataDownloader, get_data_home
@@ -622,7 +622,9 @@ class TMDataset(Dataset, DataDownloader):
         Returns
         -------
         dict
-            Sample at the given index.
+            Sample at the given index. BOW and TF-IDF rows are returned as sparse
+            matrices of shape (1, vocab_size) and are densified per batch by
+            ``TMDataModule``.
         """
         item = {"text": self.texts[idx]}
         if self.labels[idx] is not None:
@@ -630,11 +632,11 @@ class TMDataset(Dataset, DataDownloader):
         if self.embeddings is not None:
             item["embedding"] = self.embeddings[idx]
         if self.bow is not None:
-            item["bow"] = self.bow[idx]
+            item["bow"] = self.bow[[idx]]
         if self.tokens is not None:
             item["tokens"] = self.tokens[idx]
         if self.tfidf is not None:
-            item["tfidf"] = self.tfidf[idx]
+            item["tfidf"] = self.tfidf[[idx]]
         return item
 
     def get_corpus(self):
@@ -729,8 +731,7 @@ class TMDataset(Dataset, DataDownloader):
         """
         corpus = [" ".join(tokens) for tokens in self.get_corpus()]
         vectorizer = CountVectorizer(**kwargs)
-        self.bow = vectorizer.fit_transform(
-            corpus).toarray().astype(np.float32)
+        self.bow = vectorizer.fit_transform(corpus).astype(np.float32).tocsr()
         return self.bow, vectorizer.get_feature_names_out()
 
     def get_tfidf(self, **kwargs):
@@ -751,7 +752,7 @@ class TMDataset(Dataset, DataDownloader):
         """
         corpus = [" ".join(tokens) for tokens in self.get_corpus()]
         vectorizer = TfidfVectorizer(**kwargs)
-        self.tfidf = vectorizer.fit_transform(corpus).toarray()
+        self.tfidf = vectorizer.fit_transform(corpus).tocsr()
         return self.tfidf, vectorizer.get_feature_names_out()
 
     def has_word_embeddings(self, model_name):
@@ -807,7 +808,7 @@ class TMDataset(Dataset, DataDownloader):
                           for word in vocabulary if word in model}
 
         if model_name == "paraphrase-MiniLM-L3-v2":
-            model = SentenceTransformer(model_name)
+            model = get_embedding_model(model_name)
             vocabulary = list(vocabulary)
             embeddings = model.encode(
                 vocabulary, convert_to_tensor=True, show_progress_bar=True
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+from loguru import logger
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_BYTES = 64 * 2**20
+
+
+def content_hash(embeddings: np.ndarray) -> str:
+    """
+    Compute the SHA-256 hash of the raw bytes of an embedding matrix.
+
+    The matrix is hashed in chunks of rows, so memory-mapped arrays are never
+    loaded into memory as a whole.
+
+    Parameters
+    ----------
+    embeddings : np.ndarray
+        Two-dimensional embedding matrix.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    row_bytes = max(embeddings.shape[1] * embeddings.dtype.itemsize, 1)
+    rows_per_chunk = max(HASH_CHUNK_BYTES // row_bytes, 1)
+    for start in range(0, embeddings.shape[0], rows_per_chunk):
+        chunk = np.ascontiguousarray(embeddings[start : start + rows_per_chunk])
+        digest.update(chunk.tobytes())
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Document embeddings stored as a ``.npy`` file with a JSON manifest.
+
+    The array is opened with ``np.load(mmap_mode="r")``, so processes on the same
+    node that load the same store share the underlying pages instead of each
+    holding a private copy. The manifest ``<name>.json`` next to ``<name>.npy``
+    records the model name, embedding dimension, dtype, number of documents and
+    a content hash of the array.
+
+    Parameters
+    ----------
+    path : str
+        Path of the store. Any extension (e.g. a legacy ``.pkl``) is replaced by
+        ``.npy`` for the array and ``.json`` for the manifest.
+
+    Examples
+    --------
+    >>> store = EmbeddingStore("embeddings/20NewsGroup_embeddings_all-MiniLM-L6-v2")
+    >>> store.save(embeddings, "all-MiniLM-L6-v2")
+    >>> embeddings = store.load()  # read-only memory map
+    """
+
+    def __init__(self, path: str):
+        stem = os.path.splitext(os.fspath(path))[0]
+        self.array_path = stem + ".npy"
+        self.manifest_path = stem + ".json"
+
+    def exists(self) -> bool:
+        """
+        Check whether both the array and its manifest exist.
+        """
+        return os.path.exists(self.array_path) and os.path.exists(self.manifest_path)
+
+    def read_manifest(self) -> dict:
+        """
+        Read the manifest of the store.
+
+        Returns
+        -------
+        dict
+            The manifest.
+        """
+        with open(self.manifest_path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def save(self, embeddings: np.ndarray, model_name: str) -> dict:
+        """
+        Write the embeddings and their manifest.
+
+        Both files are written to temporary files first and then moved into
+        place, so readers never observe a partially written store.
+
+        Parameters
+        ----------
+        embeddings : np.ndarray
+            Array of shape (n_documents, dim).
+        model_name : str
+            Name of the model that produced the embeddings.
+
+        Returns
+        -------
+        dict
+            The manifest.
+        """
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim != 2:
+            raise ValueError(
+                f"Expected a 2-dimensional embedding matrix, got shape {embeddings.shape}."
+            )
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "model_name": model_name,
+            "n_documents": int(embeddings.shape[0]),
+            "dim": int(embeddings.shape[1]),
+            "dtype": embeddings.dtype.str,
+            "content_hash": content_hash(embeddings),
+        }
+
+        directory = os.path.dirname(self.array_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_array_path = f"{self.array_path}.{os.getpid()}.tmp"
+        with open(tmp_array_path, "wb") as file:
+            np.save(file, embeddings)
+        os.replace(tmp_array_path, self.array_path)
+
+        tmp_manifest_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_manifest_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(tmp_manifest_path, self.manifest_path)
+
+        return manifest
+
+    def load(self, mmap: bool = True, verify_hash: bool = False) -> np.ndarray:
+        """
+        Load the embeddings.
+
+        Parameters
+        ----------
+        mmap : bool, optional
+            Whether to open the array as a read-only memory map (default is True).
+        verify_hash : bool, optional
+            Whether to recompute the content hash and compare it with the manifest
+            (default is False).
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_documents, dim).
+
+        Raises
+        ------
+        ValueError
+            If the array does not match its manifest.
+        """
+        manifest = self.read_manifest()
+        embeddings = np.load(self.array_path, mmap_mode="r" if mmap else None)
+
+        expected_shape = (manifest["n_documents"], manifest["dim"])
+        if (
+            embeddings.shape != expected_shape
+            or embeddings.dtype.str != manifest["dtype"]
+        ):
+            raise ValueError(
+                f"Embedding store {self.array_path} does not match its manifest: "
+                f"found {embeddings.shape} {embeddings.dtype.str}, "
+                f"expected {expected_shape} {manifest['dtype']}."
+            )
+        if verify_hash and content_hash(embeddings) != manifest["content_hash"]:
+            raise ValueError(
+                f"Content hash of {self.array_path} does not match its manifest."
+            )
+        return embeddings
+
+    def migrate_pickle(self, pickle_path: str, model_name: str):
+        """
+        Convert a legacy pickled embedding matrix into this store.
+
+        Parameters
+        ----------
+        pickle_path : str
+            Path of the ``.pkl`` file.
+        model_name : str
+            Name of the model that produced the embeddings.
+
+        Returns
+        -------
+        object
+            The loaded store if the pickle contained a 2-dimensional array,
+            otherwise the unpickled object, which is left as it is.
+        """
+        with open(pickle_path, "rb") as file:
+            embeddings = pickle.load(file)
+
+        if not (isinstance(embeddings, np.ndarray) and embeddings.ndim == 2):
+            return embeddings
+
+        logger.info(f"Migrating pickled embeddings {pickle_path} to {self.array_path}")
+        try:
+            self.save(embeddings, model_name)
+        except OSError as e:
+            logger.warning(f"Could not migrate embeddings: {e}")
+            return embeddings
+        return self.load()
@@ -0,0 +1,203 @@
+import functools
+import os
+
+import torch
+from loguru import logger
+
+
+def _limit_worker_threads(worker_id, num_threads=1):
+    """
+    Limit the intra-op threads of a dataloader worker, so the workers do not compete
+    with the training process for the cores.
+    """
+    torch.set_num_threads(num_threads)
+
+
+class PerformanceProfile:
+    """
+    Throughput settings for training the neural topic models.
+
+    A profile bundles the options that trade memory and numerical precision for speed:
+    mixed precision, compiling the inner ``nn.Module``, the number of intra- and
+    inter-op threads and the dataloader workers. The default profile keeps the
+    behaviour of a plain ``pl.Trainer`` with single-process data loading.
+
+    Parameters:
+        precision (str, optional): Lightning precision of the trainer, e.g. ``"bf16-mixed"``
+            for bfloat16 autocast on the CPU. None keeps the trainer default.
+        compile (bool): Whether to compile the inner ``nn.Module`` with ``torch.compile``.
+        compile_mode (str, optional): Mode passed to ``torch.compile``.
+        num_threads (int, optional): Number of intra-op threads of the training process.
+        num_interop_threads (int, optional): Number of inter-op threads. Can only be set
+            before the first parallel work in the process.
+        num_workers (int): Number of dataloader worker processes.
+        persistent_workers (bool): Whether to keep the workers alive between epochs.
+        prefetch_factor (int, optional): Number of batches loaded in advance by each worker.
+        pin_memory (bool): Whether to copy the batches to pinned memory.
+        worker_threads (int): Number of intra-op threads of every dataloader worker.
+    """
+
+    def __init__(
+        self,
+        precision: str = None,
+        compile: bool = False,
+        compile_mode: str = None,
+        num_threads: int = None,
+        num_interop_threads: int = None,
+        num_workers: int = 0,
+        persistent_workers: bool = False,
+        prefetch_factor: int = None,
+        pin_memory: bool = False,
+        worker_threads: int = 1,
+    ):
+        self.precision = precision
+        self.compile = compile
+        self.compile_mode = compile_mode
+        self.num_threads = num_threads
+        self.num_interop_threads = num_interop_threads
+        self.num_workers = num_workers
+        self.persistent_workers = persistent_workers
+        self.prefetch_factor = prefetch_factor
+        self.pin_memory = pin_memory
+        self.worker_threads = worker_threads
+
+    @classmethod
+    def cpu(cls, num_workers: int = None, **kwargs):
+        """
+        Profile tuned for training throughput on CPU-only machines.
+
+        Uses bfloat16 autocast and persistent dataloader workers; the remaining cores
+        are used as intra-op threads of the training process. Compiling the model is
+        opt-in, e.g. ``PerformanceProfile.cpu(compile=True)``.
+
+        Parameters:
+            num_workers (int, optional): Number of dataloader workers. Defaults to a
+                quarter of the cores, at most 4.
+            **kwargs: Overrides of the other profile settings.
+
+        Returns:
+            PerformanceProfile: The profile.
+        """
+        n_cores = os.cpu_count() or 1
+        if num_workers is None:
+            num_workers = min(4, n_cores // 4)
+        settings = {
+            "precision": "bf16-mixed",
+            "num_threads": max(1, n_cores - num_workers),
+            "num_workers": num_workers,
+            "persistent_workers": num_workers > 0,
+            "prefetch_factor": 4 if num_workers > 0 else None,
+        }
+        settings.update(kwargs)
+        return cls(**settings)
+
+    @classmethod
+    def resolve(cls, profile=None):
+        """
+        Turn the ``performance_profile`` argument of the models into a profile.
+
+        Parameters:
+            profile (PerformanceProfile, str or dict, optional): A profile, the name of a
+                preset (``"default"`` or ``"cpu"``) or the settings of a profile.
+
+        Returns:
+            PerformanceProfile: The profile.
+        """
+        if profile is None:
+            return cls()
+        if isinstance(profile, cls):
+            return profile
+        if isinstance(profile, dict):
+            return cls(**profile)
+        presets = {"default": cls, "cpu": cls.cpu}
+        if profile not in presets:
+            raise ValueError(
+                f"Unknown performance profile '{profile}'. Choose from {list(presets)}."
+            )
+        return presets[profile]()
+
+    def apply_threads(self) -> int:
+        """
+        Set the number of intra- and inter-op threads of the current process.
+
+        Returns:
+            int: The previous number of intra-op threads, to pass to ``restore_threads``
+                once training is done.
+        """
+        previous = torch.get_num_threads()
+        if self.num_threads is not None:
+            torch.set_num_threads(self.num_threads)
+        if self.num_interop_threads is not None:
+            try:
+                torch.set_num_interop_threads(self.num_interop_threads)
+            except RuntimeError as e:
+                logger.warning(f"Could not set the number of inter-op threads: {e}")
+        return previous
+
+    def restore_threads(self, num_threads: int):
+        """
+        Reset the number of intra-op threads after training.
+
+        The number of inter-op threads cannot be changed again once it has been used,
+        so it is kept.
+
+        Parameters:
+            num_threads (int): Number of intra-op threads returned by ``apply_threads``.
+        """
+        if torch.get_num_threads() != num_threads:
+            torch.set_num_threads(num_threads)
+
+    def trainer_kwargs(self) -> dict:
+        """
+        Keyword arguments of ``pl.Trainer`` for this profile.
+
+        Returns:
+            dict: Trainer keyword arguments.
+        """
+        if self.precision is None:
+            return {}
+        return {"precision": self.precision}
+
+    def dataloader_kwargs(self) -> dict:
+        """
+        Keyword arguments of the ``DataLoader``s of ``TMDataModule`` for this profile.
+
+        Returns:
+            dict: DataLoader keyword arguments.
+        """
+        kwargs = {"pin_memory": self.pin_memory}
+        if self.num_workers > 0:
+            kwargs.update(
+                {
+                    "num_workers": self.num_workers,
+                    "persistent_workers": self.persistent_workers,
+                    "worker_init_fn": functools.partial(
+                        _limit_worker_threads, num_threads=self.worker_threads
+                    ),
+                }
+            )
+            if self.prefetch_factor is not None:
+                kwargs["prefetch_factor"] = self.prefetch_factor
+        return kwargs
+
+    def compile_module(self, module: torch.nn.Module) -> torch.nn.Module:
+        """
+        Compile a module in place if the profile asks for it.
+
+        Uses ``nn.Module.compile``, which compiles calls of the module, e.g.
+        ``self(x)`` in ``compute_loss``. The compiled function is dropped when the
+        module is pickled, so the module can still be saved with ``torch.save``.
+
+        Parameters:
+            module (nn.Module): Module to compile, e.g. the base model of a topic model.
+
+        Returns:
+            nn.Module: The same module.
+        """
+        if self.compile:
+            module.compile(mode=self.compile_mode)
+        return module
+
+    def __repr__(self):
+        settings = ", ".join(f"{key}={value!r}" for key, value in vars(self).items())
+        return f"{type(self).__name__}({settings})"
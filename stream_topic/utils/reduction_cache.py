@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+from loguru import logger
+
+from .embedding_store import content_hash
+
+
+def reduction_key(embeddings: np.ndarray, umap_args: dict) -> str:
+    """
+    Key of the reduction of an embedding matrix with UMAP parameters.
+
+    Parameters
+    ----------
+    embeddings : np.ndarray
+        The embedding matrix that is reduced.
+    umap_args : dict
+        Keyword arguments of ``umap.UMAP``.
+
+    Returns
+    -------
+    str
+        Hexadecimal digest of the content hash, shape and dtype of the matrix and
+        of the parameters.
+    """
+    description = json.dumps(
+        {
+            "embeddings": content_hash(embeddings),
+            "shape": list(embeddings.shape),
+            "dtype": str(embeddings.dtype),
+            "umap_args": umap_args or {},
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+class ReductionCache:
+    """
+    Cache of fitted UMAP reducers and the embeddings they reduced.
+
+    Entries are keyed by ``reduction_key``, so refitting a model on the same
+    embeddings with UMAP parameters it has already used, e.g. in Optuna trials
+    that only change ``n_topics`` or the clustering parameters, skips UMAP.
+
+    The most recently used ``max_entries`` reductions are held in memory. With
+    ``cache_dir``, every reduction is also stored as ``<key>.npy`` with the
+    pickled reducer in ``<key>.reducer.pkl`` and reused across processes and
+    sessions.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Number of reductions held in memory, by default 4. 0 disables the
+        in-memory cache.
+    cache_dir : str, optional
+        Directory of the on-disk cache, by default None (memory only).
+    """
+
+    def __init__(self, max_entries: int = 4, cache_dir: str = None):
+        self.max_entries = max_entries
+        self.cache_dir = (
+            os.path.expanduser(os.fspath(cache_dir)) if cache_dir is not None else None
+        )
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # pickled models do not carry the cached reducers and arrays along
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        return state
+
+    def _paths(self, key):
+        stem = os.path.join(self.cache_dir, key)
+        return stem + ".npy", stem + ".reducer.pkl"
+
+    def get(self, key: str):
+        """
+        Look up a reduction, first in memory and then on disk.
+
+        Parameters
+        ----------
+        key : str
+            Key of the reduction.
+
+        Returns
+        -------
+        tuple or None
+            The fitted reducer and the reduced embeddings, or None on a miss.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if self.cache_dir is None:
+            return None
+
+        array_path, reducer_path = self._paths(key)
+        if not (os.path.exists(array_path) and os.path.exists(reducer_path)):
+            return None
+        try:
+            with open(reducer_path, "rb") as file:
+                reducer = pickle.load(file)
+            entry = (reducer, np.load(array_path))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached reduction {key}: {e}")
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, reducer, reduced_embeddings: np.ndarray):
+        """
+        Store a reduction.
+
+        Parameters
+        ----------
+        key : str
+            Key of the reduction.
+        reducer : umap.UMAP
+            The fitted reducer.
+        reduced_embeddings : np.ndarray
+            The reduced embeddings.
+        """
+        self._remember(key, (reducer, reduced_embeddings))
+        if self.cache_dir is None:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        array_path, reducer_path = self._paths(key)
+        suffix = f".{os.getpid()}.tmp"
+        try:
+            with open(reducer_path + suffix, "wb") as file:
+                pickle.dump(reducer, file)
+            np.save(array_path + suffix + ".npy", reduced_embeddings)
+            # the array is renamed last and marks the entry as complete
+            os.replace(reducer_path + suffix, reducer_path)
+            os.replace(array_path + suffix + ".npy", array_path)
+        except Exception as e:
+            logger.warning(f"Could not store reduction {key} in {self.cache_dir}: {e}")
+
+    def _remember(self, key, entry):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop the reductions held in memory. Files on disk are kept.
+        """
+        self._entries.clear()
@@ -1,8 +1,13 @@
+import math
+
 import torch
 
+SINKHORN_CHECK_EVERY = 20
+# beyond this spread of lambda_sh * M, the float32 scaling vectors can over- or underflow
+LOG_DOMAIN_THRESHOLD = 80.0
 
-def sinkhorn_loss(M, a, b, lambda_sh, numItermax=5000, stopThr=0.5e-2):
 
+def sinkhorn_loss(M, a, b, lambda_sh, numItermax=5000, stopThr=0.5e-2):
     u = torch.ones_like(a) / a.size()[0]
 
     K = torch.exp(-M * lambda_sh)
@@ -22,3 +27,219 @@ def sinkhorn_loss(M, a, b, lambda_sh, numItermax=5000, stopThr=0.5e-2):
     )
 
     return sinkhorn_divergences
+
+
+def _stabilized_kernel(M, lambda_sh):
+    """
+    Build the Gibbs kernel exp(-lambda_sh * M) with log-domain row and column shifts.
+
+    The log kernel is shifted so that the maximum of every row and every column is 0
+    before it is exponentiated, so no row or column of the kernel underflows, however
+    large ``lambda_sh`` is. Scaling rows and columns of the kernel only rescales the dual
+    variables, so the transport plan and the Sinkhorn divergence are unchanged.
+    """
+    log_K = -M * lambda_sh
+    log_K = log_K - log_K.max(dim=1, keepdim=True).values
+    log_K = log_K - log_K.max(dim=0, keepdim=True).values
+    return torch.exp(log_K)
+
+
+def _log_matmul(log_x, K):
+    """
+    Compute log(exp(log_x) @ K) with a row-wise log-sum-exp shift.
+    """
+    row_max = log_x.max(dim=1, keepdim=True).values
+    product = torch.matmul(torch.exp(log_x - row_max), K)
+    return row_max + torch.log(product.clamp_min(torch.finfo(K.dtype).tiny))
+
+
+def stabilized_sinkhorn_loss(
+    M,
+    a,
+    b,
+    lambda_sh,
+    numItermax=5000,
+    stopThr=0.5e-2,
+    check_every=SINKHORN_CHECK_EVERY,
+    log_u=None,
+    log_domain=None,
+):
+    """
+    Batched Sinkhorn divergences with a log-stabilized kernel.
+
+    The kernel is built once per call from the log costs (see ``_stabilized_kernel``) and
+    shared by all iterations and the final transport cost. For moderate ``lambda_sh`` the
+    iterations are plain matrix products on the dual scalings ``u`` and ``v``. For large
+    ``lambda_sh`` the scalings would leave the float range, so the dual variables are
+    kept in the log domain instead and the kernel products use log-sum-exp shifts.
+
+    Parameters
+    ----------
+    M : torch.Tensor
+        Cost matrix of shape (n_topics, vocab_size).
+    a : torch.Tensor
+        Source marginals of shape (n_topics, batch_size), one column per document.
+    b : torch.Tensor
+        Target marginals of shape (vocab_size, batch_size).
+    lambda_sh : float
+        Entropic regularization strength; the kernel is exp(-lambda_sh * M).
+    numItermax : int, optional
+        Maximum number of Sinkhorn iterations, by default 5000.
+    stopThr : float, optional
+        Stop once the L1 error of the target marginals is below this value for every
+        document, by default 0.5e-2.
+    check_every : int, optional
+        Number of iterations between two convergence checks, by default 20.
+    log_u : torch.Tensor, optional
+        Initial log dual scaling of shape (n_topics, batch_size) or (n_topics, 1), e.g.
+        from a previous batch. Defaults to uniform ``u``.
+    log_domain : bool, optional
+        Whether to iterate on the log dual variables. Defaults to doing so only if
+        ``lambda_sh`` times the spread of ``M`` exceeds ``LOG_DOMAIN_THRESHOLD``.
+
+    Returns
+    -------
+    tuple
+        The Sinkhorn divergence of every document, shape (batch_size,), and the final
+        log dual scaling ``log u``.
+    """
+    if log_domain is None:
+        with torch.no_grad():
+            spread = float(lambda_sh * (M.max() - M.min()))
+        log_domain = spread > LOG_DOMAIN_THRESHOLD
+
+    K = _stabilized_kernel(M, lambda_sh)
+    KM = torch.mul(K, M)
+    tiny = torch.finfo(K.dtype).tiny
+
+    # iterate on batch-major, contiguous copies: one row per document
+    a = a.t().contiguous()
+    b = b.t().contiguous()
+    if log_u is None:
+        log_u = torch.full_like(a, -math.log(a.size()[1]))
+    else:
+        log_u = log_u.t().to(a.dtype).expand_as(a)
+
+    if log_domain:
+        log_a = torch.log(a.clamp_min(tiny))
+        log_b = torch.log(b.clamp_min(tiny))
+        for cpt in range(1, numItermax + 1):
+            log_v = log_b - _log_matmul(log_u, K)
+            log_u = log_a - _log_matmul(log_v, K.t())
+            if cpt % check_every == 0 or cpt == numItermax:
+                with torch.no_grad():
+                    bb = torch.exp(log_v + _log_matmul(log_u, K))
+                    err = torch.sum(torch.abs(bb - b), dim=1).max()
+                if err <= stopThr:
+                    break
+
+        sinkhorn_divergences = torch.sum(
+            torch.exp(log_u + _log_matmul(log_v, KM.t())), dim=1
+        )
+        return sinkhorn_divergences, log_u.t()
+
+    # every row and column of K has a maximum of 1, so the products stay positive
+    u = torch.exp(log_u)
+    for cpt in range(1, numItermax + 1):
+        v = torch.div(b, torch.matmul(u, K))
+        u = torch.div(a, torch.matmul(v, K.t()))
+        if cpt % check_every == 0 or cpt == numItermax:
+            with torch.no_grad():
+                bb = torch.mul(v, torch.matmul(u, K))
+                err = torch.sum(torch.abs(bb - b), dim=1).max()
+            if err <= stopThr:
+                break
+
+    sinkhorn_divergences = torch.sum(torch.mul(u, torch.matmul(v, KM.t())), dim=1)
+
+    return sinkhorn_divergences, torch.log(u.clamp_min(tiny)).t()
+
+
+class SinkhornSolver:
+    """
+    Sinkhorn optimal transport solver for batches of documents with optional warm starts.
+
+    Parameters
+    ----------
+    lambda_sh : float
+        Entropic regularization strength; the kernel is exp(-lambda_sh * M).
+    max_iter : int, optional
+        Maximum number of Sinkhorn iterations per call, by default 5000.
+    stop_threshold : float, optional
+        Convergence threshold on the L1 error of the target marginals, by default 0.5e-2.
+    check_every : int, optional
+        Number of iterations between two convergence checks, by default 20.
+    warm_start : bool, optional
+        Whether to start every call from the mean dual scaling of the previous call
+        instead of a uniform one, by default False.
+    log_domain : bool, optional
+        Whether to iterate on log dual variables. Defaults to choosing automatically
+        from ``lambda_sh`` and the spread of the cost matrix.
+
+    Examples
+    --------
+    >>> solver = SinkhornSolver(lambda_sh=20, warm_start=True)
+    >>> loss = solver(M, theta.T, F.softmax(bow, dim=-1).T)
+    """
+
+    def __init__(
+        self,
+        lambda_sh,
+        max_iter=5000,
+        stop_threshold=0.5e-2,
+        check_every=SINKHORN_CHECK_EVERY,
+        warm_start=False,
+        log_domain=None,
+    ):
+        self.lambda_sh = lambda_sh
+        self.max_iter = max_iter
+        self.stop_threshold = stop_threshold
+        self.check_every = check_every
+        self.warm_start = warm_start
+        self.log_domain = log_domain
+        self._log_u = None
+
+    def reset(self):
+        """
+        Forget the dual scaling kept for warm starts.
+        """
+        self._log_u = None
+
+    def __call__(self, M, a, b):
+        """
+        Compute the Sinkhorn divergence of every document.
+
+        Parameters
+        ----------
+        M : torch.Tensor
+            Cost matrix of shape (n_topics, vocab_size).
+        a : torch.Tensor
+            Source marginals of shape (n_topics, batch_size).
+        b : torch.Tensor
+            Target marginals of shape (vocab_size, batch_size).
+
+        Returns
+        -------
+        torch.Tensor
+            Sinkhorn divergences of shape (batch_size,).
+        """
+        log_u = None
+        if self.warm_start and self._log_u is not None:
+            if self._log_u.shape[0] == a.shape[0] and self._log_u.device == a.device:
+                log_u = self._log_u
+
+        divergences, log_u = stabilized_sinkhorn_loss(
+            M,
+            a,
+            b,
+            self.lambda_sh,
+            numItermax=self.max_iter,
+            stopThr=self.stop_threshold,
+            check_every=self.check_every,
+            log_u=log_u,
+            log_domain=self.log_domain,
+        )
+        if self.warm_start:
+            # documents differ between batches, so keep one scaling vector for all of them
+            self._log_u = log_u.detach().mean(dim=1, keepdim=True)
+        return divergences
@@ -0,0 +1,66 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def topic_dict_to_matrix(topic_dict, vocabulary=None, sparse=False):
+    """
+    Build a word-topic matrix from a topic dictionary in a single vectorized pass.
+
+    Rows follow the vocabulary and columns the sorted topic keys, matching the layout
+    of ``beta`` of the models (words x topics). If a word occurs several times in the
+    same topic, its last prevalence is kept.
+
+    Parameters
+    ----------
+    topic_dict : dict
+        Dictionary where keys are topic indices and values are lists of
+        (word, prevalence) tuples.
+    vocabulary : array-like of str, optional
+        Row order of the matrix. Words of the topics that are not in the vocabulary
+        are dropped. By default, the sorted set of all words of the topics.
+    sparse : bool, optional
+        Whether to return a ``scipy.sparse.csr_matrix`` instead of a dense array,
+        by default False.
+
+    Returns
+    -------
+    tuple
+        The matrix of shape (n_words, n_topics) and the vocabulary as a numpy array.
+    """
+    topics = sorted(topic_dict.keys())
+    lengths = np.array([len(topic_dict[topic]) for topic in topics], dtype=np.int64)
+    words = np.array(
+        [word for topic in topics for word, _ in topic_dict[topic]], dtype=object
+    )
+    values = np.fromiter(
+        (prevalence for topic in topics for _, prevalence in topic_dict[topic]),
+        dtype=np.float64,
+        count=int(lengths.sum()),
+    )
+    columns = np.repeat(np.arange(len(topics)), lengths)
+
+    if vocabulary is None:
+        vocabulary, rows = np.unique(words.astype(str), return_inverse=True)
+    else:
+        vocabulary = np.asarray(vocabulary)
+        word_index = {word: i for i, word in enumerate(vocabulary.tolist())}
+        rows = np.fromiter(
+            (word_index.get(word, -1) for word in words),
+            dtype=np.int64,
+            count=len(words),
+        )
+        known = rows >= 0
+        rows, columns, values = rows[known], columns[known], values[known]
+
+    # keep the last prevalence of duplicated (word, topic) pairs
+    keys = rows.astype(np.int64) * max(len(topics), 1) + columns
+    _, last = np.unique(keys[::-1], return_index=True)
+    keep = len(keys) - 1 - last
+
+    matrix = sp.csr_matrix(
+        (values[keep], (rows[keep], columns[keep])),
+        shape=(len(vocabulary), len(topics)),
+    )
+    if not sparse:
+        matrix = matrix.toarray()
+    return matrix, vocabulary
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer
+
+from ..commons.embedding_registry import get_embedding_model
 
 
 class OctisWrapperVisualModel:
@@ -43,7 +44,7 @@ class OctisWrapperVisualModel:
         super().__init__()
         self._model = octis_model
         self.output = octis_output
-        self.embedding_model = SentenceTransformer(embedding_model_name)
+        self.embedding_model = get_embedding_model(embedding_model_name)
         self.embedding_model_name = embedding_model_name
         self.embeddings_path = embeddings_folder_path
         self.embeddings_file_path = embeddings_file_path
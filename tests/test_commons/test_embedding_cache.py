@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from stream_topic.commons.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(self.tmp_dir.name)
+        self.encoded = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([[len(text), text.count("a"), 1.0] for text in texts])
+
+    def test_only_new_texts_are_encoded(self):
+        first = self.cache.encode("model", ["a", "bb", "a"], self.encode)
+        self.assertEqual(self.encoded, ["a", "bb"])
+        np.testing.assert_array_equal(first, [[1, 1, 1], [2, 0, 1], [1, 1, 1]])
+
+        second = self.cache.encode("model", ["bb", "ccc", "a"], self.encode)
+        self.assertEqual(self.encoded, ["a", "bb", "ccc"])
+        np.testing.assert_array_equal(second, [[2, 0, 1], [3, 0, 1], [1, 1, 1]])
+        self.assertEqual(second.dtype, np.float32)
+
+    def test_models_are_cached_separately(self):
+        self.cache.encode("model-a", ["text"], self.encode)
+        self.cache.encode("model-b", ["text"], self.encode)
+        self.assertEqual(self.encoded, ["text", "text"])
+
+    def test_cache_persists_across_instances(self):
+        self.cache.encode("model", ["a", "bb"], self.encode)
+        reopened = EmbeddingCache(self.tmp_dir.name)
+        embeddings = reopened.encode("model", ["bb"], self.encode)
+        self.assertEqual(self.encoded, ["a", "bb"])
+        np.testing.assert_array_equal(embeddings, [[2, 0, 1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
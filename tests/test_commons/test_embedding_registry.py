@@ -0,0 +1,47 @@
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+from stream_topic.commons.embedding_registry import EmbeddingModelRegistry
+
+
+class TestEmbeddingModelRegistry(unittest.TestCase):
+    def setUp(self):
+        # Replace the sentence_transformers module so no weights are loaded
+        self.fake_module = types.ModuleType("sentence_transformers")
+        self.fake_module.SentenceTransformer = MagicMock(
+            side_effect=lambda name, device=None: object()
+        )
+        self.modules_patch = patch.dict(
+            sys.modules, {"sentence_transformers": self.fake_module}
+        )
+        self.modules_patch.start()
+        self.registry = EmbeddingModelRegistry(max_models=2)
+
+    def tearDown(self):
+        self.modules_patch.stop()
+
+    def test_model_is_loaded_once(self):
+        first = self.registry.get("model-a", device="cpu")
+        second = self.registry.get("model-a", device="cpu")
+        self.assertIs(first, second)
+        self.assertEqual(self.fake_module.SentenceTransformer.call_count, 1)
+
+    def test_device_is_part_of_key(self):
+        self.registry.get("model-a", device="cpu")
+        self.registry.get("model-a", device="cuda")
+        self.assertEqual(len(self.registry), 2)
+
+    def test_least_recently_used_model_is_evicted(self):
+        self.registry.get("model-a", device="cpu")
+        self.registry.get("model-b", device="cpu")
+        self.registry.get("model-a", device="cpu")
+        self.registry.get("model-c", device="cpu")
+        self.assertIn(("model-a", "cpu"), self.registry)
+        self.assertIn(("model-c", "cpu"), self.registry)
+        self.assertNotIn(("model-b", "cpu"), self.registry)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,5 +71,39 @@ class TestNPMI(unittest.TestCase):
             self.assertLessEqual(score, 1)
 
 
+class TestNPMISparseIndex(unittest.TestCase):
+    def setUp(self):
+        self.corpus = [
+            ["apple", "banana", "cherry"],
+            ["apple", "banana"],
+            ["apple", "cherry", "grape"],
+            ["grape", "melon"],
+        ]
+        self.mock_dataset = MagicMock(spec=TMDataset)
+        self.mock_dataset.get_corpus = lambda: self.corpus
+
+    def test_score_matches_document_counts(self):
+        metric = NPMI(dataset=self.mock_dataset, stopwords=[])
+        score = metric.score_per_topic([["apple", "banana"]], preprocess=0)
+
+        # apple in 3 docs, banana in 2 docs, both in 2 docs out of 4
+        p_joint, p_apple, p_banana = 2 / 4, 3 / 4, 2 / 4
+        expected = np.log(p_joint / (p_apple * p_banana)) / -np.log(p_joint)
+        self.assertAlmostEqual(list(score.values())[0], expected, places=4)
+
+    def test_index_is_built_once(self):
+        metric = NPMI(dataset=self.mock_dataset, stopwords=[])
+        metric.score([["apple", "banana"], ["cherry", "grape"]])
+        index = metric._cooc_matrix
+        metric.score([["apple", "cherry"]])
+        self.assertIs(metric._cooc_matrix, index)
+
+    def test_sliding_window(self):
+        metric = NPMI(dataset=self.mock_dataset, stopwords=[], window_size=2)
+        metric.score([["apple", "banana"]])
+        # windows: 2 + 1 + 2 + 1
+        self.assertEqual(metric._cooc_matrix.shape[0], 6)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Generous upper bound so the check is stable on slow CI machines, while still
+# catching an eagerly loaded embedding model (which takes several seconds).
+IMPORT_TIME_BUDGET = 5.0
+
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import stream_topic
+import stream_topic.metrics
+elapsed = time.perf_counter() - start
+
+from stream_topic.commons.embedding_registry import get_embedding_registry
+
+print(json.dumps({
+    "elapsed": elapsed,
+    "sentence_transformers_imported": "sentence_transformers" in sys.modules,
+    "loaded_models": len(get_embedding_registry()),
+}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Run in a fresh interpreter so modules imported by other tests do not interfere
+        repo_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cls.report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_no_model_is_instantiated(self):
+        self.assertEqual(self.report["loaded_models"], 0)
+        self.assertFalse(self.report["sentence_transformers_imported"])
+
+    def test_import_time(self):
+        self.assertLess(
+            self.report["elapsed"],
+            IMPORT_TIME_BUDGET,
+            f"import stream_topic.metrics took {self.report['elapsed']:.3f}s",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from gensim import matutils
+from gensim.corpora import Dictionary, MmCorpus
+from gensim.models import ldamodel
+
+from stream_topic.models import LDA
+from stream_topic.models.abstract_helper_models.base import TrainingStatus
+from stream_topic.utils.dataset import TMDataset
+
+
+class TestLDAExtraction(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        vocabularies = [[f"a{i}" for i in range(20)], [f"b{i}" for i in range(20)]]
+        documents = [
+            list(rng.choice(vocabularies[i % 2], 30)) for i in range(60)
+        ]
+        self.id2word = Dictionary(documents)
+        self.corpus = [self.id2word.doc2bow(document) for document in documents]
+
+        self.model = LDA(id2word=self.id2word, id_corpus=self.corpus)
+        self.model.n_topics = 2
+        self.model.model = ldamodel.LdaModel(
+            self.corpus, num_topics=2, id2word=self.id2word, random_state=0, passes=5
+        )
+        self.model._status = TrainingStatus.SUCCEEDED
+
+    def test_theta_matches_per_document_inference(self):
+        expected = np.zeros((len(self.corpus), 2))
+        for row, bow in enumerate(self.corpus):
+            for topic_id, probability in self.model.model.get_document_topics(bow):
+                expected[row, topic_id] = probability
+
+        theta = self.model.get_theta(as_dataframe=False, chunksize=7)
+        self.assertEqual(theta.dtype, np.float32)
+        np.testing.assert_allclose(theta, expected, atol=0.02)
+
+        frame = self.model.get_theta()
+        self.assertIsInstance(frame, pd.DataFrame)
+        self.assertEqual(list(frame.columns), ["topic_0", "topic_1"])
+
+        sparse_theta = self.model.get_theta(as_dataframe=False, sparse=True)
+        self.assertTrue(sp.issparse(sparse_theta))
+        self.assertEqual(sparse_theta.shape, (len(self.corpus), 2))
+
+    def test_beta_matches_topic_terms(self):
+        beta = self.model.get_beta()
+        self.assertEqual(beta.shape, (len(self.id2word), 2))
+        for topic_id in range(2):
+            for word_id, probability in self.model.model.get_topic_terms(
+                topic_id, topn=len(self.id2word)
+            ):
+                self.assertAlmostEqual(beta[word_id, topic_id], probability, places=6)
+
+
+
+class TestLDABackends(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        vocabularies = [[f"a{i}" for i in range(20)], [f"b{i}" for i in range(20)]]
+        tokens = [list(rng.choice(vocabularies[i % 2], 30)) for i in range(40)]
+        self.dataset = TMDataset()
+        self.dataset.dataframe = pd.DataFrame({"tokens": tokens})
+        self.dataset.preprocessing_steps = {}
+
+    def test_streamed_corpus_backends(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus_path = os.path.join(directory, "corpus.mm")
+            for backend in ("single", "multicore"):
+                model = LDA(backend=backend, workers=1, corpus_path=corpus_path)
+                model.fit(self.dataset, n_topics=2, random_state=0)
+                self.assertIsInstance(model._corpus(), MmCorpus)
+                self.assertEqual(model.theta.shape, (40, 2))
+                self.assertEqual(model.get_beta().shape, (len(model.id2word), 2))
+
+    def test_sparse_corpus(self):
+        id2word = Dictionary(self.dataset.dataframe["tokens"])
+        bows = [id2word.doc2bow(tokens) for tokens in self.dataset.dataframe["tokens"]]
+        matrix = matutils.corpus2csc(bows, num_terms=len(id2word)).T.tocsr()
+        model = LDA(id2word=id2word, id_corpus=matrix)
+        model.fit(self.dataset, n_topics=2, theta_as_dataframe=False, random_state=0)
+        self.assertEqual(model.theta.shape, (40, 2))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            LDA(backend="distributed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+from torch.distributions.lowrank_multivariate_normal import \
+    LowRankMultivariateNormal
+
+from stream_topic.models.neural_base_models.tntm_base import TNTMBase
+
+
+class MockDataset:
+    def __init__(self, n_documents=20, vocab_size=300, embedding_dim=16):
+        self.bow = sp.random(n_documents, vocab_size, format="csr", dtype=np.float32)
+        self.embeddings = np.random.rand(n_documents, embedding_dim).astype(np.float32)
+
+
+class TestTNTMBaseLogBeta(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.n_topics, emb_dim, vocab_size = 5, 11, 300
+        factors = torch.randn(self.n_topics, emb_dim, emb_dim, dtype=torch.float64) * 0.3
+        self.model = TNTMBase(
+            MockDataset(vocab_size=vocab_size),
+            mus_init=torch.randn(self.n_topics, emb_dim, dtype=torch.float64),
+            L_lower_init=torch.linalg.cholesky(
+                factors @ factors.transpose(1, 2) + torch.eye(emb_dim)
+            ),
+            log_diag_init=torch.log(torch.ones(self.n_topics, emb_dim) * 1e-2),
+            word_embeddings_projected=np.random.rand(vocab_size, emb_dim).astype(np.float32),
+            n_topics=self.n_topics,
+        )
+
+    def test_matches_per_topic_distributions(self):
+        expected = torch.stack(
+            [
+                LowRankMultivariateNormal(mu, cov_factor=lower, cov_diag=diag).log_prob(
+                    self.model.word_embeddings_projected
+                )
+                for mu, lower, diag in zip(
+                    self.model.mus, self.model.L_lower, torch.exp(self.model.log_diag)
+                )
+            ]
+        ).float()
+        torch.testing.assert_close(
+            self.model.calc_log_beta().detach(), expected, rtol=1e-5, atol=1e-4
+        )
+
+    def test_beta_is_cached_until_parameters_change(self):
+        self.model.eval()
+        beta = self.model.get_beta()
+        self.assertIs(self.model._log_beta(), self.model._log_beta_cache[1])
+
+        with torch.no_grad():
+            self.model.mus.add_(1.0)
+        self.assertFalse(torch.equal(beta, self.model.get_beta()))
+
+    def test_training_bypasses_the_cache(self):
+        self.model.train()
+        self.assertTrue(self.model.get_beta().requires_grad)
+        self.assertIsNone(self.model._log_beta_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
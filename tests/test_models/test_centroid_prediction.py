@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from stream_topic.models import KmeansTM
+from stream_topic.models.abstract_helper_models.base import TrainingStatus
+
+
+class TestCentroidPrediction(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(4, 32)) * 5
+        self.labels = rng.integers(0, 4, 400)
+        self.embeddings = (
+            centers[self.labels] + rng.normal(size=(400, 32))
+        ).astype(np.float32)
+
+        self.model = KmeansTM(kmeans_args={"random_state": 0, "n_init": 10})
+        self.model.embeddings = self.embeddings[:300]
+        self.model.reduced_embeddings = self.model.embeddings
+        self.model.n_topics = 4
+        self.model._clustering()
+        self.model.theta = np.eye(4)[self.model.labels]
+        self.model._status = TrainingStatus.SUCCEEDED
+
+    def test_fast_paths_agree_with_clustering(self):
+        held_out = self.embeddings[300:]
+        expected = self.model.clustering_model.predict(held_out)
+        self.model.prepare_prediction(ann=True, warm_up=False)
+        for method in ("centroid", "ann"):
+            labels = self.model.predict(None, method=method, embeddings=held_out)
+            np.testing.assert_array_equal(labels, expected)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            self.model.predict(None, method="exact", embeddings=self.embeddings[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+from stream_topic.models import ProdLDA
+from stream_topic.models.abstract_helper_models.base import TrainingStatus
+from stream_topic.models.abstract_helper_models.neural_basemodel import \
+    NeuralBaseModel
+from stream_topic.models.neural_base_models.prodlda_base import ProdLDABase
+
+
+class MockDataset:
+    def __init__(self, n_documents=50, vocab_size=80):
+        self.bow = sp.random(
+            n_documents, vocab_size, density=0.2, format="csr", dtype=np.float32
+        )
+
+
+class TestInferTheta(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.dataset = MockDataset()
+        self.model = NeuralBaseModel(ProdLDABase, self.dataset, n_topics=4)
+
+    def expected_theta(self):
+        self.model.eval()
+        with torch.no_grad():
+            theta = self.model.model.get_theta(
+                {"bow": torch.tensor(self.dataset.bow.toarray())}, only_theta=True
+            ).numpy()
+        self.model.train()
+        return theta / theta.sum(axis=1, keepdims=True)
+
+    def test_batches_match_full_corpus(self):
+        theta = self.model.infer_theta({"bow": self.dataset.bow}, batch_size=7)
+        np.testing.assert_allclose(theta, self.expected_theta(), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(theta.sum(axis=1), 1, rtol=1e-5)
+        self.assertTrue(self.model.training)
+
+    def test_memmap_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "theta.npy")
+            theta = self.model.infer_theta(
+                {"bow": self.dataset.bow}, batch_size=16, memmap_path=path
+            )
+            self.assertIsInstance(theta, np.memmap)
+            np.testing.assert_allclose(np.load(path), self.expected_theta(), rtol=1e-5, atol=1e-6)
+            del theta
+
+
+class TokenDataset:
+    def __init__(self, corpus, bow=None):
+        self.corpus = corpus
+        self.bow = bow
+        self.embeddings = None
+
+    def get_corpus(self):
+        return self.corpus
+
+
+class TestPredictNewTexts(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.vocab = ["apple", "banana", "cherry", "grape", "lemon", "mango"]
+        self.train_dataset = TokenDataset(
+            [["apple", "banana"]], bow=sp.csr_matrix(np.ones((1, 6), dtype=np.float32))
+        )
+        self.model = ProdLDA()
+        self.model.dataset = self.train_dataset
+        self.model.data_module = SimpleNamespace(vocab=np.array(self.vocab))
+        self.model.model = NeuralBaseModel(
+            ProdLDABase, SimpleNamespace(bow=self.train_dataset.bow), n_topics=3
+        )
+        self.model._status = TrainingStatus.SUCCEEDED
+
+    def test_new_texts_are_vectorized_with_the_training_vocabulary(self):
+        corpus = [
+            ["apple", "apple", "mango", "unknown"],
+            ["cherry", "grape", "lemon"],
+            ["kiwi"],
+        ]
+        bow = np.array(
+            [[Counter(tokens)[word] for word in self.vocab] for tokens in corpus],
+            dtype=np.float32,
+        )
+        expected = self.model.model.infer_theta({"bow": sp.csr_matrix(bow)})
+
+        theta = self.model.predict(TokenDataset(corpus))
+        np.testing.assert_allclose(theta, expected, rtol=1e-5, atol=1e-6)
+        np.testing.assert_array_equal(
+            self.model.predict(TokenDataset(corpus), proba=False),
+            np.argmax(expected, axis=1),
+        )
+
+    def test_training_dataset_uses_its_bag_of_words(self):
+        expected = self.model.model.infer_theta({"bow": self.train_dataset.bow})
+        np.testing.assert_allclose(
+            self.model.predict(self.train_dataset), expected, rtol=1e-5, atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
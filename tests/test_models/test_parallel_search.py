@@ -0,0 +1,130 @@
+import io
+import os
+import pickle
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+
+import numpy as np
+import scipy.sparse as sp
+from loguru import logger
+
+from stream_topic.models.abstract_helper_models.base import BaseModel, TrainingStatus
+from stream_topic.models.abstract_helper_models.parallel_search import (
+    SharedArrayPickler,
+)
+
+
+class ArrayDataset:
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.normal(size=(1000, 512)).astype(np.float32)
+        self.bow = sp.random(1000, 2000, density=0.1, format="csr", random_state=0)
+
+
+class QuadraticModel(BaseModel):
+    """Model whose AIC is minimal for x = 0.3, independent of the number of topics."""
+
+    def get_info(self):
+        return {}
+
+    def fit(self, dataset, n_topics=None):
+        self.fits = getattr(self, "fits", 0) + 1
+        self.shared = isinstance(dataset.embeddings, np.memmap)
+        self._status = TrainingStatus.SUCCEEDED
+
+    def predict(self, X):
+        pass
+
+    def suggest_hyperparameters(self, trial):
+        self.hparams["x"] = trial.suggest_float("x", -1.0, 1.0)
+
+    def calculate_aic(self, n_topics=None):
+        # trials of the parallel search have to see the embeddings memory-mapped
+        penalty = 0.0 if self.shared else 100.0
+        return (self.hparams["x"] - 0.3) ** 2 + penalty
+
+
+class CountingUMAP:
+    """Fake reducer that leaves a file per fit, so fits in worker processes count."""
+
+    log_dir = None
+
+    def __init__(self, n_components=2, **kwargs):
+        self.n_components = n_components
+
+    def fit_transform(self, embeddings):
+        open(os.path.join(self.log_dir, f"{os.getpid()}-{uuid.uuid4().hex}"), "w").close()
+        return np.asarray(embeddings[:, : self.n_components]) * 2
+
+
+class ReducingModel(QuadraticModel):
+    """Model whose trials reduce the same embeddings with the same UMAP arguments."""
+
+    def __init__(self, log_dir):
+        super().__init__()
+        self.log_dir = log_dir
+        self.umap_args = {"n_components": 2}
+
+    def fit(self, dataset, n_topics=None):
+        super().fit(dataset, n_topics)
+        self.embeddings = dataset.embeddings
+        CountingUMAP.log_dir = self.log_dir
+        with mock.patch(
+            "stream_topic.models.abstract_helper_models.base.umap.UMAP", CountingUMAP
+        ):
+            self.reduced_embeddings = self.dim_reduction(logger)
+
+
+class TestParallelSearch(unittest.TestCase):
+    def test_large_arrays_are_memory_mapped(self):
+        dataset = ArrayDataset()
+        with tempfile.TemporaryDirectory() as directory:
+            file = io.BytesIO()
+            SharedArrayPickler(file, directory).dump((dataset, dataset.embeddings))
+            loaded, embeddings = pickle.loads(file.getvalue())
+
+            self.assertIsInstance(loaded.embeddings, np.memmap)
+            self.assertIs(loaded.embeddings, embeddings)
+            self.assertIsInstance(loaded.bow.data, np.memmap)
+            np.testing.assert_array_equal(loaded.embeddings, dataset.embeddings)
+            self.assertEqual((loaded.bow != dataset.bow).nnz, 0)
+            # small arrays such as the row pointers are pickled inline
+            self.assertNotIsInstance(loaded.bow.indptr, np.memmap)
+
+    def test_parallel_trials_share_one_study(self):
+        model = QuadraticModel()
+        with tempfile.TemporaryDirectory() as directory:
+            storage = os.path.join(directory, "journal.log")
+            result = model.optimize_hyperparameters(
+                ArrayDataset(), n_trials=6, n_jobs=2, storage=storage
+            )
+            self.assertLess(result["best_score"], 100.0)
+            self.assertIn("x", result["best_params"])
+            # the trials ran on copies, the model itself is only fitted once at the end
+            self.assertEqual(model.fits, 1)
+
+            # serial trials use the in-memory embeddings and score worse, but the
+            # resumed study keeps the best trial of the parallel run
+            resumed = model.optimize_hyperparameters(
+                ArrayDataset(), n_trials=2, n_jobs=1, storage=storage
+            )
+            self.assertEqual(resumed["best_score"], result["best_score"])
+
+    def test_parallel_trials_reuse_reductions(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            model = ReducingModel(log_dir)
+            model.optimize_hyperparameters(ArrayDataset(), n_trials=6, n_jobs=2)
+            worker_fits = [
+                name
+                for name in os.listdir(log_dir)
+                if not name.startswith(f"{os.getpid()}-")
+            ]
+            # at most one fit per worker, instead of one per trial
+            self.assertGreaterEqual(len(worker_fits), 1)
+            self.assertLessEqual(len(worker_fits), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
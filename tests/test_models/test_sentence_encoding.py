@@ -0,0 +1,87 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from stream_topic.models.abstract_helper_models.mixins import SentenceEncodingMixin
+
+
+class FakeEncoder:
+    """Sentence-transformer-like encoder with a fixed vector per text."""
+
+    max_seq_length = 10
+
+    def __init__(self):
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def _vector(self, text):
+        seed = sum(ord(character) * (i + 1) for i, character in enumerate(text))
+        return np.random.default_rng(seed).normal(size=4).astype(np.float32)
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(texts)
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.stack([self._vector(text) for text in texts])
+
+
+def per_document_embeddings(model, encoder, documents, use_average=True):
+    # the implementation before batched encoding, one encoder call per segment
+    embeddings = []
+    for doc in documents:
+        if len(doc) > encoder.max_seq_length and use_average:
+            segments = model.split_document(doc, encoder.max_seq_length)
+            embeddings.append(np.mean([encoder.encode(seg) for seg in segments], axis=0))
+        else:
+            embeddings.append(encoder.encode(doc))
+    return np.array(embeddings)
+
+
+class TestSentenceEncoding(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            "short",
+            "a document that is split into several segments",
+            "",
+            "exactly10!",
+            "eleven char",
+        ]
+        self.encoder = FakeEncoder()
+        self.model = SentenceEncodingMixin()
+        patcher = mock.patch(
+            "stream_topic.models.abstract_helper_models.mixins.get_embedding_model",
+            return_value=self.encoder,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batched_encoding_matches_per_document_encoding(self):
+        for use_average in (True, False):
+            expected = per_document_embeddings(
+                self.model, FakeEncoder(), self.documents, use_average
+            )
+            self.encoder.calls.clear()
+            embeddings = self.model.encode_documents(
+                self.documents, use_average=use_average, batch_size=2
+            )
+            np.testing.assert_allclose(embeddings, expected, rtol=1e-6)
+            self.assertEqual(len(self.encoder.calls), 1)
+
+    def test_average_segments(self):
+        segment_embeddings = np.arange(12, dtype=np.float32).reshape(6, 2)
+        owners = np.array([0, 0, 0, 1, 2, 2])
+        averaged = SentenceEncodingMixin._average_segments(segment_embeddings, owners, 3)
+        expected = np.stack(
+            [segment_embeddings[owners == doc].mean(axis=0) for doc in range(3)]
+        )
+        np.testing.assert_allclose(averaged, expected)
+
+    def test_empty_input(self):
+        self.assertEqual(self.model.encode_documents([]).shape, (0, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
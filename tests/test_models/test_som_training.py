@@ -0,0 +1,107 @@
+import inspect
+import unittest
+
+import numpy as np
+import torch
+
+from stream_topic.models import SOMTM
+
+
+def online_update(weights, locations, batch, bmu_indices, lr, rad_squared, use_softmax):
+    # the per-sample update of the online SOM before vectorization
+    weights = weights.clone()
+    for i, x in enumerate(batch):
+        distance_squares = torch.sum(
+            torch.pow(locations - locations[bmu_indices[i]], 2), 1
+        )
+        if use_softmax:
+            influence = torch.nn.functional.softmax(
+                -distance_squares / (2 * rad_squared), dim=0
+            )
+        else:
+            influence = torch.exp(-distance_squares / (2 * rad_squared))
+        weights += lr * influence.unsqueeze(1) * (x - weights)
+    return weights
+
+
+class TestSOMTraining(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.model = SOMTM(m=3, n=4, reduce_dim=False, dim=5)
+        self.model.n_iterations = 10
+        self.model.alpha = 0.3
+        self.model.sigma = 2.0
+        self.batch = torch.randn(16, 5)
+
+    def test_online_update_is_the_default(self):
+        default = inspect.signature(SOMTM.fit).parameters["batch_som"].default
+        self.assertFalse(default)
+
+    def test_online_update_matches_per_sample_update(self):
+        for use_softmax in (True, False):
+            self.model.weights = torch.randn(12, 5)
+            self.model.use_softmax = use_softmax
+            self.model.batch_som = False
+            bmu_indices = self.model._find_bmus(self.batch)
+            rad = self.model._decay_radius(3)
+            expected = online_update(
+                self.model.weights,
+                self.model.locations,
+                self.batch,
+                bmu_indices,
+                self.model._decay_learning_rate(3),
+                rad**2,
+                use_softmax,
+            )
+            self.model._update_weights_batch(self.batch, bmu_indices, 3)
+            torch.testing.assert_close(self.model.weights, expected)
+
+    def test_batch_update_moves_towards_weighted_means(self):
+        self.model.weights = torch.randn(12, 5)
+        self.model.use_softmax = False
+        self.model.batch_som = True
+        weights = self.model.weights.clone().numpy()
+        bmu_indices = self.model._find_bmus(self.batch)
+        rad_squared = self.model._decay_radius(3) ** 2
+        lr = self.model._decay_learning_rate(3)
+
+        locations = self.model.locations.numpy()
+        influence = np.stack(
+            [
+                np.exp(-((locations - locations[bmu]) ** 2).sum(1) / (2 * rad_squared))
+                for bmu in bmu_indices.numpy()
+            ]
+        )
+        target = influence.T @ self.batch.numpy() / influence.sum(0)[:, None]
+        expected = weights + lr * (target - weights)
+
+        self.model._update_weights_batch(self.batch, bmu_indices, 3)
+        np.testing.assert_allclose(self.model.weights.numpy(), expected, rtol=1e-5, atol=1e-6)
+
+    def test_bmus_and_chunked_labels(self):
+        data = torch.randn(50, 5)
+        distances = ((data[:, None, :] - self.model.weights[None]) ** 2).sum(-1)
+        expected = torch.argmin(distances, dim=1).numpy()
+        np.testing.assert_array_equal(self.model._find_bmus(data).numpy(), expected)
+        np.testing.assert_array_equal(
+            self.model._get_cluster_labels(data.numpy(), chunk_size=7), expected
+        )
+        self.assertEqual(len(self.model._get_cluster_labels(np.empty((0, 5)))), 0)
+
+    def test_training_assigns_labels_in_input_order(self):
+        centers = np.eye(5, dtype=np.float32) * 5
+        data = np.repeat(centers, 20, axis=0)
+        self.model.n_iterations = 20
+        self.model.use_softmax = False
+        for batch_som in (False, True):
+            self.model.batch_som = batch_som
+            self.model.weights = torch.randn(12, 5)
+            self.model._train_batch(data, batch_size=16)
+            labels = self.model.labels.reshape(5, 20)
+            # every cluster maps to one neuron and the clusters to different neurons
+            self.assertTrue((labels == labels[:, :1]).all())
+            self.assertEqual(len(set(labels[:, 0])), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
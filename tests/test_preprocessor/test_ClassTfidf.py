@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from stream_topic.preprocessor._tf_idf import (
+    ClassTfidf,
+    c_tf_idf,
+    extract_tfidf_topics,
+)
+
+
+def dense_c_tf_idf(documents, m):
+    count = CountVectorizer(stop_words="english").fit(documents)
+    t = count.transform(documents).toarray()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tf = np.nan_to_num(np.divide(t.T, t.sum(1)), nan=0.0, posinf=0.0)
+    return tf * np.log(m / t.sum(0)).reshape(-1, 1), count
+
+
+class TestClassTfidf(unittest.TestCase):
+    def setUp(self):
+        self.documents = [
+            "tigers hunt deer tigers stripes jungle",
+            "cars engines wheels cars roads fuel",
+            "jungle rivers deer birds rivers trees",
+        ]
+        self.m = 12
+
+    def test_matches_dense_implementation(self):
+        expected, _ = dense_c_tf_idf(self.documents, self.m)
+        tf_idf, _ = c_tf_idf(self.documents, self.m)
+        sparse_tf_idf, _ = c_tf_idf(self.documents, self.m, sparse=True)
+        np.testing.assert_allclose(tf_idf, expected)
+        np.testing.assert_allclose(sparse_tf_idf.toarray(), expected)
+
+    def test_top_words_match_full_sort(self):
+        tf_idf, count = c_tf_idf(self.documents, self.m)
+        docs_per_topic = pd.DataFrame({"predictions": [0, 1, 2]})
+        words = count.get_feature_names_out()
+        topics = extract_tfidf_topics(tf_idf, count, docs_per_topic, n=3)
+        for label, topic in topics.items():
+            scores = [score for _, score in topic]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertEqual(scores, sorted(tf_idf[:, label], reverse=True)[:3])
+            for word, score in topic:
+                self.assertEqual(tf_idf[list(words).index(word), label], score)
+
+    def test_top_words_from_csr(self):
+        tf_idf, count = c_tf_idf(self.documents, self.m, sparse=True)
+        docs_per_topic = pd.DataFrame({"predictions": [0, 1, 2]})
+        expected = extract_tfidf_topics(tf_idf.toarray(), count, docs_per_topic, n=4)
+        self.assertEqual(extract_tfidf_topics(tf_idf, count, docs_per_topic, n=4), expected)
+        self.assertEqual(
+            ClassTfidf().fit(self.documents, self.m).top_words(4), expected
+        )
+
+    def test_update_equals_refit(self):
+        engine = ClassTfidf().fit(self.documents, self.m)
+        engine.update({1: "cars wheels jungle", 3: "birds trees deer"}, m=14)
+
+        documents = [self.documents[0], "cars wheels jungle", self.documents[2], "birds trees deer"]
+        expected = ClassTfidf().fit(documents, 14, labels=[0, 1, 2, 3])
+        # the refit vocabulary lacks words that only the replaced text contained
+        vocabulary = list(engine.get_feature_names_out())
+        columns = [vocabulary.index(word) for word in expected.get_feature_names_out()]
+        np.testing.assert_allclose(
+            engine.tf_idf.toarray()[:, columns], expected.tf_idf.toarray()
+        )
+        self.assertEqual(engine.labels, [0, 1, 2, 3])
+        self.assertEqual(
+            [word for word, _ in engine.top_words(2)[3]],
+            [word for word, _ in expected.top_words(2)[3]],
+        )
+
+    def test_refit_vectorizes_only_new_clusters(self):
+        engine = ClassTfidf().fit(self.documents, self.m)
+        # a new clustering of the same corpus: the first and last cluster are merged
+        documents = [self.documents[1], self.documents[0] + " " + self.documents[2]]
+        with mock.patch.object(
+            engine.count, "transform", wraps=engine.count.transform
+        ) as transform:
+            tf_idf, _ = c_tf_idf(documents, self.m, sparse=True, engine=engine)
+        self.assertEqual(transform.call_args.args[0], [documents[1]])
+
+        expected, _ = c_tf_idf(documents, self.m, sparse=True)
+        np.testing.assert_allclose(tf_idf.toarray(), expected.toarray())
+        self.assertEqual(engine.labels, [0, 1])
+
+        # texts of another corpus are vectorized from scratch
+        tf_idf, count = c_tf_idf(["apples pears", "plums"], 2, engine=engine)
+        self.assertEqual(list(count.get_feature_names_out()), ["apples", "pears", "plums"])
+        self.assertEqual(tf_idf.shape, (3, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
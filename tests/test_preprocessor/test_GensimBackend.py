@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+from gensim.models import KeyedVectors
+
+from stream_topic.preprocessor._embedder import GensimBackend
+
+
+class TestGensimBackend(unittest.TestCase):
+    def setUp(self):
+        self.keyed_vectors = KeyedVectors(vector_size=4)
+        self.keyed_vectors.add_vectors(
+            ["apple", "banana", "cherry"],
+            np.arange(12, dtype=np.float32).reshape(3, 4),
+        )
+        self.backend = GensimBackend(self.keyed_vectors)
+
+    def test_encode_mean_pools_word_vectors(self):
+        embeddings = self.backend.encode(["apple banana banana", "cherry"])
+        expected = np.stack(
+            [
+                np.mean(
+                    [self.keyed_vectors[w] for w in ["apple", "banana", "banana"]],
+                    axis=0,
+                ),
+                self.keyed_vectors["cherry"],
+            ]
+        )
+        self.assertEqual(embeddings.dtype, np.float32)
+        self.assertTrue(embeddings.flags["C_CONTIGUOUS"])
+        np.testing.assert_allclose(embeddings, expected, rtol=1e-6)
+
+    def test_out_of_vocabulary_documents_get_zero_vectors(self):
+        embeddings = self.backend.encode(["unknown words", "apple unknown"])
+        self.assertEqual(embeddings.shape, (2, 4))
+        np.testing.assert_array_equal(embeddings[0], np.zeros(4))
+        np.testing.assert_allclose(embeddings[1], self.keyed_vectors["apple"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from stream_topic.preprocessor import _preprocessor
+from stream_topic.preprocessor._preprocessor import TextPreprocessor
+
+
+class TestTextPreprocessor(unittest.TestCase):
+    def setUp(self):
+        # Avoid depending on downloaded NLTK corpora
+        mock_stopwords = MagicMock()
+        mock_stopwords.words.return_value = ["the", "a", "is"]
+        self.patches = [
+            patch.object(_preprocessor, "stopwords", mock_stopwords),
+            patch.object(_preprocessor, "word_tokenize", str.split),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.documents = [
+            f"The model {i} is a <b>topic</b> model, isn't it? {i * 7}"
+            for i in range(40)
+        ]
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_parallel_matches_serial(self):
+        steps = dict(
+            remove_stopwords=True,
+            min_word_freq=None,
+            detect_language=False,
+        )
+        serial = TextPreprocessor(**steps).preprocess_documents(self.documents)
+        parallel = TextPreprocessor(
+            n_jobs=2, chunk_size=7, **steps
+        ).preprocess_documents(self.documents)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial[0], "model topic model not")
+
+    def test_parallel_uses_corpus_word_frequencies(self):
+        preprocessor = TextPreprocessor(
+            min_word_freq=40, detect_language=False, n_jobs=2, chunk_size=5
+        )
+        processed = preprocessor.preprocess_documents(self.documents)
+        self.assertEqual(preprocessor.word_freq["topic"], 40)
+        # "topic" occurs once per document and is kept in every document
+        self.assertTrue(all("topic" in doc.split() for doc in processed))
+
+    def test_word_frequency_filter_is_order_independent(self):
+        documents = ["rare word here", "common word", "common text"]
+        steps = dict(min_word_freq=2, detect_language=False)
+        forward = TextPreprocessor(**steps).preprocess_documents(documents)
+        backward = TextPreprocessor(**steps).preprocess_documents(documents[::-1])
+        self.assertEqual(forward, backward[::-1])
+        self.assertEqual(forward, ["word", "common word", "common"])
+
+    def test_word_frequencies_count_transformed_tokens(self):
+        documents = ["computing running dogs"] * 2
+        stemmed = TextPreprocessor(
+            stem=True, min_word_freq=2, detect_language=False
+        ).preprocess_documents(documents)
+        self.assertEqual(stemmed, ["comput run dog"] * 2)
+
+        # "dogs" and "dog" count as the same lemma
+        with patch.object(_preprocessor, "_lemmatize_token", lambda w: w.rstrip("s")):
+            lemmatized = TextPreprocessor(
+                lemmatize=True, min_word_freq=2, detect_language=False
+            ).preprocess_documents(["dogs bark", "dog sleeps"])
+        self.assertEqual(lemmatized, ["dog", "dog"])
+
+    def test_preprocess_file_streams_documents(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, "corpus.txt")
+            output_path = os.path.join(tmp_dir, "processed.txt")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(self.documents) + "\n")
+
+            preprocessor = TextPreprocessor(
+                min_word_freq=None, detect_language=False, chunk_size=6
+            )
+            n_documents = preprocessor.preprocess_file(input_path, output_path)
+            with open(output_path, encoding="utf-8") as f:
+                processed = f.read().splitlines()
+
+        expected = TextPreprocessor(
+            min_word_freq=None, detect_language=False
+        ).preprocess_documents(self.documents)
+        self.assertEqual(n_documents, len(self.documents))
+        self.assertEqual(processed, expected)
+
+    def test_iterators_are_rejected(self):
+        preprocessor = TextPreprocessor(detect_language=False)
+        with self.assertRaises(TypeError):
+            list(preprocessor.iter_preprocess(iter(self.documents)))
+
+    def test_language_detection_can_be_skipped(self):
+        with patch.object(_preprocessor, "detect") as mock_detect:
+            TextPreprocessor(detect_language=False).preprocess_text("Some text here")
+            TextPreprocessor(language_sample_rate=0.0).preprocess_text("Some text")
+            mock_detect.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
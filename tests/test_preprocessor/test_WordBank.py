@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from gensim.models import KeyedVectors
+
+from stream_topic.preprocessor._embedder import BaseEmbedder
+from stream_topic.preprocessor.topic_extraction import TopicExtractor
+from stream_topic.preprocessor.word_bank import WordBank
+
+
+class TestWordBank(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.words = [f"word{i}" for i in range(40)]
+        self.keyed_vectors = KeyedVectors(vector_size=8)
+        self.keyed_vectors.add_vectors(
+            self.words, rng.normal(size=(40, 8)).astype(np.float32)
+        )
+        self.embedder = BaseEmbedder(self.keyed_vectors)
+
+    def test_build_drops_duplicates_and_unknown_words(self):
+        bank = WordBank.build(["word1", "unknown", "word0", "word1"], self.embedder)
+        self.assertEqual(bank.words, ["word1", "word0"])
+        np.testing.assert_allclose(np.linalg.norm(bank.embeddings, axis=1), 1, rtol=1e-6)
+
+    def test_most_similar_matches_full_sort(self):
+        bank = WordBank.build(self.words, self.embedder)
+        centroids = np.random.default_rng(1).normal(size=(3, 8))
+        indices, scores = bank.most_similar(centroids, 5)
+
+        similarities = (centroids / np.linalg.norm(centroids, axis=1, keepdims=True)) @ bank.embeddings.T
+        expected = np.flip(np.argsort(similarities, axis=1), axis=1)[:, :5]
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_allclose(
+            scores, np.take_along_axis(similarities, expected, axis=1), rtol=1e-5
+        )
+
+    def test_stored_bank_is_reused(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            word_list_fn = mock.Mock(return_value=self.words)
+            for _ in range(2):
+                bank = WordBank.load_or_build(
+                    cache_dir, "brown", "test-model", True, word_list_fn, self.embedder
+                )
+            word_list_fn.assert_called_once()
+            self.assertIsInstance(bank.embeddings, np.memmap)
+            self.assertEqual(bank.words, self.words)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_topic_extractor_uses_word_bank(self):
+        embeddings = np.random.default_rng(2).normal(size=(10, 8))
+        assignments = np.random.default_rng(3).random((10, 2))
+        extractor = TopicExtractor(None, assignments.T, 2, self.keyed_vectors)
+        with mock.patch.object(TopicExtractor, "_corpus_words", return_value=self.words):
+            topics, centroids = extractor._noun_extractor_haystack(embeddings, n=4)
+
+        self.assertEqual(sorted(topics), [0, 1])
+        self.assertTrue(all(len(words) == 4 for words in topics.values()))
+        np.testing.assert_allclose(centroids[1], assignments[:, 1] @ embeddings / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
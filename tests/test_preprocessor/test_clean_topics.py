@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from stream_topic.preprocessor._cleaning import clean_topics
+
+
+class CountingEncoder:
+    """Sentence-transformer-like encoder with fixed word vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = 0
+
+    def encode(self, words):
+        self.calls += 1
+        return np.stack([self.vectors[word] for word in words])
+
+
+class TestCleanTopics(unittest.TestCase):
+    def setUp(self):
+        self.encoder = CountingEncoder(
+            {
+                "tiger": np.array([1.0, 0.0, 0.0]),
+                "tigers": np.array([0.95, 0.3, 0.0]),
+                "cat": np.array([0.6, 0.8, 0.0]),
+                "stripes": np.array([0.0, 1.0, 0.0]),
+                "car": np.array([0.0, 0.0, 1.0]),
+            }
+        )
+        self.topics = {
+            0: [("tiger", 0.5), ("tigers", 0.3), ("car", 0.2)],
+            # "tigers" drops "cat", so "cat" cannot drop "stripes" any more
+            1: [("tigers", 0.4), ("cat", 0.3), ("stripes", 0.2), ("car", 0.1)],
+        }
+
+    def test_drops_similar_words_top_down_with_one_encoder_call(self):
+        cleaned, _ = clean_topics(self.topics, self.encoder, similarity=0.75)
+        self.assertEqual(cleaned[0], [("tiger", 0.5), ("car", 0.2)])
+        self.assertEqual(cleaned[1], [("tigers", 0.4), ("stripes", 0.2), ("car", 0.1)])
+        self.assertEqual(self.encoder.calls, 1)
+
+    def test_weighted_topic_means(self):
+        cleaned, centroids = clean_topics(self.topics, self.encoder, similarity=0.75)
+        for topic, centroid in zip(cleaned.values(), centroids):
+            weights = np.array([weight for _, weight in topic])
+            vectors = np.stack([self.encoder.vectors[word] for word, _ in topic])
+            expected = (weights / weights.sum()) @ vectors / len(topic)
+            np.testing.assert_allclose(centroid, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from stream_topic.utils.cbc_utils import DocumentCoherence
+
+
+def naive_document_coherence(coherence, word_lists=None):
+    """Reference implementation: mean NPMI over the shared words of every pair."""
+    npmi = coherence._calculate_npmi(
+        coherence._calculate_co_occurrences(), coherence.doc_word_matrix.shape[0]
+    )
+    if word_lists is None:
+        word_lists = coherence.documents[coherence.column]
+    words = [set(doc) for doc in word_lists]
+    n = len(words)
+    scores = np.full((n, n), np.nan)
+    for i in range(n):
+        for j in range(i + 1, n):
+            shared = [coherence.word_index[w] for w in words[i] & words[j]
+                      if w in coherence.word_index]
+            if shared:
+                scores[i, j] = scores[j, i] = np.mean(npmi[np.ix_(shared, shared)])
+    return scores
+
+
+class TestDocumentCoherence(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        vocab = [f"word{i}" for i in range(30)]
+        self.documents = pd.DataFrame(
+            {"tfidf_top_words": [rng.sample(vocab, 6) for _ in range(40)]}
+        )
+        self.coherence = DocumentCoherence(self.documents, stopwords=[])
+        self.reference = naive_document_coherence(self.coherence)
+
+    def test_dataframe_matches_reference(self):
+        scores = self.coherence.calculate_document_coherence()
+        np.testing.assert_allclose(scores.values, self.reference, equal_nan=True)
+
+    def test_sparse_adjacency_matches_reference(self):
+        adjacency = self.coherence.calculate_sparse_coherence(threshold=0.0, block_size=7)
+        expected = np.nan_to_num(self.reference)
+        expected[expected <= 0] = 0
+        np.testing.assert_allclose(adjacency.toarray(), expected)
+
+    def test_top_k_adjacency_is_symmetric(self):
+        adjacency = self.coherence.calculate_sparse_coherence(n_neighbors=3, threshold=0.0)
+        self.assertEqual((adjacency != adjacency.T).nnz, 0)
+        self.assertEqual(adjacency.diagonal().sum(), 0)
+        self.assertTrue((adjacency.getnnz(axis=1) >= 3).all())
+
+    def test_membership_uses_union_of_words(self):
+        membership = sp.csr_matrix(
+            (np.ones(40), (np.arange(40) % 5, np.arange(40))), shape=(5, 40)
+        )
+        cluster_words = [
+            set().union(*self.documents["tfidf_top_words"][c::5]) for c in range(5)
+        ]
+        adjacency = self.coherence.calculate_sparse_coherence(membership)
+
+        # the NPMI values stay those of the documents, only the word sets change
+        expected = np.nan_to_num(
+            naive_document_coherence(self.coherence, cluster_words)
+        )
+        np.testing.assert_allclose(adjacency.toarray(), expected)
+
+    def test_rarely_co_occurring_words_in_merged_clusters(self):
+        rng = random.Random(1)
+        vocab = [f"word{i}" for i in range(300)]
+        documents = pd.DataFrame(
+            {"tfidf_top_words": [rng.sample(vocab, 5) for _ in range(60)]}
+        )
+        coherence = DocumentCoherence(documents, stopwords=[])
+        membership = sp.csr_matrix(
+            (np.ones(60), (np.arange(60) % 4, np.arange(60))), shape=(4, 60)
+        )
+        cluster_words = [
+            set().union(*documents["tfidf_top_words"][c::4]) for c in range(4)
+        ]
+        adjacency = coherence.calculate_sparse_coherence(membership, block_size=3)
+        expected = np.nan_to_num(naive_document_coherence(coherence, cluster_words))
+        np.testing.assert_allclose(adjacency.toarray(), expected)
+
+        # only the word pairs that occur together in a document are enumerated
+        unit_word_matrix = coherence._unit_word_matrix(membership)
+        pair_matrix, _ = coherence._pair_matrix(unit_word_matrix)
+        n_co_occurring = coherence._calculate_co_occurrences().nnz
+        self.assertLessEqual(pair_matrix.shape[1], n_co_occurring)
+        self.assertLess(pair_matrix.nnz, (unit_word_matrix.getnnz(axis=1) ** 2).sum())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+from stream_topic.utils.datamodule import sparse_collate
+
+
+class TestSparseCollate(unittest.TestCase):
+    def setUp(self):
+        self.bow = sp.csr_matrix(
+            np.array([[1, 0, 2], [0, 0, 1], [3, 1, 0]], dtype=np.float32)
+        )
+        self.batch = [
+            {"text": f"doc {i}", "bow": self.bow[[i]], "embedding": np.ones(4) * i}
+            for i in range(3)
+        ]
+
+    def test_sparse_rows_are_densified(self):
+        collated = sparse_collate(self.batch)
+        self.assertIsInstance(collated["bow"], torch.Tensor)
+        self.assertEqual(collated["bow"].dtype, torch.float32)
+        np.testing.assert_array_equal(collated["bow"].numpy(), self.bow.toarray())
+
+    def test_dense_entries_use_default_collate(self):
+        collated = sparse_collate(self.batch)
+        self.assertEqual(tuple(collated["embedding"].shape), (3, 4))
+        self.assertEqual(collated["text"], ["doc 0", "doc 1", "doc 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
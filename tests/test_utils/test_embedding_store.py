@@ -0,0 +1,63 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from stream_topic.utils.data_downloader import DataDownloader
+from stream_topic.utils.embedding_store import EmbeddingStore, content_hash
+
+
+class TestEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.embeddings = np.random.rand(20, 8).astype(np.float32)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load_memory_map(self):
+        store = EmbeddingStore(os.path.join(self.tmp_dir.name, "docs"))
+        manifest = store.save(self.embeddings, "test-model")
+
+        self.assertEqual(manifest["model_name"], "test-model")
+        self.assertEqual(manifest["n_documents"], 20)
+        self.assertEqual(manifest["dim"], 8)
+        self.assertEqual(manifest["content_hash"], content_hash(self.embeddings))
+
+        loaded = store.load(verify_hash=True)
+        self.assertIsInstance(loaded, np.memmap)
+        self.assertFalse(loaded.flags.writeable)
+        np.testing.assert_array_equal(loaded, self.embeddings)
+
+    def test_pickled_embeddings_are_migrated(self):
+        downloader = DataDownloader(name="dummy")
+        pkl_path = os.path.join(
+            self.tmp_dir.name, "dummy_embeddings_test-model.pkl"
+        )
+        with open(pkl_path, "wb") as file:
+            pickle.dump(self.embeddings, file)
+
+        loaded = downloader.get_embeddings(
+            "test-model", path=self.tmp_dir.name, source="local"
+        )
+        np.testing.assert_array_equal(loaded, self.embeddings)
+        self.assertTrue(EmbeddingStore(pkl_path).exists())
+        self.assertIsInstance(loaded, np.memmap)
+
+    def test_save_embeddings_writes_store(self):
+        downloader = DataDownloader(name="dummy")
+        downloader.save_embeddings(self.embeddings, "test-model", self.tmp_dir.name)
+        self.assertTrue(
+            downloader.has_embeddings("test-model", self.tmp_dir.name, source="local")
+        )
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.tmp_dir.name, "dummy_embeddings_test-model.npy")
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
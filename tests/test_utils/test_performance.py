@@ -0,0 +1,52 @@
+import io
+import unittest
+
+import torch
+from torch.utils.data import DataLoader
+
+from stream_topic.utils.performance import PerformanceProfile
+
+
+class TestPerformanceProfile(unittest.TestCase):
+    def test_default_keeps_plain_training(self):
+        profile = PerformanceProfile.resolve(None)
+        self.assertEqual(profile.trainer_kwargs(), {})
+        self.assertEqual(profile.dataloader_kwargs(), {"pin_memory": False})
+
+    def test_resolve_presets_and_settings(self):
+        cpu = PerformanceProfile.resolve("cpu")
+        self.assertEqual(cpu.trainer_kwargs(), {"precision": "bf16-mixed"})
+        self.assertFalse(cpu.compile)
+        self.assertTrue(PerformanceProfile.cpu(compile=True).compile)
+        self.assertEqual(PerformanceProfile.resolve({"num_threads": 2}).num_threads, 2)
+        with self.assertRaises(ValueError):
+            PerformanceProfile.resolve("gpu")
+
+    def test_worker_settings_are_valid_dataloader_kwargs(self):
+        profile = PerformanceProfile.cpu(num_workers=2)
+        kwargs = profile.dataloader_kwargs()
+        self.assertEqual(kwargs["prefetch_factor"], 4)
+        self.assertTrue(kwargs["persistent_workers"])
+        loader = DataLoader(list(range(8)), batch_size=4, **kwargs)
+        self.assertEqual(sum(len(batch) for batch in loader), 8)
+
+    def test_threads_are_restored(self):
+        before = torch.get_num_threads()
+        profile = PerformanceProfile(num_threads=before + 1)
+        previous = profile.apply_threads()
+        self.assertEqual(torch.get_num_threads(), before + 1)
+        profile.restore_threads(previous)
+        self.assertEqual(torch.get_num_threads(), before)
+
+    def test_compiled_module_can_be_saved(self):
+        module = PerformanceProfile(compile=True).compile_module(torch.nn.Linear(3, 2))
+        self.assertNotIn("forward", vars(module))
+        buffer = io.BytesIO()
+        torch.save(module, buffer)
+        buffer.seek(0)
+        loaded = torch.load(buffer, weights_only=False)
+        torch.testing.assert_close(loaded.weight, module.weight)
+
+
+if __name__ == "__main__":
+    unittest.main()
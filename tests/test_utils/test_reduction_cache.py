@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from loguru import logger
+
+from stream_topic.models.abstract_helper_models.base import BaseModel
+from stream_topic.utils.reduction_cache import ReductionCache, reduction_key
+
+
+class FakeUMAP:
+    fits = 0
+
+    def __init__(self, n_components=2, **kwargs):
+        self.n_components = n_components
+
+    def fit_transform(self, embeddings):
+        FakeUMAP.fits += 1
+        return embeddings[:, : self.n_components] * 2
+
+
+class ReducingModel(BaseModel):
+    def get_info(self):
+        return {}
+
+    def fit(self, dataset=None):
+        pass
+
+    def predict(self, X):
+        pass
+
+
+class TestReductionCache(unittest.TestCase):
+    def setUp(self):
+        FakeUMAP.fits = 0
+        self.embeddings = np.random.default_rng(0).normal(size=(20, 5)).astype(np.float32)
+        self.model = ReducingModel()
+        self.model.embeddings = self.embeddings
+        self.model.umap_args = {"n_components": 2, "n_neighbors": 5}
+        patcher = mock.patch(
+            "stream_topic.models.abstract_helper_models.base.umap.UMAP", FakeUMAP
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_depends_on_content_and_parameters(self):
+        key = reduction_key(self.embeddings, {"n_components": 2})
+        self.assertEqual(key, reduction_key(self.embeddings.copy(), {"n_components": 2}))
+        self.assertNotEqual(key, reduction_key(self.embeddings, {"n_components": 3}))
+        self.assertNotEqual(key, reduction_key(self.embeddings + 1, {"n_components": 2}))
+
+    def test_refit_with_same_parameters_skips_umap(self):
+        first = self.model.dim_reduction(logger)
+        second = self.model.dim_reduction(logger)
+        self.assertEqual(FakeUMAP.fits, 1)
+        np.testing.assert_array_equal(first, second)
+
+        self.model.umap_args = {"n_components": 3, "n_neighbors": 5}
+        self.model.dim_reduction(logger)
+        self.assertEqual(FakeUMAP.fits, 2)
+
+    def test_lru_eviction_and_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.model.reduction_cache = ReductionCache(max_entries=1, cache_dir=cache_dir)
+            for n_components in (2, 3, 2):
+                self.model.umap_args = {"n_components": n_components}
+                self.model.dim_reduction(logger)
+            self.assertEqual(len(self.model.reduction_cache), 1)
+            self.assertEqual(FakeUMAP.fits, 2)
+            self.assertEqual(len(os.listdir(cache_dir)), 4)
+
+            other = ReducingModel()
+            other.embeddings = self.embeddings.copy()
+            other.umap_args = {"n_components": 3}
+            other.reduction_cache = ReductionCache(cache_dir=cache_dir)
+            reduced = other.dim_reduction(logger)
+            self.assertEqual(FakeUMAP.fits, 2)
+            self.assertIsInstance(other.reducer, FakeUMAP)
+            np.testing.assert_array_equal(reduced, self.embeddings[:, :3] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
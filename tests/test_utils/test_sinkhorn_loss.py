@@ -0,0 +1,59 @@
+import unittest
+
+import torch
+import torch.nn.functional as F
+
+from stream_topic.models import NSTM
+from stream_topic.utils.sinkhorn_loss import (SinkhornSolver, sinkhorn_loss,
+                                              stabilized_sinkhorn_loss)
+
+
+class TestStabilizedSinkhornLoss(unittest.TestCase):
+    def setUp(self):
+        generator = torch.Generator().manual_seed(0)
+        topics = F.normalize(torch.randn(8, 16, generator=generator))
+        words = F.normalize(torch.randn(200, 16, generator=generator))
+        self.M = 1 - topics @ words.T
+        self.a = F.softmax(torch.randn(12, 8, generator=generator), dim=-1).T
+        self.b = F.softmax(torch.randn(12, 200, generator=generator), dim=-1).T
+
+    def test_matches_original_implementation(self):
+        expected = sinkhorn_loss(self.M, self.a, self.b, lambda_sh=20, stopThr=1e-6)
+        for log_domain in (False, True):
+            divergences, log_u = stabilized_sinkhorn_loss(
+                self.M, self.a, self.b, 20, stopThr=1e-6, log_domain=log_domain
+            )
+            torch.testing.assert_close(divergences, expected, rtol=1e-4, atol=1e-5)
+            self.assertEqual(log_u.shape, self.a.shape)
+
+    def test_large_alpha_is_finite(self):
+        M = self.M.clone().requires_grad_()
+        divergences, _ = stabilized_sinkhorn_loss(M, self.a, self.b, 500, numItermax=100)
+        divergences.mean().backward()
+        self.assertTrue(torch.isfinite(divergences).all())
+        self.assertTrue(torch.isfinite(M.grad).all())
+
+    def test_warm_start_across_batch_sizes(self):
+        solver = SinkhornSolver(20, warm_start=True)
+        first = solver(self.M, self.a, self.b)
+        self.assertEqual(tuple(solver._log_u.shape), (8, 1))
+        second = solver(self.M, self.a[:, :5], self.b[:, :5])
+        torch.testing.assert_close(second, first[:5], rtol=1e-2, atol=1e-3)
+
+
+
+class TestNSTMSolverSettings(unittest.TestCase):
+    def test_wrapper_passes_solver_settings(self):
+        settings = {
+            "sinkhorn_max_iter": 7,
+            "sinkhorn_stop_threshold": 1e-3,
+            "sinkhorn_check_every": 5,
+            "sinkhorn_warm_start": True,
+        }
+        model = NSTM(**settings)
+        for key, value in settings.items():
+            self.assertEqual(model.hparams[key], value)
+
+
+if __name__ == "__main__":
+    unittest.main()
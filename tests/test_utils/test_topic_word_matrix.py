@@ -0,0 +1,85 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stream_topic.models.abstract_helper_models.base import (BaseModel,
+                                                             TrainingStatus)
+from stream_topic.utils.topic_word_matrix import topic_dict_to_matrix
+
+
+def dataframe_topic_word_matrix(topic_dict):
+    """Reference implementation: fill a DataFrame cell by cell."""
+    sorted_words = sorted(set(word for topic in topic_dict.values() for word, _ in topic))
+    matrix = pd.DataFrame(index=sorted_words, columns=sorted(topic_dict), data=0.0)
+    for topic, words in topic_dict.items():
+        for word, prevalence in words:
+            matrix.at[word, topic] = prevalence
+    return np.array(matrix)
+
+
+class TopicDictModel(BaseModel):
+    def __init__(self, topic_dict):
+        super().__init__()
+        self.topic_dict = topic_dict
+        self._status = TrainingStatus.SUCCEEDED
+
+    def get_info(self):
+        return {}
+
+    def fit(self, dataset):
+        pass
+
+    def predict(self, dataset):
+        pass
+
+
+class TestTopicDictToMatrix(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        vocab = [f"word{i}" for i in range(60)]
+        self.topic_dict = {
+            topic: [(word, rng.random()) for word in rng.sample(vocab, 15)]
+            for topic in [3, 0, 2, 1]
+        }
+        # a repeated word keeps its last prevalence, as with DataFrame.at
+        self.topic_dict[0].append((self.topic_dict[0][0][0], 0.5))
+
+    def test_matches_dataframe_construction(self):
+        matrix, vocabulary = topic_dict_to_matrix(self.topic_dict)
+        np.testing.assert_allclose(matrix, dataframe_topic_word_matrix(self.topic_dict))
+        self.assertEqual(list(vocabulary), sorted(vocabulary))
+
+    def test_sparse_with_given_vocabulary(self):
+        vocabulary = ["word1", "word0", "unused"]
+        matrix, _ = topic_dict_to_matrix(self.topic_dict, vocabulary=vocabulary, sparse=True)
+        expected = pd.DataFrame(
+            dataframe_topic_word_matrix(self.topic_dict),
+            index=topic_dict_to_matrix(self.topic_dict)[1],
+        ).reindex(vocabulary, fill_value=0.0)
+        np.testing.assert_allclose(matrix.toarray(), expected.to_numpy())
+
+    def test_model_caches_until_topic_dict_changes(self):
+        model = TopicDictModel(self.topic_dict)
+        matrix, _ = model.get_topic_dict_matrix()
+        cached = model._topic_word_matrix_cache
+        np.testing.assert_array_equal(model.get_topic_dict_matrix()[0], matrix)
+        self.assertIs(model._topic_word_matrix_cache, cached)
+
+        model.topic_dict = {0: [("word0", 1.0)]}
+        self.assertEqual(model.get_topic_dict_matrix(sparse=True)[0].shape, (1, 1))
+
+    def test_in_place_changes_and_returned_copies(self):
+        model = TopicDictModel({0: [("word0", 1.0)], 1: [("word1", 2.0)]})
+        matrix, _ = model.get_topic_dict_matrix()
+        matrix[:] = -1
+        self.assertEqual(model.get_topic_dict_matrix()[0].min(), 0.0)
+
+        model.topic_dict[1].append(("word2", 3.0))
+        matrix, vocabulary = model.get_topic_dict_matrix()
+        self.assertEqual(vocabulary, ["word0", "word1", "word2"])
+        self.assertEqual(matrix[2, 1], 3.0)
+
+if __name__ == "__main__":
+    unittest.main()